@@ -0,0 +1,159 @@
+"""
+Namespaced, versioned caching on top of Django's cache framework
+
+Each app declares the namespaces it caches under, e.g.
+
+    feed_cache = CacheNamespace('posts:feed', timeout=60)
+    feed_cache.invalidate_on(Post, scope=post_feed_scopes)
+
+Keys embed a version number that is bumped instead of deleting keys, so a
+whole namespace (or one scope of it, such as a single group) is invalidated
+with one write and stale entries simply expire. Hits, misses and backend
+errors are counted per namespace and exposed through `get_stats()` and the
+`cache_requests_total` metric.
+"""
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_stats = defaultdict(Counter)
+_stats_lock = threading.Lock()
+
+# Sentinel distinguishing a cached None from a miss
+_MISSING = object()
+
+
+def _record(namespace, outcome):
+    with _stats_lock:
+        _stats[namespace][outcome] += 1
+    CACHE_REQUESTS.labels(namespace, outcome).inc()
+
+
+def get_stats():
+    """Return {namespace: {'hits', 'misses', 'errors'}} for this process"""
+    with _stats_lock:
+        return {
+            name: {
+                'hits': counts['hits'],
+                'misses': counts['misses'],
+                'errors': counts['errors'],
+            }
+            for name, counts in _stats.items()
+        }
+
+
+class CacheNamespace:
+    """
+    A group of cache keys that are invalidated together.
+
+    `scope` narrows invalidation, e.g. the cached detail of one group is
+    stored under scope=group.id so that a new post only invalidates that
+    group. An entry can depend on several scopes (scope=(a, b)) and is then
+    invalidated with any one of them. Cache backend errors are logged and
+    treated as misses so that an unavailable cache never fails a request.
+    """
+
+    def __init__(self, name, timeout=300):
+        self.name = name
+        self.timeout = timeout
+
+    def _version_key(self, scope=None):
+        return f'{self.name}:version' if scope is None else f'{self.name}:version:{scope}'
+
+    def _scopes(self, scope):
+        if scope is None:
+            return []
+        return list(scope) if isinstance(scope, tuple) else [scope]
+
+    def _versions(self, scope=None):
+        keys = [self._version_key()]
+        keys.extend(self._version_key(item) for item in self._scopes(scope))
+        versions = cache.get_many(keys)
+        return [versions.get(key, 1) for key in keys]
+
+    def key(self, *parts, scope=None):
+        """Build the versioned cache key for the given parts"""
+        versions = '.'.join(str(version) for version in self._versions(scope))
+        suffix = ':'.join(str(part) for part in parts)
+        scopes = self._scopes(scope)
+        if scopes:
+            suffix = f"{':'.join(str(item) for item in scopes)}:{suffix}"
+        return f'{self.name}:v{versions}:{suffix}'
+
+    def get(self, *parts, scope=None, default=None):
+        try:
+            value = cache.get(self.key(*parts, scope=scope), _MISSING)
+        except Exception:
+            logger.warning('Cache read failed for %s', self.name, exc_info=True)
+            _record(self.name, 'errors')
+            return default
+
+        if value is _MISSING:
+            _record(self.name, 'misses')
+            return default
+        _record(self.name, 'hits')
+        return value
+
+    def set(self, value, *parts, scope=None, timeout=None):
+        try:
+            cache.set(
+                self.key(*parts, scope=scope),
+                value,
+                self.timeout if timeout is None else timeout
+            )
+        except Exception:
+            logger.warning('Cache write failed for %s', self.name, exc_info=True)
+            _record(self.name, 'errors')
+
+    def get_or_set(self, parts, compute, scope=None, timeout=None):
+        """Return the cached value for `parts`, computing and storing it on a miss"""
+        value = self.get(*parts, scope=scope, default=_MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(value, *parts, scope=scope, timeout=timeout)
+        return value
+
+    def invalidate(self, scope=None):
+        """Bump the namespace (or scope) version so existing keys are no longer read"""
+        key = self._version_key(scope)
+        try:
+            if not cache.add(key, 2, timeout=None):
+                cache.incr(key)
+        except ValueError:
+            # The version expired between add() and incr()
+            cache.set(key, 2, timeout=None)
+        except Exception:
+            logger.warning('Cache invalidation failed for %s', self.name, exc_info=True)
+            _record(self.name, 'errors')
+
+    def invalidate_on(self, *models, scope=None):
+        """
+        Invalidate after any save or delete of the given models commits.
+
+        `scope` is an optional callable returning the scope to invalidate for
+        an instance, or a list of scopes (empty to skip); without it the
+        whole namespace is invalidated.
+        """
+        def receiver(sender, instance, raw=False, **kwargs):
+            if raw:
+                return
+            scopes = scope(instance) if scope else None
+            if not isinstance(scopes, list):
+                scopes = [scopes]
+            for instance_scope in scopes:
+                transaction.on_commit(
+                    lambda instance_scope=instance_scope: self.invalidate(instance_scope)
+                )
+
+        for model in models:
+            uid = f'cache-{self.name}-{model._meta.label}'
+            post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
@@ -0,0 +1,122 @@
+"""
+Conditional GET support for DRF viewsets
+
+`ConditionalGetMixin` gives `list` and `retrieve` an `ETag` derived from the
+rows being returned (and, where it is reliable, a `Last-Modified`), and
+answers a matching `If-None-Match` / `If-Modified-Since` with
+`304 Not Modified` before anything is serialized, so polling clients don't
+re-download unchanged pages.
+"""
+import hashlib
+from operator import attrgetter
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Add validators and 304 short-circuiting to `list` and `retrieve`.
+
+    The ETag is weak and hashes, per row, the
+    primary key, the timestamp and `conditional_fields`, plus the requesting
+    user and the pagination envelope (links and counts), so it changes when a
+    row is added, removed, edited or reordered. `conditional_fields` should
+    list values that change without touching `updated_at`, such as counters
+    maintained with `UPDATE ... F()`; dotted paths (`author.updated_at`) read
+    through `select_related` objects.
+
+    Detail serializers that embed other tables or per-user state (comments,
+    a member preview, the user's role) list those fields in
+    `conditional_embedded_fields`: `retrieve` renders them first, hashes the
+    output into the ETag and reuses it for the 200 response.
+
+    Last-Modified is only sent by `retrieve`, as the object's
+    `conditional_timestamp_field`, and only for views without
+    `conditional_fields` or `conditional_embedded_fields`: counters, embedded
+    rows and removed or reordered list rows change the body without moving
+    any timestamp, so there the ETag alone decides.
+
+    Visibility must be enforced by `get_queryset()`: object permissions are
+    still checked, but a 304 is decided from the rows the view would return.
+    """
+    conditional_timestamp_field = 'updated_at'
+    conditional_fields = ()
+    conditional_embedded_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        objects = list(page if page is not None else queryset)
+
+        envelope = None
+        if page is not None:
+            envelope = self.get_paginated_response([]).data
+
+        etag = self.get_etag(objects, envelope)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            serializer = self.get_serializer(objects, many=True)
+            if page is not None:
+                response = self.get_paginated_response(serializer.data)
+            else:
+                response = Response(serializer.data)
+        return self.set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        embedded = self.render_embedded_fields(serializer, instance)
+
+        etag = self.get_etag([instance], embedded=embedded)
+        last_modified = self.get_last_modified(instance)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(serializer.data)
+        return self.set_validators(response, etag, last_modified)
+
+    def render_embedded_fields(self, serializer, instance):
+        """
+        {field name: representation} of `conditional_embedded_fields`; each
+        field then serves its rendered value when the serializer runs
+        """
+        embedded = {}
+        for name in self.conditional_embedded_fields:
+            field = serializer.fields.get(name)
+            if field is None:
+                continue
+            value = field.to_representation(field.get_attribute(instance))
+            # Fields are bound copies owned by this serializer instance
+            field.to_representation = lambda data, value=value: value
+            embedded[name] = value
+        return embedded
+
+    def get_etag(self, objects, envelope=None, embedded=None):
+        """Weak ETag of the given rows"""
+        get_timestamp = attrgetter(self.conditional_timestamp_field)
+        getters = [attrgetter(field) for field in self.conditional_fields]
+
+        digest = hashlib.sha256()
+        digest.update(f'{self.action}:{self.request.user.pk}:{envelope!r}:{embedded!r}'.encode())
+        for obj in objects:
+            values = [getter(obj) for getter in getters]
+            digest.update(f'{obj.pk!r}:{get_timestamp(obj)!r}:{values!r};'.encode())
+        return f'W/"{digest.hexdigest()[:32]}"'
+
+    def get_last_modified(self, obj):
+        """Last-Modified timestamp of `obj`, or None when it can't be trusted"""
+        if self.conditional_fields or self.conditional_embedded_fields:
+            return None
+        timestamp = attrgetter(self.conditional_timestamp_field)(obj)
+        return int(timestamp.timestamp()) if timestamp is not None else None
+
+    def set_validators(self, response, etag, last_modified=None):
+        """Attach the validators; responses are per user and always revalidated"""
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
@@ -0,0 +1,254 @@
+"""
+Write-behind aggregation for denormalized counters
+
+Engagement counters (comments, reactions, shares, group posts) are updated
+far more often than they are read precisely, and updating them row by row
+on every event serializes writers on hot rows. Signals call `increment()`
+instead of updating the row directly; depending on `COUNTER_BACKEND` the
+deltas are applied immediately or buffered and flushed in batched UPDATEs
+by `flush()` (see the `flush_counters` management command).
+
+Since buffered deltas can be lost (a crashed process, a flushed Redis),
+apps register how each counter is derived with `register_source()` and the
+`reconcile_counters` command recomputes them from the source rows.
+
+Backends:
+    immediate - apply each delta right away with an F() update (default)
+    local     - buffer deltas in process, flushed every COUNTER_FLUSH_INTERVAL
+                seconds at the end of a request or Celery task and on exit
+    redis     - buffer deltas in Redis hashes shared by all workers, flushed
+                by the `flush_counters` task on the Celery beat schedule
+                (requires a broker; refused when tasks run eagerly)
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from celery.signals import task_postrun
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from config.celery import uses_celery_broker
+
+logger = logging.getLogger(__name__)
+
+# Rows updated per UPDATE statement when flushing
+FLUSH_BATCH_SIZE = 500
+
+
+def apply_deltas(model, deltas):
+    """
+    Apply buffered deltas to the database.
+
+    `deltas` maps primary key -> {field: delta}. Rows are updated in batches
+    with one UPDATE per batch, using a CASE expression per field so that
+    each row receives its own delta. Counters never go below zero.
+    """
+    pks = sorted((pk for pk, fields in deltas.items() if any(fields.values())), key=str)
+    updated = 0
+
+    for start in range(0, len(pks), FLUSH_BATCH_SIZE):
+        batch = pks[start:start + FLUSH_BATCH_SIZE]
+        fields = {field for pk in batch for field, delta in deltas[pk].items() if delta}
+        updates = {}
+        for field in fields:
+            cases = [
+                When(pk=pk, then=Value(deltas[pk][field]))
+                for pk in batch if deltas[pk].get(field)
+            ]
+            updates[field] = Greatest(
+                F(field) + Case(*cases, default=Value(0), output_field=IntegerField()),
+                0
+            )
+        with transaction.atomic():
+            updated += model.objects.filter(pk__in=batch).update(**updates)
+
+    return updated
+
+
+class ImmediateCounterBackend:
+    """Apply every delta as soon as it is recorded"""
+
+    def add(self, label, pk, deltas):
+        apply_deltas(apps.get_model(label), {pk: deltas})
+
+    def flush(self):
+        return 0
+
+
+class LocalCounterBackend:
+    """Buffer deltas in this process and flush them periodically"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._buffer = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+        self._last_flush = time.monotonic()
+        request_finished.connect(self._flush_if_due, dispatch_uid='counters-local-flush')
+        # Celery workers handle no requests; flush after their tasks instead
+        task_postrun.connect(self._flush_if_due, dispatch_uid='counters-local-flush')
+        atexit.register(self.flush)
+
+    def add(self, label, pk, deltas):
+        with self._lock:
+            row = self._buffer[label][pk]
+            for field, delta in deltas.items():
+                row[field] += delta
+
+    def _flush_if_due(self, **kwargs):
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            buffer, self._buffer = self._buffer, defaultdict(
+                lambda: defaultdict(lambda: defaultdict(int))
+            )
+            self._last_flush = time.monotonic()
+
+        updated = 0
+        for label, deltas in buffer.items():
+            updated += apply_deltas(apps.get_model(label), deltas)
+        return updated
+
+
+class RedisCounterBackend:
+    """Buffer deltas in Redis so that all workers share one buffer"""
+
+    DIRTY_KEY = 'counters:dirty'
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def _pop(self, key):
+        # Read and delete the hash in one MULTI so concurrent increments are not lost
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.hgetall(key)
+        pipeline.delete(key)
+        values, _ = pipeline.execute()
+        return values
+
+    def _key(self, label, pk):
+        return f'counters:{label}:{pk}'
+
+    def add(self, label, pk, deltas):
+        key = self._key(label, pk)
+        pipeline = self.client.pipeline()
+        for field, delta in deltas.items():
+            pipeline.hincrby(key, field, delta)
+        pipeline.sadd(self.DIRTY_KEY, key)
+        pipeline.execute()
+
+    def flush(self):
+        grouped = defaultdict(dict)
+        while True:
+            keys = self.client.spop(self.DIRTY_KEY, FLUSH_BATCH_SIZE)
+            if not keys:
+                break
+            for key in keys:
+                _, label, pk = key.decode().split(':', 2)
+                row = grouped[label].setdefault(pk, defaultdict(int))
+                for field, delta in self._pop(key).items():
+                    row[field.decode()] += int(delta)
+
+        updated = 0
+        for label, deltas in grouped.items():
+            updated += apply_deltas(apps.get_model(label), deltas)
+        return updated
+
+
+# model -> {field: (queryset factory, key)} used by `reconcile()`
+_sources = defaultdict(dict)
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the configured counter backend (created on first use)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, 'COUNTER_BACKEND', 'immediate')
+                if name == 'redis':
+                    if not uses_celery_broker():
+                        raise ImproperlyConfigured(
+                            "COUNTER_BACKEND='redis' is flushed by a Celery beat task; "
+                            "configure CELERY_BROKER_URL and run the beat process"
+                        )
+                    _backend = RedisCounterBackend(settings.REDIS_URL)
+                elif name == 'local':
+                    _backend = LocalCounterBackend(
+                        getattr(settings, 'COUNTER_FLUSH_INTERVAL', 5)
+                    )
+                else:
+                    _backend = ImmediateCounterBackend()
+    return _backend
+
+
+def increment(instance_or_model, pk=None, **deltas):
+    """
+    Record counter deltas for one row, e.g.
+    `increment(Post, post_id, comments_count=1)`.
+
+    The update is applied after the current transaction commits, so rolled
+    back writes never leak into the counters.
+    """
+    if hasattr(instance_or_model, '_meta') and pk is None:
+        pk = instance_or_model.pk
+    label = instance_or_model._meta.label
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: get_backend().add(label, pk, deltas))
+
+
+def flush():
+    """Write all buffered deltas to the database"""
+    updated = get_backend().flush()
+    if updated:
+        logger.info('Flushed counter deltas for %s rows', updated)
+    return updated
+
+
+def register_source(model, field, queryset, key):
+    """
+    Declare how a counter is derived for reconciliation.
+
+    `queryset` is a callable returning the rows being counted and `key` is
+    the field on those rows that points at the counted model, e.g.
+    `register_source(Post, 'shares_count', Share.objects.all, 'post')`.
+    """
+    _sources[model][field] = (queryset, key)
+
+
+def reconcile(models=None):
+    """
+    Recompute registered counters from their source rows.
+
+    Pending deltas are flushed first so they are not applied twice. Returns
+    a dict of model label -> number of rows updated.
+    """
+    flush()
+    results = {}
+    for model, fields in _sources.items():
+        if models and model not in models:
+            continue
+        updates = {}
+        for field, (queryset, key) in fields.items():
+            counted = queryset().filter(**{key: OuterRef('pk')}).order_by().values(key)
+            updates[field] = Coalesce(
+                Subquery(counted.annotate(total=Count('*')).values('total')),
+                0
+            )
+        with transaction.atomic():
+            results[model._meta.label] = model.objects.update(**updates)
+    return results
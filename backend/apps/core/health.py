@@ -0,0 +1,117 @@
+"""
+Readiness checks
+
+`readiness()` runs every check in CHECKS and reports whether this process
+should receive traffic: the database answers within HEALTH_DB_LATENCY_MS,
+the cache accepts a write and read back and no migrations are pending.
+
+The Celery backlog (against HEALTH_MAX_QUEUE_LENGTH) is reported too, but
+as an advisory check: the queues are shared by every replica, so a long
+backlog would mark all web processes unready at once, and no web process
+can fix it. The result is kept in
+memory for HEALTH_CACHE_SECONDS so frequent probes don't add load (and
+don't depend on the cache they are checking).
+"""
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from config.celery import uses_celery_broker
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_result = None
+_checked_at = 0.0
+
+# Migration state only changes on deploy; once up to date it is not re-read
+_migrations_applied = False
+
+
+def get_cache_seconds():
+    return getattr(settings, 'HEALTH_CACHE_SECONDS', 5)
+
+
+def check_database():
+    threshold = getattr(settings, 'HEALTH_DB_LATENCY_MS', 250)
+    start = time.perf_counter()
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+    latency = (time.perf_counter() - start) * 1000
+    return latency <= threshold, {'latency_ms': round(latency, 1), 'threshold_ms': threshold}
+
+
+def check_cache():
+    key = f'health:{uuid.uuid4().hex}'
+    start = time.perf_counter()
+    cache.set(key, 1, timeout=10)
+    found = cache.get(key) == 1
+    cache.delete(key)
+    return found, {'latency_ms': round((time.perf_counter() - start) * 1000, 1)}
+
+
+def check_migrations():
+    global _migrations_applied
+    if not _migrations_applied:
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if plan:
+            return False, {'pending': len(plan)}
+        _migrations_applied = True
+    return True, {'pending': 0}
+
+
+def check_task_backlog():
+    if not uses_celery_broker():
+        return True, {'mode': 'eager'}
+    threshold = getattr(settings, 'HEALTH_MAX_QUEUE_LENGTH', 1000)
+    lengths = metrics.get_queue_lengths()
+    return all(length <= threshold for length in lengths.values()), {
+        'queues': lengths, 'threshold': threshold
+    }
+
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+    'migrations': check_migrations,
+    'task_backlog': check_task_backlog,
+}
+
+# Checks reported in the response that don't decide readiness
+ADVISORY_CHECKS = {'task_backlog'}
+
+
+def run_checks():
+    """{'ready': bool, 'checks': {name: {'ok', ...details}}}; advisory checks are flagged"""
+    checks = {}
+    for name, check in CHECKS.items():
+        try:
+            ok, details = check()
+        except Exception:
+            # Errors name hosts and users; log them rather than serve them
+            logger.exception('Readiness check %s failed', name)
+            ok, details = False, {'error': 'check_failed'}
+        checks[name] = {'ok': ok, **details}
+        if name in ADVISORY_CHECKS:
+            checks[name]['advisory'] = True
+    ready = all(check['ok'] for name, check in checks.items() if name not in ADVISORY_CHECKS)
+    return {'ready': ready, 'checks': checks}
+
+
+def readiness():
+    """The latest check results, rerun at most every HEALTH_CACHE_SECONDS"""
+    global _result, _checked_at
+    with _lock:
+        if _result is None or time.monotonic() - _checked_at >= get_cache_seconds():
+            _result = run_checks()
+            _checked_at = time.monotonic()
+        return _result
@@ -0,0 +1,14 @@
+"""
+Write buffered counter deltas to the database
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core import counters
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered engagement counter deltas in batched UPDATEs'
+    
+    def handle(self, *args, **options):
+        updated = counters.flush()
+        self.stdout.write(self.style.SUCCESS(f'Flushed counter deltas for {updated} rows'))
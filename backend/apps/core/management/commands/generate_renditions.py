@@ -0,0 +1,37 @@
+"""
+Queue rendition generation for stored images
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core import renditions
+from apps.core.tasks import generate_field_renditions
+
+
+class Command(BaseCommand):
+    help = 'Queue renditions for registered image fields that have none yet'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            help='Only this model, as app_label.ModelName (can be repeated)'
+        )
+    
+    def handle(self, *args, **options):
+        total = 0
+        for model, field in renditions.get_registered_fields():
+            if options['model'] and model._meta.label not in options['model']:
+                continue
+            
+            pending = model.objects.exclude(**{field: ''}).exclude(
+                **{f'{field}__isnull': True}
+            ).filter(**{f'{field}_hash': ''})
+            count = 0
+            for pk in pending.values_list('pk', flat=True).iterator():
+                generate_field_renditions.delay(model._meta.label, pk, field)
+                count += 1
+            
+            self.stdout.write(f'{model._meta.label}.{field}: {count} queued')
+            total += count
+        
+        self.stdout.write(self.style.SUCCESS(f'Queued renditions for {total} images'))
@@ -0,0 +1,36 @@
+"""
+Rebuild full-text search vectors
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import search
+
+
+class Command(BaseCommand):
+    help = 'Recompute the search_vector column of every searchable model'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Only rebuild this model (app_label.Model), can be repeated'
+        )
+    
+    def handle(self, *args, **options):
+        models = search.get_registered_models()
+        if options['models']:
+            try:
+                models = [apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+            unknown = [model for model in models if model not in search.get_registered_models()]
+            if unknown:
+                raise CommandError(f'Not searchable: {", ".join(m._meta.label for m in unknown)}')
+        
+        for model in models:
+            count = search.rebuild(model)
+            self.stdout.write(f'{model._meta.label}: {count} rows')
+        
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt successfully'))
@@ -0,0 +1,32 @@
+"""
+Reconciliation job for denormalized engagement counters
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute engagement counters from the rows they count'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Only reconcile this model (app_label.Model), can be repeated'
+        )
+    
+    def handle(self, *args, **options):
+        models = None
+        if options['models']:
+            try:
+                models = [apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+        
+        results = counters.reconcile(models)
+        for label, updated in results.items():
+            self.stdout.write(f'{label}: {updated} rows')
+        self.stdout.write(self.style.SUCCESS('Counters reconciled'))
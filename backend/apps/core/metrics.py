@@ -0,0 +1,177 @@
+"""
+Prometheus metrics
+
+`MetricsMiddleware` records, per DRF view and action (e.g.
+`PostViewSet.list`), request latency and the number and time of database
+queries; `get_metrics()` renders them in the Prometheus text format together
+with cache hit/miss counts, gunicorn worker saturation and Celery queue depth.
+
+Under gunicorn every worker keeps its own values. Set PROMETHEUS_MULTIPROC_DIR
+(see config/gunicorn.py) so they are shared through files and a scrape of
+any worker reports the whole server.
+"""
+import os
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from config.celery import app as celery_app, uses_celery_broker
+
+MULTIPROCESS = 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by view',
+    ['view', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database queries per request by view',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+DB_QUERY_TIME = Counter(
+    'db_query_duration_seconds',
+    'Time spent in database queries by view',
+    ['view'],
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests',
+    'Cache lookups by namespace and result (hits, misses, errors)',
+    ['namespace', 'result'],
+)
+WORKERS = Gauge(
+    'gunicorn_workers',
+    'Web worker processes',
+    multiprocess_mode='livesum',
+)
+WORKERS_BUSY = Gauge(
+    'gunicorn_workers_busy',
+    'Requests in progress (busy workers, with sync workers)',
+    multiprocess_mode='livesum',
+)
+
+WORKERS.set(1)
+
+
+def get_view_name(request):
+    """`ViewSet.action` for DRF viewsets, the URL name otherwise"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    view = getattr(match.func, 'cls', None)
+    actions = getattr(match.func, 'actions', None)
+    if view is not None and actions:
+        action = actions.get(request.method.lower(), request.method.lower())
+        return f'{view.__name__}.{action}'
+    if view is not None:
+        return view.__name__
+    return match.view_name or match.func.__name__
+
+
+class QueryCounter:
+    """Execute wrapper counting and timing the statements of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """
+    Record latency and database usage of every request; keep it first in
+    MIDDLEWARE so the timings cover the other middleware too
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        WORKERS_BUSY.inc()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(queries))
+                response = self.get_response(request)
+        finally:
+            WORKERS_BUSY.dec()
+
+        view = get_view_name(request)
+        REQUEST_LATENCY.labels(view, request.method, response.status_code).observe(
+            time.perf_counter() - start
+        )
+        REQUEST_QUERIES.labels(view).observe(queries.count)
+        DB_QUERY_TIME.labels(view).inc(queries.duration)
+        return response
+
+
+def get_celery_queues():
+    return getattr(settings, 'METRICS_CELERY_QUEUES', ['celery'])
+
+
+def get_queue_lengths():
+    """{queue: waiting messages} read from the broker; raises if it is unreachable"""
+    with celery_app.connection_for_read() as connection:
+        connection.ensure_connection(max_retries=1)
+        channel = connection.default_channel
+        return {
+            queue: channel.queue_declare(queue, passive=True).message_count
+            for queue in get_celery_queues()
+        }
+
+
+class CeleryQueueCollector:
+    """Length of the Celery queues, read from the broker at scrape time"""
+
+    def collect(self):
+        if not uses_celery_broker():
+            return []
+
+        up = GaugeMetricFamily('celery_broker_up', 'Whether the Celery broker answered')
+        depth = GaugeMetricFamily('celery_queue_length', 'Messages waiting per queue', labels=['queue'])
+        try:
+            lengths = get_queue_lengths()
+        except Exception:
+            up.add_metric([], 0)
+            return [up]
+        up.add_metric([], 1)
+        for queue, length in lengths.items():
+            depth.add_metric([queue], length)
+        return [up, depth]
+
+
+def get_registry():
+    """The registry to scrape: every worker's values when multiprocess"""
+    if not MULTIPROCESS:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+_celery_collector = CeleryQueueCollector()
+
+
+def get_metrics():
+    """All metrics in the Prometheus text exposition format"""
+    output = generate_latest(get_registry())
+    celery_registry = CollectorRegistry()
+    celery_registry.register(_celery_collector)
+    return output + generate_latest(celery_registry)
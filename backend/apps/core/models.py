@@ -0,0 +1,27 @@
+"""
+Models for Core app
+"""
+from django.db import models
+
+
+class ImageAsset(models.Model):
+    """
+    An uploaded image identified by the SHA-256 of its content.
+
+    Identical uploads share one asset, so their renditions are generated and
+    stored once (see `apps.core.renditions`).
+    """
+    content_hash = models.CharField(max_length=64, primary_key=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    renditions = models.JSONField(
+        default=dict, blank=True,
+        help_text="Generated sizes by preset: {preset: {size: {'width', 'height'}}}"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'core_image_assets'
+    
+    def __str__(self):
+        return self.content_hash
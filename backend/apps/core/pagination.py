@@ -0,0 +1,163 @@
+"""
+Shared pagination classes
+"""
+import base64
+import binascii
+import datetime
+import json
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor (keyset) pagination over a fixed composite ordering.
+
+    Pages are fetched with a `WHERE (ordering) < (last row)` predicate instead
+    of `OFFSET n`, and no total count is computed, so deep pages cost the same
+    as the first one. `ordering` must end with a unique field and should match
+    an index on the model.
+
+    Requests that use page-number parameters or a custom `ordering` fall
+    back to `PageNumberPagination`, so existing clients keep working.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    fallback_query_params = ('page', 'ordering')
+    fallback_class = PageNumberPagination
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+        
+        if any(param in request.query_params for param in self.fallback_query_params):
+            self.fallback = self.fallback_class()
+            if not queryset.ordered:
+                # Numbered pages of an unordered queryset may overlap
+                queryset = queryset.order_by(*self.ordering)
+            return self.fallback.paginate_queryset(queryset, request, view)
+        
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+    
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'results': schema,
+            },
+        }
+    
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+    
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+    
+    def get_position_filter(self, position):
+        """
+        Build the keyset predicate for rows strictly after `position`.
+
+        For an ordering (a, b, c) this is
+        `a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)`
+        with the comparison flipped for descending fields.
+        """
+        predicate = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition = Q(**{f'{name}__{lookup}': position[index]})
+            for previous, value in zip(self.ordering[:index], position[:index]):
+                condition &= Q(**{previous.lstrip('-'): value})
+            predicate |= condition
+        return predicate
+    
+    def get_next_link(self):
+        if self.fallback is not None:
+            return self.fallback.get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        values = [getattr(last, field.lstrip('-')) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+    
+    def encode_cursor(self, values):
+        payload = json.dumps([self._encode_value(value) for value in values])
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+    
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, binascii.Error, ValidationError) as exc:
+            raise NotFound('Invalid cursor') from exc
+    
+    def _encode_value(self, value):
+        # Keep full microsecond precision so no row is skipped between pages
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return value
@@ -0,0 +1,192 @@
+"""
+Per-request SQL profiling
+
+`QueryProfilingMiddleware` records every SQL statement a request runs when
+profiling is triggered, either by the `X-SQL-Profile` header carrying
+SQL_PROFILING_TOKEN or by random sampling (SQL_PROFILING_SAMPLE_RATE).
+Statements are grouped by shape (the SQL with parameters and IN lists
+folded), and a shape repeated SQL_PROFILING_DUPLICATE_THRESHOLD times or
+more is reported as an N+1 together with the serializer fields that issued
+it, e.g. `PostDetailSerializer.comments > CommentSerializer.author_avatar`.
+
+The summary is logged and sent back in a `Server-Timing` header. Requests
+that are not profiled pay for one header lookup and one random number.
+"""
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'HTTP_X_SQL_PROFILE'
+
+# Folds `IN (%s, %s, ...)` so batches of any size share one shape
+IN_LIST_RE = re.compile(r'\((?:%s|\?)(?:,\s*(?:%s|\?))*\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+SERIALIZERS_FILE = os.path.join('rest_framework', 'serializers.py')
+APPS_DIR = os.path.join(str(settings.BASE_DIR), 'apps') + os.sep
+
+
+def query_shape(sql):
+    """The statement with parameter lists folded, for grouping duplicates"""
+    return WHITESPACE_RE.sub(' ', IN_LIST_RE.sub('(...)', sql)).strip()
+
+
+def find_origin():
+    """
+    Where the running query comes from: the chain of serializer fields being
+    rendered, or else the innermost frame in project code.
+    """
+    fields = []
+    app_frame = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == 'to_representation' and code.co_filename.endswith(SERIALIZERS_FILE):
+            field = frame.f_locals.get('field')
+            serializer = frame.f_locals.get('self')
+            if field is not None and serializer is not None:
+                fields.append(f'{type(serializer).__name__}.{field.field_name}')
+        elif (app_frame is None and code.co_filename.startswith(APPS_DIR)
+              and code.co_filename != __file__):
+            app_frame = f'{code.co_filename[len(APPS_DIR):]}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    if fields:
+        return ' > '.join(reversed(fields))
+    return app_frame or 'unknown'
+
+
+class QueryProfile:
+    """
+    Execute wrapper collecting the timing and origin of every statement
+    (see `connection.execute_wrapper`)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = defaultdict(lambda: {'count': 0, 'duration': 0.0, 'origins': set()})
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.duration += duration
+
+            origin = find_origin()
+            shape = self.shapes[query_shape(sql)]
+            shape['count'] += 1
+            shape['duration'] += duration
+            shape['origins'].add(origin)
+            if duration >= get_slow_query_ms():
+                self.slow.append({'sql': sql, 'duration': duration, 'origin': origin})
+
+    def duplicates(self):
+        """Shapes run often enough to be an N+1, most frequent first"""
+        threshold = get_duplicate_threshold()
+        duplicates = [
+            {'sql': sql, **shape, 'origins': sorted(shape['origins'])}
+            for sql, shape in self.shapes.items() if shape['count'] >= threshold
+        ]
+        return sorted(duplicates, key=lambda shape: -shape['count'])
+
+    def server_timing(self, total):
+        """Value of the `Server-Timing` header"""
+        metrics = [
+            f'db;dur={self.duration:.1f};desc="{self.count} queries"',
+            f'app;dur={max(total - self.duration, 0):.1f}',
+        ]
+        duplicates = self.duplicates()
+        if duplicates:
+            metrics.append(
+                f'n-plus-one;desc="{len(duplicates)} repeated, '
+                f'{sum(shape["count"] for shape in duplicates)} queries"'
+            )
+        if self.slow:
+            metrics.append(f'slow-sql;desc="{len(self.slow)} slow"')
+        return ', '.join(metrics)
+
+    def log(self, request, response, total):
+        duplicates = self.duplicates()
+        level = logging.WARNING if duplicates or self.slow else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        lines = [
+            f'{request.method} {request.path} {response.status_code}: '
+            f'{self.count} queries in {self.duration:.1f}ms of {total:.1f}ms'
+        ]
+        for shape in duplicates:
+            lines.append(
+                f'  N+1: {shape["count"]}x ({shape["duration"]:.1f}ms) from '
+                f'{", ".join(shape["origins"])}: {shape["sql"][:300]}'
+            )
+        for query in self.slow:
+            lines.append(
+                f'  slow: {query["duration"]:.1f}ms from {query["origin"]}: {query["sql"][:300]}'
+            )
+        logger.log(level, '\n'.join(lines))
+
+
+def get_sample_rate():
+    return getattr(settings, 'SQL_PROFILING_SAMPLE_RATE', 0.0)
+
+
+def get_slow_query_ms():
+    return getattr(settings, 'SQL_PROFILING_SLOW_MS', 100)
+
+
+def get_duplicate_threshold():
+    return getattr(settings, 'SQL_PROFILING_DUPLICATE_THRESHOLD', 5)
+
+
+def should_profile(request):
+    """Whether the request asked for (or was sampled for) profiling"""
+    header = request.META.get(PROFILE_HEADER)
+    if header:
+        token = getattr(settings, 'SQL_PROFILING_TOKEN', '')
+        if token and hmac.compare_digest(header.encode(), token.encode()):
+            return True
+        if settings.DEBUG:
+            return True
+    rate = get_sample_rate()
+    return rate > 0 and random.random() < rate
+
+
+class QueryProfilingMiddleware:
+    """
+    Profile the SQL of triggered requests; see the module docstring
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_profile(request):
+            return self.get_response(request)
+
+        profile = QueryProfile()
+        request.sql_profile = profile
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        total = (time.perf_counter() - start) * 1000
+
+        response['Server-Timing'] = profile.server_timing(total)
+        profile.log(request, response, total)
+        return response
@@ -0,0 +1,222 @@
+"""
+Content-addressed image renditions shared by all apps
+
+Images are resized once per preset into fixed sizes, each written as WebP
+and as a JPEG fallback under a path derived from the SHA-256 of the source
+content:
+
+    renditions/ab/abcdef.../avatar_medium.webp
+
+Identical uploads therefore share their renditions, and a rendition URL is
+built from the hash alone, without touching storage or the database. Apps
+declare which image fields get renditions with `register()`; the hash of a
+field is stored next to it (`<field>_hash`) once its renditions exist, and
+`image_url()` / `RenditionImageField` fall back to the original until then.
+"""
+import hashlib
+import logging
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_init, post_save
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# (model, field) -> preset
+_fields = {}
+
+# Fixed sizes (longest edge, or side of the square crop) per preset
+PRESETS = {
+    'avatar': {'sizes': {'small': 48, 'medium': 96, 'large': 256}, 'crop': True},
+    'icon': {'sizes': {'small': 64, 'medium': 128}, 'crop': True},
+    'logo': {'sizes': {'small': 64, 'medium': 128, 'large': 256}, 'crop': False},
+    'cover': {'sizes': {'medium': 640, 'large': 1280}, 'crop': False},
+}
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def get_preset(name):
+    if name == 'post':
+        # Post media sizes are configurable alongside the media pipeline
+        return {'sizes': getattr(settings, 'MEDIA_RENDITIONS', {}), 'crop': False}
+    return PRESETS[name]
+
+
+def content_hash(file):
+    """SHA-256 of a file-like object, read in chunks"""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(64 * 1024), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def rendition_path(digest, preset, size, extension='webp'):
+    return f'renditions/{digest[:2]}/{digest}/{preset}_{size}.{extension}'
+
+
+def rendition_url(digest, preset, size, extension='webp'):
+    return default_storage.url(rendition_path(digest, preset, size, extension))
+
+
+def _resize(image, size, crop):
+    if crop:
+        return ImageOps.fit(image, (size, size), Image.LANCZOS)
+    resized = image.copy()
+    resized.thumbnail((size, size), Image.LANCZOS)
+    return resized
+
+
+def _write(path, image, extension):
+    image_format, options = FORMATS[extension]
+    if extension == 'jpg' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    default_storage.save(path, ContentFile(buffer.getvalue()))
+
+
+def generate(file, preset):
+    """
+    Return the asset of an image file with the renditions of a preset,
+    rendering them only if no identical upload was rendered before.
+    """
+    from .models import ImageAsset
+
+    digest = content_hash(file)
+    asset, _ = ImageAsset.objects.get_or_create(content_hash=digest)
+    if preset in asset.renditions:
+        return asset
+
+    image = ImageOps.exif_transpose(Image.open(file))
+    if image.mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    options = get_preset(preset)
+    sizes = {}
+    for name, size in options['sizes'].items():
+        resized = _resize(image, size, options['crop'])
+        for extension in FORMATS:
+            _write(rendition_path(digest, preset, name, extension), resized, extension)
+        sizes[name] = {'width': resized.width, 'height': resized.height}
+
+    # Other presets may be rendered concurrently; only add this one
+    with transaction.atomic():
+        asset = ImageAsset.objects.select_for_update().get(pk=digest)
+        asset.width, asset.height = image.size
+        asset.renditions[preset] = sizes
+        asset.save(update_fields=['width', 'height', 'renditions'])
+    return asset
+
+
+def image_url(field_file, preset, size, request=None):
+    """
+    URL of a registered image field at one preset size, or of the original
+    while its renditions haven't been generated yet.
+    """
+    if not field_file:
+        return None
+    digest = getattr(field_file.instance, f'{field_file.field.name}_hash', '')
+    url = rendition_url(digest, preset, size) if digest else field_file.url
+    return request.build_absolute_uri(url) if request else url
+
+
+class RenditionImageField(serializers.ImageField):
+    """
+    Image field that accepts uploads as usual but represents the stored image
+    by its rendition URL at one preset size.
+    """
+
+    def __init__(self, preset, size, **kwargs):
+        self.preset = preset
+        self.size = size
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return image_url(value, self.preset, self.size, self.context.get('request'))
+
+
+def _stored_name(instance, field):
+    """
+    Name of the file in an image field, read without loading a deferred
+    field (instances are created for every row, this runs on each of them).
+    """
+    value = instance.__dict__.get(field)
+    return (getattr(value, 'name', value) or '') if value is not None else ''
+
+
+def register(model, field, preset):
+    """
+    Generate renditions whenever a new image is stored in `model.field`.
+
+    The model needs a `<field>_hash` column; it is cleared when the image
+    changes and set by the background task once the renditions exist.
+    """
+    _fields[(model, field)] = preset
+    attribute = f'_rendition_source_{field}'
+    hash_field = f'{field}_hash'
+
+    def remember_source(sender, instance, **kwargs):
+        setattr(instance, attribute, _stored_name(instance, field))
+
+    def receiver(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (update_fields and field not in update_fields):
+            return
+        name = _stored_name(instance, field)
+        if name == getattr(instance, attribute, ''):
+            return
+        setattr(instance, attribute, name)
+
+        if instance.__dict__.get(hash_field):
+            setattr(instance, hash_field, '')
+            sender.objects.filter(pk=instance.pk).update(**{hash_field: ''})
+        if name:
+            from .tasks import generate_field_renditions
+            transaction.on_commit(lambda: generate_field_renditions.delay(
+                sender._meta.label, instance.pk, field
+            ))
+
+    uid = f'renditions-{model._meta.label}-{field}'
+    post_init.connect(remember_source, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+
+
+def get_registered_fields():
+    return list(_fields)
+
+
+def process_field(label, pk, field):
+    """Render a registered image field and record its content hash"""
+    model = apps.get_model(label)
+    preset = _fields[(model, field)]
+    instance = model.objects.filter(pk=pk).only('pk', field).first()
+    field_file = getattr(instance, field, None) if instance else None
+    if not field_file:
+        return None
+
+    name = field_file.name
+    try:
+        with field_file.open('rb') as source:
+            asset = generate(source, preset)
+    except (Image.UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning('Cannot render %s.%s of %s: %s', label, field, pk, e)
+        return None
+
+    # Only if the field wasn't changed again while rendering
+    model.objects.filter(pk=pk, **{field: name}).update(**{f'{field}_hash': asset.content_hash})
+    return asset
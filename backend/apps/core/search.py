@@ -0,0 +1,252 @@
+"""
+Full-text search helpers shared by Posts and Groups apps
+
+Searchable models keep a `search_vector` (tsvector) column with a GIN index.
+Apps declare the text of each document with `register()`, which rebuilds the
+vector after every save (and `rebuild_search_index` for existing rows). Each
+document is indexed
+three ways so that one query matches across the languages used in the
+community:
+
+    english - stemmed English text ("praying" matches "prays")
+    arabic  - Arabic text with diacritics and letter variants normalized
+    simple  - Latin transliteration keys, so spelling variants of Coptic and
+              Arabic names ("Mina"/"Mena", "Girgis"/"Gerges") match each other
+
+`build_search_query()` turns user input into the matching tsquery, with
+prefix matching on the transliteration keys for search-as-you-type.
+
+Short fields such as names use `fuzzy_search()` instead, which matches each
+typed word by trigram word similarity (pg_trgm, GIN `gin_trgm_ops` indexes)
+so partial and misspelled names ("Mena" for "Mina") are still found.
+"""
+import re
+import unicodedata
+import operator
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+)
+from django.db import connection, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_save
+from rest_framework.filters import BaseFilterBackend
+
+# model -> (document callable, select_related fields)
+_documents = {}
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Arabic short vowels, tanween, shadda, sukun and tatweel
+ARABIC_DIACRITICS_RE = re.compile('[\u064B-\u0652\u0670\u0640]')
+ARABIC_LETTER_VARIANTS = str.maketrans({
+    'أ': 'ا',  # alef with hamza above -> alef
+    'إ': 'ا',  # alef with hamza below -> alef
+    'آ': 'ا',  # alef with madda -> alef
+    'ٱ': 'ا',  # alef wasla -> alef
+    'ة': 'ه',  # teh marbuta -> heh
+    'ى': 'ي',  # alef maksura -> yeh
+})
+
+# Transliteration folding, applied in order
+TRANSLITERATION_RULES = [
+    (re.compile(r'gu(?=[aeiouy])'), 'g'),  # Guirguis -> Girgis
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'(?<=[a-z])ou'), 'u'),    # Youssef -> Yussef
+    (re.compile(r'[eiy]'), 'i'),           # Mena -> Mina, Bishoy -> Bishoi
+    (re.compile(r'[ou]'), 'u'),            # Boutros -> Butrus
+    (re.compile(r'(.)\1+'), r'\1'),        # Youssef -> Yusif
+]
+
+
+def normalize_arabic(text):
+    """Strip Arabic diacritics and fold letter variants"""
+    return ARABIC_DIACRITICS_RE.sub('', text).translate(ARABIC_LETTER_VARIANTS)
+
+
+def transliteration_key(word):
+    """Fold a Latin word to a key shared by its common spelling variants"""
+    word = unicodedata.normalize('NFKD', word.lower())
+    word = ''.join(char for char in word if not unicodedata.combining(char))
+    if not word.isascii():
+        return ''
+    for pattern, replacement in TRANSLITERATION_RULES:
+        word = pattern.sub(replacement, word)
+    return word
+
+
+def transliteration_keys(text):
+    """Space separated transliteration keys of every Latin word in `text`"""
+    keys = (transliteration_key(word) for word in WORD_RE.findall(text or ''))
+    return ' '.join(key for key in keys if key)
+
+
+def build_search_vector(*weighted_texts):
+    """
+    Build the stored vector for a document.
+
+    `weighted_texts` are (text, weight) pairs, e.g. the title with weight 'A'
+    and the body with weight 'B'.
+    """
+    vectors = []
+    for text, weight in weighted_texts:
+        text = text or ''
+        vectors.extend([
+            SearchVector(Value(text), config='english', weight=weight),
+            SearchVector(Value(normalize_arabic(text)), config='arabic', weight=weight),
+            SearchVector(Value(transliteration_keys(text)), config='simple', weight=weight),
+        ])
+    return reduce(lambda left, right: left + right, vectors)
+
+
+def update_search_vector(instance, *weighted_texts):
+    """Store the search vector of a saved instance without firing signals"""
+    type(instance).objects.filter(pk=instance.pk).update(
+        search_vector=build_search_vector(*weighted_texts)
+    )
+
+
+def register(model, document, fields, select_related=()):
+    """
+    Index a model.
+
+    `document(instance)` returns the (text, weight) pairs to index and
+    `fields` are the model fields it reads; saves that only touch other
+    fields (e.g. counter updates) don't rebuild the vector.
+    """
+    fields = set(fields)
+    _documents[model] = (document, select_related)
+
+    def receiver(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (update_fields and not fields.intersection(update_fields)):
+            return
+        update_search_vector(instance, *document(instance))
+
+    post_save.connect(
+        receiver, sender=model, weak=False, dispatch_uid=f'search-{model._meta.label}'
+    )
+
+
+def get_registered_models():
+    return list(_documents)
+
+
+def rebuild(model, batch_size=500):
+    """Recompute the search vectors of every row of a registered model"""
+    document, select_related = _documents[model]
+    count = 0
+    for instance in model.objects.select_related(*select_related).iterator(chunk_size=batch_size):
+        update_search_vector(instance, *document(instance))
+        count += 1
+    return count
+
+
+def build_search_query(text):
+    """
+    Build the tsquery for user input, or None if it has no searchable words.
+
+    English and Arabic use websearch syntax ("quoted phrases", -exclusions);
+    transliteration keys are ANDed with the last word matched as a prefix.
+    """
+    text = (text or '').strip()
+    if not WORD_RE.search(text):
+        return None
+
+    query = (
+        SearchQuery(text, config='english', search_type='websearch')
+        | SearchQuery(normalize_arabic(text), config='arabic', search_type='websearch')
+    )
+    keys = transliteration_keys(text).split()
+    if keys:
+        keys[-1] += ':*'
+        query |= SearchQuery(' & '.join(keys), config='simple', search_type='raw')
+    return query
+
+
+def search(queryset, text, rank=True):
+    """
+    Filter a queryset with a `search_vector` column by user input.
+
+    With `rank`, results are annotated with `search_rank` and ordered by it.
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset.none()
+
+    queryset = queryset.filter(search_vector=query)
+    if rank:
+        queryset = queryset.annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        ).order_by('-search_rank', '-pk')
+    return queryset
+
+
+def fuzzy_search(queryset, text, fields, limit=10):
+    """
+    Typeahead lookup of short text fields by trigram word similarity.
+
+    Every typed word must be similar to a word in one of `fields`; results
+    are ordered by the summed similarity and evaluated immediately, because
+    the similarity threshold is set for the enclosing transaction only.
+    """
+    words = WORD_RE.findall(text or '')[:5]
+    if not words:
+        return []
+
+    scores = []
+    for word in words:
+        queryset = queryset.filter(reduce(operator.or_, [
+            Q(**{f'{field}__trigram_word_similar': word}) for field in fields
+        ]))
+        similarities = [TrigramWordSimilarity(word, field) for field in fields]
+        scores.append(Greatest(*similarities) if len(similarities) > 1 else similarities[0])
+
+    queryset = queryset.annotate(
+        similarity=reduce(operator.add, scores)
+    ).order_by('-similarity', 'pk')[:limit]
+
+    threshold = getattr(settings, 'FUZZY_SEARCH_THRESHOLD', 0.3)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # `<%` uses this threshold, and can still be answered from the GIN index
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(threshold)]
+            )
+        return list(queryset)
+
+
+def get_typeahead_limit(request, default=10, maximum=25):
+    """Read the `limit` query parameter of typeahead endpoints"""
+    try:
+        return min(max(int(request.GET.get('limit', default)), 1), maximum)
+    except ValueError:
+        return default
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Drop-in replacement for `SearchFilter` on models with a `search_vector`.
+
+    Matches `?search=` against the indexed vector instead of ILIKE scans and
+    keeps the view's ordering, so it works with keyset pagination.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+        return search(queryset, text, rank=False)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Full-text search terms',
+            'schema': {'type': 'string'},
+        }]
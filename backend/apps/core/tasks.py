@@ -0,0 +1,20 @@
+"""
+Background tasks for Core app
+"""
+from celery import shared_task
+
+from . import counters, renditions
+
+
+@shared_task(
+    autoretry_for=(OSError,), retry_backoff=True, max_retries=3, ignore_result=True
+)
+def generate_field_renditions(label, pk, field):
+    """Render a newly uploaded image field in its preset sizes"""
+    renditions.process_field(label, pk, field)
+
+
+@shared_task(ignore_result=True)
+def flush_counters():
+    """Write buffered counter deltas; scheduled by CELERY_BEAT_SCHEDULE"""
+    counters.flush()
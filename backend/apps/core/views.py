@@ -0,0 +1,52 @@
+"""
+Views for Core app
+"""
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import never_cache
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from . import health
+from .metrics import get_metrics
+
+
+@never_cache
+def liveness(request):
+    """
+    Liveness probe: the process is up and serving requests. Touches no
+    backing service, so an outage elsewhere doesn't get workers restarted.
+    """
+    return JsonResponse({"status": "healthy", "message": "Coptic Social Network API is running"})
+
+
+@never_cache
+def readiness(request):
+    """
+    Readiness probe: 200 when the database, cache and migrations checks
+    pass, 503 otherwise; the task backlog is reported but doesn't count
+    """
+    result = health.readiness()
+    return JsonResponse(
+        {'status': 'ready' if result['ready'] else 'unavailable', 'checks': result['checks']},
+        status=200 if result['ready'] else 503
+    )
+
+
+@never_cache
+def metrics(request):
+    """
+    Prometheus scrape endpoint; requires `Authorization: Bearer <METRICS_TOKEN>`.
+    Without a token it is only served with DEBUG, and is a 404 otherwise.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=404)
+    else:
+        expected = f'Bearer {token}'.encode()
+        given = request.META.get('HTTP_AUTHORIZATION', '').encode()
+        if not hmac.compare_digest(given, expected):
+            return HttpResponse(status=401)
+    return HttpResponse(get_metrics(), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,126 @@
+"""
+Group visibility resolver for Groups app
+
+Every group viewset filters by the same rule: public groups, parish-only
+groups of the user's parish, and private / invite-only groups the user is an
+active member of. `GroupAccess` resolves the user's memberships and roles
+once (cached across requests and invalidated when a membership changes) and
+turns the rule into a plain predicate on indexed group columns, so querysets
+need no membership join and no DISTINCT. Role checks (`Group.get_user_role`,
+the permission classes, serializers) read the same role map.
+"""
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import access_cache
+from .models import GroupMembership, GroupPrivacy
+
+
+MEMBERS_ONLY = [GroupPrivacy.PRIVATE, GroupPrivacy.INVITE_ONLY]
+
+
+class GroupAccess:
+    """
+    Groups visible to one user, and the user's role in each of them.
+
+    Use `GroupAccess.for_user(user)`; the instance is kept on the user
+    object, so permission checks, model helpers and serializers handling the
+    same request share one lookup.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._roles = None
+        self._memberships = {}
+
+    @classmethod
+    def for_user(cls, user):
+        access = getattr(user, '_group_access', None)
+        if access is None:
+            access = cls(user)
+            user._group_access = access
+        return access
+
+    @property
+    def roles(self):
+        """{group_id: role} for every group the user is an active member of"""
+        if self._roles is None:
+            if not self.user.is_authenticated:
+                self._roles = {}
+            else:
+                self._roles = access_cache.get_or_set(
+                    ('roles',),
+                    lambda: dict(GroupMembership.objects.filter(
+                        user_id=self.user.pk, is_active=True
+                    ).values_list('group_id', 'role')),
+                    scope=self.user.pk
+                )
+        return self._roles
+
+    @property
+    def member_group_ids(self):
+        """Ids of the groups the user is an active member of"""
+        return self.roles.keys()
+
+    def role(self, group):
+        """The user's role in a group (or group id), or None"""
+        return self.roles.get(getattr(group, 'pk', group))
+
+    def is_member(self, group):
+        return self.role(group) is not None
+
+    def group_ids_with_role(self, *roles):
+        return [group_id for group_id, role in self.roles.items() if role in roles]
+
+    def membership(self, group):
+        """The user's active membership row in a group, loaded once per request"""
+        group_id = getattr(group, 'pk', group)
+        if not self.is_member(group_id):
+            return None
+        if group_id not in self._memberships:
+            self._memberships[group_id] = GroupMembership.objects.filter(
+                group_id=group_id, user_id=self.user.pk, is_active=True
+            ).select_related('group', 'user').first()
+        return self._memberships[group_id]
+
+    def visible_q(self, prefix=''):
+        """
+        Predicate matching visible groups; `prefix` points at the group from
+        a related model, e.g. `visible_q('group__')`.
+        """
+        if self.user.is_superuser:
+            # Matches every row, also when OR'ed with other conditions (an
+            # empty Q() would drop out of `visible_q() | Q(...)`)
+            return ~Q(pk__in=[])
+
+        predicate = Q(**{f'{prefix}privacy': GroupPrivacy.PUBLIC})
+        if self.user.parish_id:
+            predicate |= Q(**{
+                f'{prefix}privacy': GroupPrivacy.PARISH_ONLY,
+                f'{prefix}parish_id': self.user.parish_id,
+            })
+        if self.member_group_ids:
+            predicate |= Q(**{
+                f'{prefix}privacy__in': MEMBERS_ONLY,
+                f'{prefix}id__in': list(self.member_group_ids),
+            })
+        return predicate
+
+    def can_view(self, group):
+        """Python counterpart of `visible_q` for a single group"""
+        if self.user.is_superuser or group.privacy == GroupPrivacy.PUBLIC:
+            return True
+        if group.privacy == GroupPrivacy.PARISH_ONLY:
+            return self.user.parish_id is not None and self.user.parish_id == group.parish_id
+        if group.privacy in MEMBERS_ONLY:
+            return self.is_member(group)
+        return False
+
+
+@receiver([post_save, post_delete], sender=GroupMembership)
+def forget_group_access(sender, instance, **kwargs):
+    """Drop the resolved access of a user object whose membership just changed"""
+    user = instance._state.fields_cache.get('user')
+    if user is not None and hasattr(user, '_group_access'):
+        del user._group_access
@@ -12,6 +12,7 @@ from .models import (
     Group, GroupMembership, GroupJoinRequest, 
     GroupInvitation, GroupPost, GroupEvent
 )
+from .cache import invalidate_groups, invalidate_memberships
 
 
 @admin.register(Group)
@@ -67,24 +68,28 @@ class GroupAdmin(admin.ModelAdmin):
     def activate_groups(self, request, queryset):
         """Bulk activate groups"""
         updated = queryset.update(is_active=True)
+        invalidate_groups(queryset.values_list('pk', flat=True))
         self.message_user(request, f'{updated} groups activated.')
     activate_groups.short_description = _('Activate selected groups')
     
     def deactivate_groups(self, request, queryset):
         """Bulk deactivate groups"""
         updated = queryset.update(is_active=False)
+        invalidate_groups(queryset.values_list('pk', flat=True))
         self.message_user(request, f'{updated} groups deactivated.')
     deactivate_groups.short_description = _('Deactivate selected groups')
     
     def feature_groups(self, request, queryset):
         """Bulk feature groups"""
         updated = queryset.update(is_featured=True)
+        invalidate_groups(queryset.values_list('pk', flat=True))
         self.message_user(request, f'{updated} groups featured.')
     feature_groups.short_description = _('Feature selected groups')
     
     def unfeature_groups(self, request, queryset):
         """Bulk unfeature groups"""
         updated = queryset.update(is_featured=False)
+        invalidate_groups(queryset.values_list('pk', flat=True))
         self.message_user(request, f'{updated} groups unfeatured.')
     unfeature_groups.short_description = _('Unfeature selected groups')
 
@@ -142,18 +147,21 @@ class GroupMembershipAdmin(admin.ModelAdmin):
     def promote_to_admin(self, request, queryset):
         """Promote members to admin"""
         updated = queryset.update(role='admin')
+        invalidate_memberships(queryset)
         self.message_user(request, f'{updated} members promoted to admin.')
     promote_to_admin.short_description = _('Promote to Admin')
     
     def promote_to_moderator(self, request, queryset):
         """Promote members to moderator"""
         updated = queryset.update(role='moderator')
+        invalidate_memberships(queryset)
         self.message_user(request, f'{updated} members promoted to moderator.')
     promote_to_moderator.short_description = _('Promote to Moderator')
     
     def demote_to_member(self, request, queryset):
         """Demote to regular member"""
         updated = queryset.update(role='member')
+        invalidate_memberships(queryset)
         self.message_user(request, f'{updated} users demoted to member.')
     demote_to_member.short_description = _('Demote to Member')
 
@@ -10,5 +10,7 @@ class GroupsConfig(AppConfig):
     verbose_name = 'Groups'
     
     def ready(self):
-        """Import signals when app is ready"""
-        import apps.groups.signals 
\ No newline at end of file
+        """Import signals and cache invalidation hooks when app is ready"""
+        import apps.groups.signals
+        import apps.groups.cache
+        import apps.groups.access 
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Cache namespaces for Groups app
+"""
+from django.db import transaction
+
+from apps.core.cache import CacheNamespace
+from .models import Group, GroupMembership, GroupPost, GroupEvent
+
+# Shared (non user specific) parts of the group detail, scoped per group
+group_detail_cache = CacheNamespace('groups:detail', timeout=300)
+
+group_detail_cache.invalidate_on(Group, scope=lambda group: group.pk)
+group_detail_cache.invalidate_on(GroupPost, GroupEvent, scope=lambda obj: obj.group_id)
+
+# Group memberships of a user, scoped per user
+access_cache = CacheNamespace('groups:access', timeout=600)
+
+access_cache.invalidate_on(GroupMembership, scope=lambda membership: membership.user_id)
+
+
+def invalidate_groups(group_ids):
+    """Invalidate group details after a bulk `QuerySet.update()`, which sends no signals"""
+    for group_id in set(group_ids):
+        transaction.on_commit(lambda group_id=group_id: group_detail_cache.invalidate(group_id))
+
+
+def invalidate_memberships(memberships):
+    """Invalidate access and group details for memberships changed in bulk"""
+    rows = list(memberships.values_list('user_id', 'group_id'))
+    for user_id in {user_id for user_id, group_id in rows}:
+        transaction.on_commit(lambda user_id=user_id: access_cache.invalidate(user_id))
+    invalidate_groups(group_id for user_id, group_id in rows)
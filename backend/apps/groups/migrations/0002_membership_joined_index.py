@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groupmembership',
+            index=models.Index(fields=['group', 'is_active', '-joined_at', '-id'], name='groups_grou_group_i_fa60db_idx'),
+        ),
+    ]
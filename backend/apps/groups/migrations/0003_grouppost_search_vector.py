@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_membership_joined_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grouppost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='grouppost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='groups_post_search_gin'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:14
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0003_grouppost_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='group',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='groups_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0004_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='cover_image_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='icon_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -6,6 +6,8 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 
 class GroupType(models.TextChoices):
@@ -95,6 +97,8 @@ class Group(models.Model):
         blank=True,
         null=True
     )
+    cover_image_hash = models.CharField(max_length=64, blank=True, editable=False)
+    icon_hash = models.CharField(max_length=64, blank=True, editable=False)
     
     # Group settings
     is_active = models.BooleanField(_('is active'), default=True)
@@ -124,6 +128,8 @@ class Group(models.Model):
             models.Index(fields=['parish', '-created_at']),
             models.Index(fields=['group_type', 'is_active']),
             models.Index(fields=['privacy', 'is_active']),
+            # Trigram index for fuzzy name lookup (core.search.fuzzy_search)
+            GinIndex(fields=['name'], name='groups_name_trgm', opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
@@ -142,17 +148,14 @@ class Group(models.Model):
             return False
         if self.is_full:
             return False
-        if user.parish != self.parish and self.privacy != GroupPrivacy.PUBLIC:
+        if user.parish_id != self.parish_id and self.privacy != GroupPrivacy.PUBLIC:
             return False
         return True
     
     def get_user_role(self, user):
         """Get user's role in this group"""
-        try:
-            membership = self.memberships.get(user=user, is_active=True)
-            return membership.role
-        except GroupMembership.DoesNotExist:
-            return None
+        from .access import GroupAccess
+        return GroupAccess.for_user(user).role(self)
 
 
 class GroupMembership(models.Model):
@@ -194,6 +197,7 @@ class GroupMembership(models.Model):
         ordering = ['-joined_at']
         indexes = [
             models.Index(fields=['group', 'is_active']),
+            models.Index(fields=['group', 'is_active', '-joined_at', '-id']),
             models.Index(fields=['user', 'is_active']),
             models.Index(fields=['role', 'is_active']),
         ]
@@ -365,6 +369,9 @@ class GroupPost(models.Model):
     updated_at = models.DateTimeField(_('updated at'), auto_now=True)
     published_at = models.DateTimeField(_('published at'), auto_now_add=True)
     
+    # Full-text search document, maintained by signals (see core.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         verbose_name = _('Group Post')
         verbose_name_plural = _('Group Posts')
@@ -374,6 +381,7 @@ class GroupPost(models.Model):
             models.Index(fields=['author', '-created_at']),
             models.Index(fields=['is_announcement', '-published_at']),
             models.Index(fields=['is_pinned', '-published_at']),
+            GinIndex(fields=['search_vector'], name='groups_post_search_gin'),
         ]
     
     def __str__(self):
@@ -0,0 +1,15 @@
+"""
+Pagination classes for Groups app - Phase 4
+"""
+from apps.core.pagination import KeysetPagination
+
+
+class GroupPostCursorPagination(KeysetPagination):
+    """Pinned posts first, then newest; matches the `(is_pinned, -published_at)` index"""
+    ordering = ('-is_pinned', '-published_at', '-id')
+
+
+class GroupMemberCursorPagination(KeysetPagination):
+    """Newest members first; matches the `(group, is_active, -joined_at)` index"""
+    ordering = ('-joined_at', '-id')
+    page_size = 50
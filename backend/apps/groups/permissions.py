@@ -3,6 +3,8 @@ Permissions for Groups app - Phase 4
 """
 from rest_framework import permissions
 
+from .access import GroupAccess
+
 
 class GroupPermissions(permissions.BasePermission):
     """
@@ -42,13 +44,7 @@ class GroupPermissions(permissions.BasePermission):
     
     def _can_view_group(self, user, group):
         """Check if user can view the group"""
-        if group.privacy == 'public':
-            return True
-        elif group.privacy == 'parish_only':
-            return user.parish == group.parish
-        elif group.privacy in ['private', 'invite_only']:
-            return group.memberships.filter(user=user, is_active=True).exists()
-        return False
+        return GroupAccess.for_user(user).can_view(group)
     
     def _can_edit_group(self, user, group):
         """Check if user can edit the group"""
@@ -132,13 +128,7 @@ class GroupPostPermissions(permissions.BasePermission):
     
     def _can_access_group(self, user, group):
         """Check if user can access the group"""
-        if group.privacy == 'public':
-            return True
-        elif group.privacy == 'parish_only':
-            return user.parish == group.parish
-        elif group.privacy in ['private', 'invite_only']:
-            return group.memberships.filter(user=user, is_active=True).exists()
-        return False
+        return GroupAccess.for_user(user).can_view(group)
 
 
 class GroupEventPermissions(permissions.BasePermission):
@@ -181,10 +171,4 @@ class GroupEventPermissions(permissions.BasePermission):
     
     def _can_access_group(self, user, group):
         """Check if user can access the group"""
-        if group.privacy == 'public':
-            return True
-        elif group.privacy == 'parish_only':
-            return user.parish == group.parish
-        elif group.privacy in ['private', 'invite_only']:
-            return group.memberships.filter(user=user, is_active=True).exists()
-        return False 
\ No newline at end of file
+        return GroupAccess.for_user(user).can_view(group) 
\ No newline at end of file
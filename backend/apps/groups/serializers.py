@@ -9,8 +9,11 @@ from .models import (
     Group, GroupMembership, GroupJoinRequest, 
     GroupInvitation, GroupPost, GroupEvent
 )
+from apps.core.renditions import RenditionImageField
 from apps.users.serializers import UserBasicSerializer
 from apps.parishes.serializers import ParishBasicSerializer
+from .access import GroupAccess
+from .cache import group_detail_cache
 
 User = get_user_model()
 
@@ -20,6 +23,8 @@ class GroupBasicSerializer(serializers.ModelSerializer):
     
     parish = ParishBasicSerializer(read_only=True)
     created_by = UserBasicSerializer(read_only=True)
+    cover_image = RenditionImageField('cover', 'medium', required=False, allow_null=True)
+    icon = RenditionImageField('icon', 'small', required=False, allow_null=True)
     
     class Meta:
         model = Group
@@ -47,12 +52,28 @@ class GroupMembershipSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'joined_at']
 
 
+class GroupMemberSerializer(serializers.ModelSerializer):
+    """Lightweight membership serializer for member listings"""
+    
+    user = UserBasicSerializer(read_only=True)
+    
+    class Meta:
+        model = GroupMembership
+        fields = ['id', 'user', 'role', 'joined_at']
+        read_only_fields = fields
+
+
 class GroupDetailSerializer(serializers.ModelSerializer):
-    """Detailed group serializer with memberships and stats"""
+    """Detailed group serializer with a member preview and stats"""
+    
+    # Members shown in the detail; the full list is paginated under /members/
+    MEMBER_PREVIEW_SIZE = 10
     
     parish = ParishBasicSerializer(read_only=True)
     created_by = UserBasicSerializer(read_only=True)
-    memberships = GroupMembershipSerializer(many=True, read_only=True)
+    cover_image = RenditionImageField('cover', 'large', required=False, allow_null=True)
+    icon = RenditionImageField('icon', 'medium', required=False, allow_null=True)
+    member_preview = serializers.SerializerMethodField()
     user_role = serializers.SerializerMethodField()
     user_membership = serializers.SerializerMethodField()
     can_user_join = serializers.SerializerMethodField()
@@ -66,17 +87,29 @@ class GroupDetailSerializer(serializers.ModelSerializer):
             'parish', 'created_by', 'cover_image', 'icon',
             'is_active', 'is_featured', 'allow_member_posts', 'require_approval',
             'member_count', 'max_members', 'post_count',
-            'memberships', 'user_role', 'user_membership', 'can_user_join',
+            'member_preview', 'user_role', 'user_membership', 'can_user_join',
             'recent_posts', 'upcoming_events',
             'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'member_count', 'post_count', 'memberships',
+            'id', 'member_count', 'post_count', 'member_preview',
             'user_role', 'user_membership', 'can_user_join',
             'recent_posts', 'upcoming_events',
             'created_at', 'updated_at'
         ]
     
+    def get_member_preview(self, obj):
+        """Get the most recent members of this group"""
+        return group_detail_cache.get_or_set(
+            ('member_preview',), lambda: self._member_preview(obj), scope=obj.pk
+        )
+    
+    def _member_preview(self, obj):
+        memberships = obj.memberships.filter(
+            is_active=True
+        ).select_related('user').order_by('-joined_at', '-id')[:self.MEMBER_PREVIEW_SIZE]
+        return GroupMemberSerializer(memberships, many=True).data
+    
     def get_user_role(self, obj):
         """Get current user's role in this group"""
         request = self.context.get('request')
@@ -88,11 +121,9 @@ class GroupDetailSerializer(serializers.ModelSerializer):
         """Get current user's membership details"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            try:
-                membership = obj.memberships.get(user=request.user, is_active=True)
+            membership = GroupAccess.for_user(request.user).membership(obj)
+            if membership is not None:
                 return GroupMembershipSerializer(membership).data
-            except GroupMembership.DoesNotExist:
-                return None
         return None
     
     def get_can_user_join(self, obj):
@@ -104,10 +135,15 @@ class GroupDetailSerializer(serializers.ModelSerializer):
     
     def get_recent_posts(self, obj):
         """Get recent posts from this group"""
+        return group_detail_cache.get_or_set(
+            ('recent_posts',), lambda: self._recent_posts(obj), scope=obj.pk
+        )
+    
+    def _recent_posts(self, obj):
         recent_posts = obj.posts.filter(
             is_approved=True, 
             is_deleted=False
-        ).order_by('-published_at')[:5]
+        ).select_related('author').order_by('-published_at')[:5]
         
         # Return basic post data without using serializer to avoid circular import
         return [{
@@ -125,6 +161,11 @@ class GroupDetailSerializer(serializers.ModelSerializer):
     
     def get_upcoming_events(self, obj):
         """Get upcoming events from this group"""
+        return group_detail_cache.get_or_set(
+            ('upcoming_events',), lambda: self._upcoming_events(obj), scope=obj.pk
+        )
+    
+    def _upcoming_events(self, obj):
         upcoming_events = obj.events.filter(
             start_datetime__gte=timezone.now()
         ).order_by('start_datetime')[:3]
@@ -222,7 +263,7 @@ class CreateJoinRequestSerializer(serializers.ModelSerializer):
             )
         
         # Check if already a member
-        if value.memberships.filter(user=user, is_active=True).exists():
+        if GroupAccess.for_user(user).is_member(value):
             raise serializers.ValidationError(
                 "You are already a member of this group."
             )
@@ -383,7 +424,7 @@ class CreateGroupPostSerializer(serializers.ModelSerializer):
         user = request.user
         
         # Check if user is a member
-        if not value.memberships.filter(user=user, is_active=True).exists():
+        if not GroupAccess.for_user(user).is_member(value):
             raise serializers.ValidationError(
                 "You must be a member to post in this group."
             )
@@ -420,13 +461,7 @@ class CreateGroupPostSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         validated_data['author'] = request.user
         
-        post = super().create(validated_data)
-        
-        # Update group post count
-        post.group.post_count += 1
-        post.group.save()
-        
-        return post
+        return super().create(validated_data)
 
 
 class GroupEventBasicSerializer(serializers.ModelSerializer):
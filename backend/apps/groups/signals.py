@@ -5,7 +5,24 @@ from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import GroupMembership, GroupPost, GroupJoinRequest, GroupInvitation
+from apps.core import counters, renditions, search
+from .models import Group, GroupMembership, GroupPost, GroupJoinRequest, GroupInvitation
+
+
+counters.register_source(
+    Group, 'post_count',
+    lambda: GroupPost.objects.filter(is_approved=True, is_deleted=False), 'group'
+)
+
+search.register(
+    GroupPost,
+    lambda post: [(post.title, 'A'), (post.content, 'B'), (post.author.full_name, 'C')],
+    fields={'title', 'content', 'author'},
+    select_related=('author',)
+)
+
+renditions.register(Group, 'cover_image', 'cover')
+renditions.register(Group, 'icon', 'icon')
 
 
 @receiver(post_save, sender=GroupMembership)
@@ -31,8 +48,7 @@ def update_group_member_count_on_delete(sender, instance, **kwargs):
 def update_group_post_count_on_save(sender, instance, created, **kwargs):
     """Update group post count when post is created"""
     if created and instance.is_approved and not instance.is_deleted:
-        instance.group.post_count += 1
-        instance.group.save(update_fields=['post_count'])
+        counters.increment(Group, instance.group_id, post_count=1)
 
 
 @receiver(pre_save, sender=GroupPost)
@@ -47,11 +63,9 @@ def update_group_post_count_on_status_change(sender, instance, **kwargs):
             new_counted = instance.is_approved and not instance.is_deleted
             
             if old_counted != new_counted:
-                if new_counted:
-                    instance.group.post_count += 1
-                else:
-                    instance.group.post_count -= 1
-                instance.group.save(update_fields=['post_count'])
+                counters.increment(
+                    Group, instance.group_id, post_count=1 if new_counted else -1
+                )
         except GroupPost.DoesNotExist:
             pass
 
@@ -60,8 +74,7 @@ def update_group_post_count_on_status_change(sender, instance, **kwargs):
 def update_group_post_count_on_delete(sender, instance, **kwargs):
     """Update group post count when post is deleted"""
     if instance.is_approved and not instance.is_deleted:
-        instance.group.post_count -= 1
-        instance.group.save(update_fields=['post_count'])
+        counters.increment(Group, instance.group_id, post_count=-1)
 
 
 @receiver(post_save, sender=GroupJoinRequest)
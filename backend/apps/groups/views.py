@@ -10,24 +10,34 @@ from django.db.models import Q, Count, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from apps.core import search
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.search import FullTextSearchFilter
 from .models import (
     Group, GroupMembership, GroupJoinRequest, 
     GroupInvitation, GroupPost, GroupEvent
 )
 from .serializers import (
     GroupBasicSerializer, GroupDetailSerializer, CreateGroupSerializer,
-    GroupMembershipSerializer, GroupJoinRequestSerializer, CreateJoinRequestSerializer,
+    GroupMemberSerializer, GroupMembershipSerializer, GroupJoinRequestSerializer, CreateJoinRequestSerializer,
     GroupInvitationSerializer, CreateInvitationSerializer,
     GroupPostBasicSerializer, GroupPostDetailSerializer, CreateGroupPostSerializer,
     GroupEventBasicSerializer, GroupEventDetailSerializer, CreateGroupEventSerializer
 )
 from .permissions import GroupPermissions
+from .access import GroupAccess
+from .pagination import GroupPostCursorPagination, GroupMemberCursorPagination
 
 
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing groups
     """
+    conditional_fields = ('member_count', 'post_count')
+    conditional_embedded_fields = (
+        'member_preview', 'user_role', 'user_membership', 'can_user_join',
+        'recent_posts', 'upcoming_events',
+    )
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['group_type', 'privacy', 'parish', 'is_featured']
@@ -39,26 +49,17 @@ class GroupViewSet(viewsets.ModelViewSet):
         """Get groups based on user's permissions"""
         user = self.request.user
         
-        # Base queryset with optimizations
+        # Base queryset with optimizations; members are never prefetched, the
+        # detail shows a bounded preview and /members/ is paginated
         queryset = Group.objects.select_related(
             'parish', 'parish__diocese', 'created_by'
-        ).prefetch_related(
-            'memberships__user'
         ).filter(is_active=True)
         
-        # Filter based on privacy and user's parish
-        if user.is_superuser:
-            return queryset
-        
         # Regular users see:
         # - Public groups
         # - Parish-only groups from their parish
         # - Private groups they're members of
-        return queryset.filter(
-            Q(privacy='public') |
-            Q(privacy='parish_only', parish=user.parish) |
-            Q(privacy__in=['private', 'invite_only'], memberships__user=user, memberships__is_active=True)
-        ).distinct()
+        return queryset.filter(GroupAccess.for_user(user).visible_q())
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -86,7 +87,7 @@ class GroupViewSet(viewsets.ModelViewSet):
             )
         
         # Check if already a member
-        if group.memberships.filter(user=user, is_active=True).exists():
+        if GroupAccess.for_user(user).is_member(group):
             return Response(
                 {'error': 'You are already a member of this group'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -171,15 +172,20 @@ class GroupViewSet(viewsets.ModelViewSet):
         
         # Check if user can view members
         if group.privacy == 'private':
-            if not group.memberships.filter(user=request.user, is_active=True).exists():
+            if not GroupAccess.for_user(request.user).is_member(group):
                 return Response(
                     {'error': 'You do not have permission to view members'},
                     status=status.HTTP_403_FORBIDDEN
                 )
         
-        memberships = group.memberships.filter(is_active=True).select_related('user')
-        serializer = GroupMembershipSerializer(memberships, many=True)
-        return Response(serializer.data)
+        paginator = GroupMemberCursorPagination()
+        memberships = paginator.paginate_queryset(
+            group.memberships.filter(is_active=True).select_related('user'),
+            request,
+            view=self
+        )
+        serializer = GroupMemberSerializer(memberships, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['post'])
     def invite(self, request, pk=None):
@@ -317,16 +323,37 @@ class GroupViewSet(viewsets.ModelViewSet):
         groups = self.get_queryset().filter(is_featured=True)[:10]
         serializer = GroupBasicSerializer(groups, many=True)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def typeahead(self, request):
+        """Fuzzy lookup of visible groups by partial or misspelled name"""
+        groups = search.fuzzy_search(
+            self.get_queryset(),
+            request.GET.get('q', ''),
+            ['name'],
+            limit=search.get_typeahead_limit(request)
+        )
+        return Response([{
+            'id': group.id,
+            'name': group.name,
+            'group_type': group.group_type,
+            'privacy': group.privacy,
+            'parish_name': group.parish.name,
+        } for group in groups])
 
 
-class GroupPostViewSet(viewsets.ModelViewSet):
+class GroupPostViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing group posts
     """
+    conditional_fields = (
+        'likes_count', 'comments_count', 'author.updated_at',
+        'group.updated_at', 'group.member_count', 'group.post_count',
+    )
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = GroupPostCursorPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['group', 'is_announcement', 'is_pinned']
-    search_fields = ['title', 'content']
     ordering_fields = ['created_at', 'published_at', 'likes_count']
     ordering = ['-is_pinned', '-published_at']
     
@@ -334,18 +361,11 @@ class GroupPostViewSet(viewsets.ModelViewSet):
         """Get posts based on user's group memberships"""
         user = self.request.user
         
-        # Get groups user has access to
-        accessible_groups = Group.objects.filter(
-            Q(privacy='public') |
-            Q(privacy='parish_only', parish=user.parish) |
-            Q(privacy__in=['private', 'invite_only'], memberships__user=user, memberships__is_active=True)
-        ).distinct()
-        
         return GroupPost.objects.filter(
-            group__in=accessible_groups,
+            GroupAccess.for_user(user).visible_q('group__'),
             is_approved=True,
             is_deleted=False
-        ).select_related('group', 'author')
+        ).select_related('group__parish__diocese', 'group__created_by', 'author')
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -399,10 +419,14 @@ class GroupPostViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Post unpinned successfully'})
 
 
-class GroupEventViewSet(viewsets.ModelViewSet):
+class GroupEventViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing group events
     """
+    conditional_fields = (
+        'attendee_count', 'created_by.updated_at',
+        'group.updated_at', 'group.member_count', 'group.post_count',
+    )
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['group', 'is_public', 'require_rsvp']
@@ -414,17 +438,10 @@ class GroupEventViewSet(viewsets.ModelViewSet):
         """Get events based on user's group memberships"""
         user = self.request.user
         
-        # Get groups user has access to
-        accessible_groups = Group.objects.filter(
-            Q(privacy='public') |
-            Q(privacy='parish_only', parish=user.parish) |
-            Q(privacy__in=['private', 'invite_only'], memberships__user=user, memberships__is_active=True)
-        ).distinct()
-        
         return GroupEvent.objects.filter(
-            Q(group__in=accessible_groups) |
+            GroupAccess.for_user(user).visible_q('group__') |
             Q(is_public=True)
-        ).select_related('group', 'created_by').distinct()
+        ).select_related('group__parish__diocese', 'group__created_by', 'created_by')
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -442,7 +459,7 @@ class GroupEventViewSet(viewsets.ModelViewSet):
         return Response({'message': 'RSVP functionality to be implemented'})
     
     @action(detail=False, methods=['get'])
-    def upcoming(self, request):
+    def upcoming(self, request, **kwargs):
         """Get upcoming events"""
         events = self.get_queryset().filter(
             start_datetime__gte=timezone.now()
@@ -463,16 +480,12 @@ class GroupMembershipViewSet(viewsets.ModelViewSet):
         user = self.request.user
         
         # Get groups user is admin/moderator of
-        admin_groups = Group.objects.filter(
-            memberships__user=user,
-            memberships__role__in=['admin', 'moderator'],
-            memberships__is_active=True
-        )
+        admin_group_ids = GroupAccess.for_user(user).group_ids_with_role('admin', 'moderator')
         
         return GroupMembership.objects.filter(
-            group__in=admin_groups,
+            group_id__in=admin_group_ids,
             is_active=True
-        ).select_related('user', 'group')
+        ).select_related('user', 'group__parish__diocese', 'group__created_by')
     
     @action(detail=True, methods=['post'])
     def promote(self, request, pk=None):
@@ -549,7 +562,7 @@ class GroupInvitationViewSet(viewsets.ReadOnlyModelViewSet):
             invited_user=self.request.user,
             is_accepted=False,
             is_declined=False
-        ).select_related('group', 'invited_by')
+        ).select_related('group__parish__diocese', 'group__created_by', 'invited_user', 'invited_by')
     
     @action(detail=True, methods=['post'])
     def accept(self, request, pk=None):
@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class ParishesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.parishes'
-    verbose_name = 'Parishes' 
\ No newline at end of file
+    verbose_name = 'Parishes'
+    
+    def ready(self):
+        import apps.parishes.signals
+        import apps.parishes.cache
@@ -0,0 +1,9 @@
+"""
+Cache namespaces for Parishes app
+"""
+from apps.core.cache import CacheNamespace
+
+# Public parish directory snapshot used during registration; rebuilt on
+# Parish / Diocese changes (see parishes.directory), and on a miss once the
+# timeout picks up counter updates
+parish_list_cache = CacheNamespace('parishes:list', timeout=300)
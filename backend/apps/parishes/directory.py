@@ -0,0 +1,44 @@
+"""
+Public parish directory for Parishes app
+
+The list of active parishes shown during registration is rendered once into
+a JSON snapshot with a strong ETag (a hash of the body) and kept in the
+cache. The snapshot is rebuilt in the background after any Parish or
+Diocese change commits, so serving it, or answering a conditional GET with
+304, needs no database access.
+"""
+import hashlib
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+from .cache import parish_list_cache
+from .models import Parish
+
+# Seconds clients and shared caches may reuse the directory without revalidating
+CACHE_MAX_AGE = 60
+
+
+def build_snapshot():
+    """Render the directory: {'body', 'etag', 'last_modified'}"""
+    from .serializers import ParishListSerializer
+
+    parishes = Parish.objects.filter(is_active=True).select_related('diocese')
+    body = JSONRenderer().render(ParishListSerializer(parishes, many=True).data)
+    return {
+        'body': body,
+        'etag': hashlib.sha256(body).hexdigest()[:32],
+        'last_modified': int(time.time()),
+    }
+
+
+def get_snapshot():
+    """The current snapshot, rendered on a miss (e.g. after it expired)"""
+    return parish_list_cache.get_or_set(('directory',), build_snapshot)
+
+
+def rebuild():
+    """Render and store a fresh snapshot"""
+    snapshot = build_snapshot()
+    parish_list_cache.set(snapshot, 'directory')
+    return snapshot
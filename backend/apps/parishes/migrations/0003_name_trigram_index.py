@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:13
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parishes', '0002_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='parish',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='parishes_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:24
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    Diocese = apps.get_model('parishes', 'Diocese')
+    Parish = apps.get_model('parishes', 'Parish')
+    User = apps.get_model('users', 'User')
+
+    members = User.objects.filter(parish=OuterRef('pk')).order_by().values('parish')
+    Parish.objects.update(member_count=Coalesce(
+        Subquery(members.annotate(total=Count('*')).values('total')), 0
+    ))
+    parishes = Parish.objects.filter(diocese=OuterRef('pk')).order_by().values('diocese')
+    Diocese.objects.update(parish_count=Coalesce(
+        Subquery(parishes.annotate(total=Count('*')).values('total')), 0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parishes', '0004_image_hashes'),
+        ('users', '0003_profile_picture_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='diocese',
+            name='parish_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='parish',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 """
 Parish and Diocese models for Coptic Social Network
 """
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -38,6 +39,9 @@ class Diocese(models.Model):
     # Settings
     is_active = models.BooleanField(default=True)
     
+    # Maintained by parishes.signals (see core.counters)
+    parish_count = models.PositiveIntegerField(default=0)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -49,10 +53,6 @@ class Diocese(models.Model):
     
     def __str__(self):
         return self.name
-    
-    @property
-    def parish_count(self):
-        return self.parishes.count()
 
 
 class Parish(models.Model):
@@ -86,6 +86,8 @@ class Parish(models.Model):
     # Parish image and media
     cover_image = models.ImageField(upload_to='parishes/covers/', blank=True, null=True)
     logo = models.ImageField(upload_to='parishes/logos/', blank=True, null=True)
+    cover_image_hash = models.CharField(max_length=64, blank=True, editable=False)
+    logo_hash = models.CharField(max_length=64, blank=True, editable=False)
     
     # Service times
     service_schedule = models.JSONField(
@@ -118,6 +120,9 @@ class Parish(models.Model):
     allow_member_posts = models.BooleanField(default=True)
     require_admin_approval = models.BooleanField(default=False)
     
+    # Maintained on user parish changes by users.signals (see core.counters)
+    member_count = models.PositiveIntegerField(default=0)
+    
     # Donations
     enable_donations = models.BooleanField(default=False)
     donation_goal = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
@@ -131,13 +136,20 @@ class Parish(models.Model):
         verbose_name = _('Parish')
         verbose_name_plural = _('Parishes')
         ordering = ['name']
+        indexes = [
+            # Trigram index for fuzzy name lookup (core.search.fuzzy_search)
+            GinIndex(fields=['name'], name='parishes_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.diocese.name}"
     
-    @property
-    def member_count(self):
-        return self.members.count()
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored diocese so signals can move parish_count on change
+        instance._loaded_diocese_id = instance.__dict__.get('diocese_id')
+        return instance
     
     @property
     def location_display(self):
@@ -2,6 +2,7 @@
 Serializers for Parishes app
 """
 from rest_framework import serializers
+from apps.core.renditions import RenditionImageField
 from .models import Diocese, Parish, ParishEvent
 
 
@@ -28,6 +29,7 @@ class ParishBasicSerializer(serializers.ModelSerializer):
     """
     diocese_name = serializers.CharField(source='diocese.name', read_only=True)
     location = serializers.CharField(source='location_display', read_only=True)
+    logo = RenditionImageField('logo', 'small', required=False, allow_null=True)
     
     class Meta:
         model = Parish
@@ -46,6 +48,8 @@ class ParishListSerializer(serializers.ModelSerializer):
     diocese_country = serializers.CharField(source='diocese.country', read_only=True)
     location = serializers.CharField(source='location_display', read_only=True)
     member_count = serializers.IntegerField(read_only=True)
+    cover_image = RenditionImageField('cover', 'medium', required=False, allow_null=True)
+    logo = RenditionImageField('logo', 'small', required=False, allow_null=True)
     
     class Meta:
         model = Parish
@@ -63,6 +67,8 @@ class ParishDetailSerializer(serializers.ModelSerializer):
     diocese = DioceseSerializer(read_only=True)
     member_count = serializers.IntegerField(read_only=True)
     location = serializers.CharField(source='location_display', read_only=True)
+    cover_image = RenditionImageField('cover', 'large', required=False, allow_null=True)
+    logo = RenditionImageField('logo', 'large', required=False, allow_null=True)
     
     class Meta:
         model = Parish
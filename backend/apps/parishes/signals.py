@@ -0,0 +1,50 @@
+"""
+Signals for Parishes app
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core import counters, renditions
+from .models import Diocese, Parish
+from .tasks import rebuild_parish_directory
+
+
+renditions.register(Parish, 'cover_image', 'cover')
+renditions.register(Parish, 'logo', 'logo')
+
+counters.register_source(Diocese, 'parish_count', Parish.objects.all, 'diocese')
+
+# Sentinel for parishes whose stored diocese is unknown (not loaded from the database)
+_UNKNOWN = object()
+
+
+@receiver(post_save, sender=Parish)
+def update_diocese_parish_count(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Move the parish between diocese counts when it's created or moved"""
+    if raw or (update_fields and not {'diocese', 'diocese_id'}.intersection(update_fields)):
+        return
+    
+    previous = None if created else getattr(instance, '_loaded_diocese_id', _UNKNOWN)
+    # The stored diocese from here on, whether or not this save moved it
+    instance._loaded_diocese_id = instance.diocese_id
+    if previous is _UNKNOWN or previous == instance.diocese_id:
+        return
+    
+    if previous is not None:
+        counters.increment(Diocese, previous, parish_count=-1)
+    counters.increment(Diocese, instance.diocese_id, parish_count=1)
+
+
+@receiver(post_delete, sender=Parish)
+def decrease_diocese_parish_count(sender, instance, **kwargs):
+    """Decrease the parish count of a deleted parish's diocese"""
+    counters.increment(Diocese, instance.diocese_id, parish_count=-1)
+
+
+@receiver([post_save, post_delete], sender=Parish)
+@receiver([post_save, post_delete], sender=Diocese)
+def schedule_directory_rebuild(sender, instance, raw=False, **kwargs):
+    """Regenerate the public directory once the change is committed"""
+    if not raw:
+        transaction.on_commit(rebuild_parish_directory.delay)
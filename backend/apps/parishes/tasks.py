@@ -0,0 +1,12 @@
+"""
+Background tasks for Parishes app
+"""
+from celery import shared_task
+
+from . import directory
+
+
+@shared_task(ignore_result=True)
+def rebuild_parish_directory():
+    """Regenerate the public parish directory snapshot"""
+    directory.rebuild()
@@ -2,6 +2,7 @@
 Admin configuration for Posts app
 """
 from django.contrib import admin
+from django.db import transaction
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
@@ -9,6 +10,8 @@ from .models import (
     Post, PostMedia, Comment, Reaction, Share, PostTag, 
     PostTagging, Feed, FeedPost
 )
+from . import timelines, trending
+from .cache import trending_cache
 
 
 @admin.register(PostTag)
@@ -57,6 +60,8 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ['content', 'author__first_name', 'author__last_name', 'author__email']
     readonly_fields = [
         'id', 'likes_count', 'comments_count', 'shares_count', 
+        'like_reactions_count', 'love_reactions_count', 'pray_reactions_count',
+        'amen_reactions_count', 'support_reactions_count', 'celebrate_reactions_count',
         'created_at', 'updated_at', 'published_at', 'parish'
     ]
     inlines = [PostMediaInline, PostTaggingInline]
@@ -72,7 +77,11 @@ class PostAdmin(admin.ModelAdmin):
             'fields': ('requires_approval', 'is_approved', 'approved_by', 'approved_at')
         }),
         ('Engagement', {
-            'fields': ('likes_count', 'comments_count', 'shares_count'),
+            'fields': (
+                'likes_count', 'comments_count', 'shares_count',
+                'like_reactions_count', 'love_reactions_count', 'pray_reactions_count',
+                'amen_reactions_count', 'support_reactions_count', 'celebrate_reactions_count'
+            ),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -122,6 +131,14 @@ class PostAdmin(admin.ModelAdmin):
     
     def approve_posts(self, request, queryset):
         updated = queryset.update(is_approved=True, approved_by=request.user)
+        timelines.sync_posts(queryset)
+        # update() sends no post_save, so score the posts here
+        parish_ids = set()
+        for post in queryset:
+            trending.sync_post(post)
+            parish_ids.add(post.target_parish_id)
+        for parish_id in parish_ids - {None}:
+            transaction.on_commit(lambda parish_id=parish_id: trending_cache.invalidate(parish_id))
         self.message_user(request, f'{updated} posts approved.')
     approve_posts.short_description = 'Approve selected posts'
     
@@ -132,6 +149,7 @@ class PostAdmin(admin.ModelAdmin):
     
     def pin_posts(self, request, queryset):
         updated = queryset.update(is_pinned=True)
+        timelines.sync_posts(queryset)
         self.message_user(request, f'{updated} posts pinned.')
     pin_posts.short_description = 'Pin selected posts'
     
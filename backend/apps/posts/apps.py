@@ -7,4 +7,5 @@ class PostsConfig(AppConfig):
     verbose_name = 'Posts'
     
     def ready(self):
-        import apps.posts.signals 
\ No newline at end of file
+        import apps.posts.signals
+        import apps.posts.cache 
\ No newline at end of file
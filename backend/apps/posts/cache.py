@@ -0,0 +1,50 @@
+"""
+Cache namespaces for Posts app
+"""
+from apps.core.cache import CacheNamespace
+from .models import Post, PostMedia, PostVisibility, TimelineEntry
+
+# Parish and public feed pages, stored without per-user fields and scoped
+# per timeline
+feed_cache = CacheNamespace('posts:feed', timeout=60)
+
+# Ordered trending post ids, scoped per parish
+trending_cache = CacheNamespace('posts:trending', timeout=120)
+
+
+def feed_scope(timeline, parish_id=None):
+    """Cache scope of one timeline, e.g. 'parish:12' or 'public'"""
+    return f'{timeline}:{parish_id}' if parish_id is not None else timeline
+
+
+PUBLIC_FEED_SCOPE = feed_scope(TimelineEntry.PUBLIC)
+
+
+def feed_page_scopes(timeline, parish_id=None):
+    """
+    Scopes a cached feed page depends on: parish timelines also carry every
+    public post, so their pages are invalidated with the public timeline too
+    """
+    if timeline == TimelineEntry.PUBLIC:
+        return (PUBLIC_FEED_SCOPE,)
+    return (feed_scope(timeline, parish_id), PUBLIC_FEED_SCOPE)
+
+
+def post_feed_scopes(post):
+    """Scopes of the feed pages a post appears on"""
+    if post.visibility == PostVisibility.PUBLIC:
+        return [PUBLIC_FEED_SCOPE]
+    if post.target_parish_id is not None:
+        return [feed_scope(TimelineEntry.PARISH, post.target_parish_id)]
+    return []
+
+
+def post_trending_scopes(post):
+    return [post.target_parish_id] if post.target_parish_id is not None else []
+
+
+# Counter updates go through QuerySet.update() and don't invalidate;
+# they show up once the short timeouts expire
+feed_cache.invalidate_on(Post, scope=post_feed_scopes)
+feed_cache.invalidate_on(PostMedia, scope=lambda media: post_feed_scopes(media.post))
+trending_cache.invalidate_on(Post, scope=post_trending_scopes)
@@ -0,0 +1,40 @@
+"""
+Backfill the materialized feed timelines from the posts table
+"""
+from django.core.management.base import BaseCommand
+
+from apps.parishes.models import Parish
+from apps.posts.models import TimelineEntry
+from apps.posts import timelines
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized parish and public feed timelines'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--parish',
+            type=int,
+            action='append',
+            help='Only rebuild the timeline of this parish (can be repeated)'
+        )
+        parser.add_argument(
+            '--length',
+            type=int,
+            help='Number of entries to keep per timeline (defaults to FEED_TIMELINE_LENGTH)'
+        )
+    
+    def handle(self, *args, **options):
+        length = options['length']
+        parish_ids = options['parish']
+        
+        if not parish_ids:
+            count = timelines.rebuild_timeline(TimelineEntry.PUBLIC, length=length)
+            self.stdout.write(f'Public timeline: {count} entries')
+            parish_ids = Parish.objects.filter(is_active=True).values_list('id', flat=True)
+        
+        for parish_id in parish_ids:
+            count = timelines.rebuild_timeline(TimelineEntry.PARISH, parish_id, length=length)
+            self.stdout.write(f'Parish {parish_id} timeline: {count} entries')
+        
+        self.stdout.write(self.style.SUCCESS('Timelines rebuilt successfully'))
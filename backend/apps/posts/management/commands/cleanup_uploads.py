@@ -0,0 +1,14 @@
+"""
+Remove expired chunked upload sessions
+"""
+from django.core.management.base import BaseCommand
+
+from apps.posts import uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete expired upload sessions and the parts and files of unattached uploads'
+    
+    def handle(self, *args, **options):
+        count = uploads.cleanup_expired()
+        self.stdout.write(self.style.SUCCESS(f'Removed {count} expired upload sessions'))
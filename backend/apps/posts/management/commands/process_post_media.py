@@ -0,0 +1,37 @@
+"""
+Queue processing of post media attachments
+"""
+from django.core.management.base import BaseCommand
+
+from apps.posts.models import PostMedia
+from apps.posts.tasks import process_post_media
+
+
+class Command(BaseCommand):
+    help = 'Queue metadata extraction and renditions for unprocessed post media'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reprocess every attachment, including already processed ones'
+        )
+        parser.add_argument(
+            '--failed',
+            action='store_true',
+            help='Only retry attachments whose processing failed'
+        )
+    
+    def handle(self, *args, **options):
+        media = PostMedia.objects.all()
+        if options['failed']:
+            media = media.filter(is_processed=False).exclude(processing_error='')
+        elif not options['all']:
+            media = media.filter(is_processed=False)
+        
+        count = 0
+        for media_id in media.values_list('id', flat=True).iterator():
+            process_post_media.delay(str(media_id), force=options['all'])
+            count += 1
+        
+        self.stdout.write(self.style.SUCCESS(f'Queued {count} attachments for processing'))
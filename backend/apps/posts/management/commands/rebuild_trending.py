@@ -0,0 +1,29 @@
+"""
+Recompute trending scores from posts and their engagement
+"""
+from django.core.management.base import BaseCommand
+
+from apps.posts import trending
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the time-decayed trending scores of parish posts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--parish',
+            type=int,
+            action='append',
+            help='Only rebuild the scores of this parish (can be repeated)'
+        )
+    
+    def handle(self, *args, **options):
+        if options['parish']:
+            for parish_id in options['parish']:
+                count = trending.rebuild(parish_id)
+                self.stdout.write(f'Parish {parish_id}: {count} posts scored')
+        else:
+            count = trending.rebuild()
+            self.stdout.write(f'{count} posts scored')
+        
+        self.stdout.write(self.style.SUCCESS('Trending scores rebuilt successfully'))
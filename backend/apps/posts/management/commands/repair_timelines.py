@@ -0,0 +1,16 @@
+"""
+Consistency repair job for the materialized feed timelines
+"""
+from django.core.management.base import BaseCommand
+
+from apps.posts import timelines
+
+
+class Command(BaseCommand):
+    help = 'Remove soft-deleted and unapproved posts from feed timelines and trim them'
+    
+    def handle(self, *args, **options):
+        removed, trimmed = timelines.repair_timelines()
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {removed} stale entries and trimmed {trimmed} old entries'
+        ))
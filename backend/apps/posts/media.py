@@ -0,0 +1,171 @@
+"""
+Media processing for Posts app
+
+Uploaded `PostMedia` files are processed in the background (see `tasks.py`)
+so that creating a post doesn't wait for them:
+
+    image - dimensions, plus resized renditions (`MEDIA_RENDITIONS`)
+    video - duration and dimensions from ffprobe, renditions of a poster frame
+    audio - duration from ffprobe
+
+Renditions come from the content-addressed store in `apps.core.renditions`,
+so identical images posted again are not rendered twice. They are recorded
+in `PostMedia.renditions` as {name: {'path', 'fallback_path', 'width',
+'height'}}, `path` being WebP and `fallback_path` JPEG.
+"""
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from datetime import timedelta
+from io import BytesIO
+
+from PIL import Image
+
+from apps.core import renditions
+
+logger = logging.getLogger(__name__)
+
+# Seconds allowed for ffprobe / ffmpeg on a single file
+COMMAND_TIMEOUT = 120
+
+
+class MediaProcessingError(Exception):
+    pass
+
+
+# Errors that reprocessing the same file won't fix
+PERMANENT_ERRORS = (
+    MediaProcessingError, Image.UnidentifiedImageError, Image.DecompressionBombError, ValueError
+)
+
+
+@contextmanager
+def local_path(field_file):
+    """Path of a stored file on local disk, downloading it from remote storage if needed"""
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        path = None
+
+    if path:
+        yield path
+        return
+
+    suffix = os.path.splitext(field_file.name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as copy:
+        with field_file.open('rb') as source:
+            shutil.copyfileobj(source, copy)
+        copy.flush()
+        yield copy.name
+
+
+def run(command):
+    """Run an ffmpeg tool and return its stdout"""
+    try:
+        result = subprocess.run(
+            command, capture_output=True, timeout=COMMAND_TIMEOUT, check=True
+        )
+    except FileNotFoundError:
+        raise MediaProcessingError(f'{command[0]} is not installed')
+    except subprocess.TimeoutExpired:
+        raise MediaProcessingError(f'{command[0]} timed out')
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode(errors='replace').strip().splitlines()
+        raise MediaProcessingError(message[-1] if message else f'{command[0]} failed')
+    return result.stdout
+
+
+def probe(path):
+    """Format and stream information of an audio or video file"""
+    output = run([
+        'ffprobe', '-v', 'error', '-print_format', 'json',
+        '-show_format', '-show_streams', path
+    ])
+    return json.loads(output)
+
+
+def get_duration(info):
+    duration = info.get('format', {}).get('duration')
+    return timedelta(seconds=float(duration)) if duration else None
+
+
+def save_renditions(file):
+    """Render an image file in the post sizes and return their descriptions"""
+    asset = renditions.generate(file, 'post')
+    return asset, {
+        name: {
+            'path': renditions.rendition_path(asset.content_hash, 'post', name),
+            'fallback_path': renditions.rendition_path(asset.content_hash, 'post', name, 'jpg'),
+            **size,
+        }
+        for name, size in asset.renditions['post'].items()
+    }
+
+
+def process_image(media):
+    with media.file.open('rb') as source:
+        asset, media.renditions = save_renditions(source)
+    media.width, media.height = asset.width, asset.height
+
+
+def process_video(media):
+    with local_path(media.file) as path:
+        info = probe(path)
+        media.duration = get_duration(info)
+        stream = next(
+            (s for s in info.get('streams', []) if s.get('codec_type') == 'video'), None
+        )
+        if stream is None:
+            raise MediaProcessingError('No video stream found')
+        media.width, media.height = stream.get('width'), stream.get('height')
+
+        # Poster frame a second in, or halfway through shorter clips
+        offset = min(1.0, media.duration.total_seconds() / 2) if media.duration else 0
+        frame = run([
+            'ffmpeg', '-v', 'error', '-ss', str(offset), '-i', path,
+            '-frames:v', '1', '-f', 'image2pipe', '-vcodec', 'mjpeg', '-'
+        ])
+    _, media.renditions = save_renditions(BytesIO(frame))
+
+
+def process_audio(media):
+    with local_path(media.file) as path:
+        media.duration = get_duration(probe(path))
+
+
+PROCESSORS = {
+    'image': process_image,
+    'video': process_video,
+    'audio': process_audio,
+}
+
+
+def process(media):
+    """
+    Extract metadata and build renditions of a media attachment.
+
+    Returns True on success. Failures that retrying won't fix are recorded in
+    `processing_error`; storage errors propagate so the task can be retried.
+    """
+    # Renditions may be shared with identical uploads, so they are never deleted
+    media.renditions = {}
+    processor = PROCESSORS.get(media.media_type)
+    try:
+        if processor:
+            processor(media)
+    except PERMANENT_ERRORS as e:
+        logger.warning('Processing media %s failed: %s', media.pk, e)
+        media.is_processed = False
+        media.processing_error = str(e) or e.__class__.__name__
+    else:
+        media.is_processed = True
+        media.processing_error = ''
+
+    media.save(update_fields=[
+        'width', 'height', 'duration', 'renditions', 'is_processed', 'processing_error'
+    ])
+    return media.is_processed
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parishes', '0002_initial'),
+        ('posts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timeline', models.CharField(choices=[('parish', 'Parish'), ('public', 'Public')], max_length=20)),
+                ('is_pinned', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('parish', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='parishes.parish')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='posts.post')),
+            ],
+            options={
+                'db_table': 'posts_timeline_entry',
+                'ordering': ['-is_pinned', '-created_at', '-id'],
+                'indexes': [models.Index(fields=['timeline', 'parish', '-is_pinned', '-created_at', '-id'], name='posts_timel_timelin_b2401c_idx')],
+                'unique_together': {('timeline', 'parish', 'post')},
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:01
+
+from django.db import migrations, models
+
+
+def backfill_reaction_counters(apps, schema_editor):
+    """Populate the per-type counters (and the total) from existing reactions"""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Reaction = apps.get_model('posts', 'Reaction')
+    
+    for model_name in ('post', 'comment'):
+        model = apps.get_model('posts', model_name)
+        content_type = ContentType.objects.filter(app_label='posts', model=model_name).first()
+        if content_type is None:
+            continue
+        
+        counts = {}
+        rows = Reaction.objects.filter(content_type=content_type).values(
+            'object_id', 'reaction_type'
+        ).annotate(total=models.Count('id'))
+        for row in rows:
+            fields = counts.setdefault(row['object_id'], {'likes_count': 0})
+            fields[f"{row['reaction_type']}_reactions_count"] = row['total']
+            fields['likes_count'] += row['total']
+        
+        for object_id, fields in counts.items():
+            model.objects.filter(pk=object_id).update(**fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('posts', '0002_timeline_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='amen_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='celebrate_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='like_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='love_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='pray_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='support_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='amen_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='celebrate_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='love_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='pray_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='support_reactions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_reaction_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parishes', '0002_initial'),
+        ('posts', '0003_reaction_type_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('parish', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending_scores', to='parishes.parish')),
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='trending_score', to='posts.post')),
+            ],
+            options={
+                'db_table': 'posts_trending_score',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['parish', '-score'], name='posts_trend_parish__f0564d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postmedia',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, help_text="Resized variants by name: {'path', 'width', 'height'}"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='method',
+            field=models.CharField(choices=[('chunked', 'Chunked through the API'), ('direct', 'Direct to storage')], default='chunked', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def remove_public_copies(apps, schema_editor):
+    """Public posts are now merged into parish feeds at read time"""
+    TimelineEntry = apps.get_model('posts', 'TimelineEntry')
+    TimelineEntry.objects.filter(timeline='parish', post__visibility='public').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_upload_session_method'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_public_copies, migrations.RunPython.noop),
+    ]
@@ -7,6 +7,8 @@ from django.conf import settings
 from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import FileExtensionValidator
 
 
@@ -40,6 +42,35 @@ class ReactionType(models.TextChoices):
     CELEBRATE = 'celebrate', '🎉 Celebrate'
 
 
+def reaction_count_field(reaction_type):
+    """Name of the denormalized counter column for a reaction type"""
+    return f"{reaction_type}_reactions_count"
+
+
+class ReactionCountsModel(models.Model):
+    """
+    Denormalized per-type reaction counters, kept up to date by the
+    Reaction signals with atomic F() updates
+    """
+    like_reactions_count = models.PositiveIntegerField(default=0)
+    love_reactions_count = models.PositiveIntegerField(default=0)
+    pray_reactions_count = models.PositiveIntegerField(default=0)
+    amen_reactions_count = models.PositiveIntegerField(default=0)
+    support_reactions_count = models.PositiveIntegerField(default=0)
+    celebrate_reactions_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def reaction_counts(self):
+        """Reaction breakdown keyed by reaction type"""
+        return {
+            reaction_type: getattr(self, reaction_count_field(reaction_type))
+            for reaction_type in ReactionType.values
+        }
+
+
 def post_media_upload_path(instance, filename):
     """Generate upload path for post media"""
     ext = filename.split('.')[-1]
@@ -47,7 +78,7 @@ def post_media_upload_path(instance, filename):
     return f"posts/{instance.post.author.parish.id}/{instance.post.id}/{filename}"
 
 
-class Post(models.Model):
+class Post(ReactionCountsModel):
     """
     Main Post model for social media content
     """
@@ -110,6 +141,9 @@ class Post(models.Model):
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    # Full-text search document, maintained by signals (see core.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         db_table = 'posts_post'
         ordering = ['-created_at']
@@ -118,6 +152,7 @@ class Post(models.Model):
             models.Index(fields=['target_parish', '-created_at']),
             models.Index(fields=['visibility', '-created_at']),
             models.Index(fields=['is_approved', '-created_at']),
+            GinIndex(fields=['search_vector'], name='posts_post_search_gin'),
         ]
     
     def __str__(self):
@@ -180,6 +215,11 @@ class PostMedia(models.Model):
     width = models.PositiveIntegerField(null=True, blank=True)
     height = models.PositiveIntegerField(null=True, blank=True)
     
+    renditions = models.JSONField(
+        default=dict, blank=True,
+        help_text="Resized variants by name: {'path', 'width', 'height'}"
+    )
+    
     # Processing status
     is_processed = models.BooleanField(default=False)
     processing_error = models.TextField(blank=True)
@@ -194,7 +234,7 @@ class PostMedia(models.Model):
         return f"{self.post.author.full_name} - {self.filename}"
 
 
-class Comment(models.Model):
+class Comment(ReactionCountsModel):
     """
     Comments on posts
     """
@@ -241,7 +281,21 @@ class Comment(models.Model):
     
     @property
     def is_reply(self):
-        return self.parent is not None
+        return self.parent_id is not None
+    
+    @property
+    def is_counted(self):
+        """Whether the comment is included in the post's comments_count"""
+        return self.is_approved and not self.is_deleted
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so signals can adjust comments_count on change
+        instance._loaded_is_counted = (
+            instance.__dict__.get('is_approved') and not instance.__dict__.get('is_deleted')
+        )
+        return instance
 
 
 class Reaction(models.Model):
@@ -278,6 +332,13 @@ class Reaction(models.Model):
     
     def __str__(self):
         return f"{self.user.full_name} {self.reaction_type} {self.content_object}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored type so signals can move counts on a type change
+        instance._loaded_reaction_type = instance.__dict__.get('reaction_type')
+        return instance
 
 
 class Share(models.Model):
@@ -422,4 +483,134 @@ class FeedPost(models.Model):
         ordering = ['-is_pinned', 'order', '-added_at']
     
     def __str__(self):
-        return f"{self.post} in {self.feed}" 
\ No newline at end of file
+        return f"{self.post} in {self.feed}" 
+
+class TimelineEntry(models.Model):
+    """
+    Materialized home feed timelines (fan-out on write).
+
+    Every approved public post is copied into the public timeline and
+    every other approved post into the timeline of its target parish. A
+    parish feed merges its timeline with the public one when it is read
+    (see `posts.timelines`), so reading a feed is two range scans.
+    """
+    PARISH = 'parish'
+    PUBLIC = 'public'
+    TIMELINE_CHOICES = [
+        (PARISH, 'Parish'),
+        (PUBLIC, 'Public'),
+    ]
+    
+    timeline = models.CharField(max_length=20, choices=TIMELINE_CHOICES)
+    parish = models.ForeignKey(
+        'parishes.Parish',
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        null=True,
+        blank=True
+    )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries')
+    
+    # Copied from the post so the timeline can be ordered without a join
+    is_pinned = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'posts_timeline_entry'
+        ordering = ['-is_pinned', '-created_at', '-id']
+        unique_together = ['timeline', 'parish', 'post']
+        indexes = [
+            models.Index(fields=['timeline', 'parish', '-is_pinned', '-created_at', '-id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.post} in {self.timeline} timeline"
+
+
+class TrendingScore(models.Model):
+    """
+    Time-decayed engagement score of a post within its parish.
+
+    `score` is log2 of the sum of `weight * 2 ** (age / half_life)` over all
+    engagement events, measured from a fixed epoch, so newer events outweigh
+    older ones without ever rewriting existing rows. See `posts.trending`.
+    """
+    parish = models.ForeignKey(
+        'parishes.Parish',
+        on_delete=models.CASCADE,
+        related_name='trending_scores'
+    )
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, related_name='trending_score')
+    score = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'posts_trending_score'
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['parish', '-score']),
+        ]
+    
+    def __str__(self):
+        return f"{self.post} trending score {self.score:.2f}"
+
+
+class UploadStatus(models.TextChoices):
+    """Upload session states"""
+    UPLOADING = 'uploading', 'Uploading'
+    COMPLETE = 'complete', 'Complete'
+    ATTACHED = 'attached', 'Attached'
+
+
+class UploadMethod(models.TextChoices):
+    """How the file of an upload session reaches storage"""
+    CHUNKED = 'chunked', 'Chunked through the API'
+    DIRECT = 'direct', 'Direct to storage'
+
+
+class UploadSession(models.Model):
+    """
+    An upload of one media file.
+
+    Chunked uploads are sent through the API in sequential chunks, stored as
+    separate parts until the upload is completed and they are streamed into
+    the final file. Direct uploads are posted by the client straight to
+    storage with a presigned form. Either way the completed session is the
+    handle that `CreatePostSerializer` attaches to a post (see `posts.uploads`).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField(help_text="Declared total size in bytes")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Expected checksum, if declared")
+    
+    # Progress: bytes received and their parts, [[offset, length], ...]
+    offset = models.PositiveBigIntegerField(default=0)
+    parts = models.JSONField(default=list, blank=True)
+    
+    method = models.CharField(max_length=20, choices=UploadMethod.choices, default=UploadMethod.CHUNKED)
+    status = models.CharField(max_length=20, choices=UploadStatus.choices, default=UploadStatus.UPLOADING)
+    file = models.CharField(max_length=500, blank=True, help_text="Storage name of the assembled file")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'posts_upload_session'
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+    
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
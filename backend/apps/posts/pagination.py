@@ -0,0 +1,19 @@
+"""
+Pagination classes for Posts app
+"""
+from apps.core.pagination import KeysetPagination
+
+
+class PostCursorPagination(KeysetPagination):
+    """Newest posts first, matching the `-created_at` post indexes"""
+    ordering = ('-created_at', '-id')
+
+
+class CommentCursorPagination(KeysetPagination):
+    """Oldest comments first, matching the `(post, -created_at)` index"""
+    ordering = ('created_at', 'id')
+
+
+class FeedCursorPagination(KeysetPagination):
+    """Pinned posts first, then newest; used for timelines and the following feed"""
+    ordering = ('-is_pinned', '-created_at', '-id')
@@ -0,0 +1,103 @@
+"""
+Reaction helpers for Posts app
+"""
+import uuid
+
+from django.contrib.contenttypes.models import ContentType
+
+from .models import Comment, Reaction
+
+
+class UserReactionLookup:
+    """
+    Caches the requesting user's reactions while a response is serialized.
+
+    List serializers preload the reactions for every object on the page in a
+    single query; `get` then serves them from memory and only falls back to
+    a per-object query for objects that were never preloaded.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._reactions = {}
+        self._loaded = set()
+        self._loaded_comment_posts = set()
+
+    def preload(self, model, object_ids):
+        """Fetch the user's reactions for the given objects of one model"""
+        content_type = ContentType.objects.get_for_model(model)
+        object_ids = {
+            object_id for object_id in object_ids
+            if (content_type.id, object_id) not in self._loaded
+        }
+        if not object_ids:
+            return
+
+        self._store(Reaction.objects.filter(
+            user=self.user,
+            content_type=content_type,
+            object_id__in=object_ids
+        ))
+        self._loaded.update((content_type.id, object_id) for object_id in object_ids)
+
+    def preload_comments(self, post_ids):
+        """Fetch the user's reactions for every comment and reply on the given posts"""
+        post_ids = set(post_ids) - self._loaded_comment_posts
+        if not post_ids:
+            return
+
+        self._store(Reaction.objects.filter(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(Comment),
+            object_id__in=Comment.objects.filter(post_id__in=post_ids).values('id')
+        ))
+        self._loaded_comment_posts.update(post_ids)
+
+    def get(self, obj):
+        """Return the user's reaction type for a post or comment, or None"""
+        content_type = ContentType.objects.get_for_model(obj)
+        key = (content_type.id, obj.id)
+
+        if key not in self._loaded and not (
+            isinstance(obj, Comment) and obj.post_id in self._loaded_comment_posts
+        ):
+            self.preload(type(obj), [obj.id])
+
+        return self._reactions.get(key)
+
+    def get_for_id(self, model, object_id):
+        """Return the user's reaction type for an object given by model and id"""
+        content_type = ContentType.objects.get_for_model(model)
+        if (content_type.id, object_id) not in self._loaded:
+            self.preload(model, [object_id])
+        return self._reactions.get((content_type.id, object_id))
+    
+    def _store(self, reactions):
+        for content_type_id, object_id, reaction_type in reactions.values_list(
+            'content_type_id', 'object_id', 'reaction_type'
+        ):
+            self._reactions[(content_type_id, object_id)] = reaction_type
+
+
+def get_user_reaction_lookup(context):
+    """Return the lookup shared by all serializers rendering one response"""
+    request = context.get('request')
+    if not request or not request.user.is_authenticated:
+        return None
+    if 'user_reactions' not in context:
+        context['user_reactions'] = UserReactionLookup(request.user)
+    return context['user_reactions']
+
+
+def fill_user_reactions(items, model, context):
+    """
+    Set `user_reaction` on already serialized items, e.g. list data served
+    from the cache that was rendered without a request.
+    """
+    lookup = get_user_reaction_lookup(context)
+    object_ids = [uuid.UUID(str(item['id'])) for item in items]
+    if lookup is not None:
+        lookup.preload(model, object_ids)
+    for item, object_id in zip(items, object_ids):
+        item['user_reaction'] = lookup.get_for_id(model, object_id) if lookup else None
+    return items
@@ -1,14 +1,21 @@
 """
 Serializers for Posts app
 """
+from functools import partial
+
 from rest_framework import serializers
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+from django.core.files.storage import default_storage
+from django.db import models, transaction
 from .models import (
     Post, PostMedia, Comment, Reaction, Share, PostTag, 
-    PostTagging, Feed, FeedPost, PostVisibility, PostType, ReactionType
+    PostTagging, Feed, FeedPost, PostVisibility, PostType, ReactionType, UploadSession
 )
+from apps.core.renditions import image_url
 from apps.users.serializers import UserSerializer
+from .reactions import get_user_reaction_lookup
+from .tasks import process_post_media
+from . import threads, uploads
 
 
 class PostMediaSerializer(serializers.ModelSerializer):
@@ -16,15 +23,27 @@ class PostMediaSerializer(serializers.ModelSerializer):
     Post Media serializer
     """
     file_url = serializers.CharField(source='file.url', read_only=True)
+    renditions = serializers.SerializerMethodField()
     
     class Meta:
         model = PostMedia
         fields = [
             'id', 'filename', 'file_url', 'file_size', 'content_type',
             'media_type', 'title', 'description', 'alt_text', 'duration',
-            'width', 'height', 'is_processed', 'created_at'
+            'width', 'height', 'renditions', 'is_processed', 'created_at'
         ]
         read_only_fields = ['id', 'file_size', 'content_type', 'is_processed', 'created_at']
+    
+    def get_renditions(self, obj):
+        return {
+            name: {
+                'url': default_storage.url(rendition['path']),
+                'fallback_url': default_storage.url(rendition['fallback_path']),
+                'width': rendition['width'],
+                'height': rendition['height'],
+            }
+            for name, rendition in (obj.renditions or {}).items()
+        }
 
 
 class PostTagSerializer(serializers.ModelSerializer):
@@ -51,52 +70,69 @@ class ReactionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user_name', 'created_at']
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class UserReactionListSerializer(serializers.ListSerializer):
+    """
+    List serializer that preloads the requesting user's reactions
+    for every item in one query before the items are serialized
+    """
+    
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        lookup = get_user_reaction_lookup(self.context)
+        if lookup is not None:
+            self.child.preload_user_reactions(lookup, items)
+        return super().to_representation(items)
+
+
+class UserReactionMixin:
+    """
+    Serves `user_reaction` from the per-response reaction lookup
+    """
+    
+    def get_user_reaction(self, obj):
+        lookup = get_user_reaction_lookup(self.context)
+        if lookup is not None:
+            return lookup.get(obj)
+        return None
+
+
+class CommentSerializer(UserReactionMixin, serializers.ModelSerializer):
     """
     Comment serializer
     """
     author_name = serializers.CharField(source='author.full_name', read_only=True)
     author_avatar = serializers.SerializerMethodField()
     replies = serializers.SerializerMethodField()
+    reply_count = serializers.IntegerField(read_only=True, default=0)
     user_reaction = serializers.SerializerMethodField()
+    reaction_counts = serializers.DictField(child=serializers.IntegerField(), read_only=True)
     
     class Meta:
         model = Comment
         fields = [
             'id', 'author_name', 'author_avatar', 'content', 'parent', 'is_reply', 
-            'likes_count', 'replies', 'user_reaction', 'created_at', 'updated_at'
+            'likes_count', 'reaction_counts', 'replies', 'reply_count', 'user_reaction',
+            'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'author_name', 'likes_count', 'created_at', 'updated_at']
+        list_serializer_class = UserReactionListSerializer
+    
+    def preload_user_reactions(self, lookup, comments):
+        lookup.preload_comments({comment.post_id for comment in comments})
     
     def get_author_avatar(self, obj):
-        """Get author avatar URL safely"""
-        if obj.author.profile_picture and hasattr(obj.author.profile_picture, 'url'):
-            return obj.author.profile_picture.url
-        return None
+        """Get the author's avatar URL, sized for feed rows"""
+        return image_url(obj.author.profile_picture, 'avatar', 'medium')
     
     def get_replies(self, obj):
-        if obj.replies.exists():
-            return CommentSerializer(
-                obj.replies.filter(is_approved=True, is_deleted=False)[:5], 
-                many=True, 
-                context=self.context
-            ).data
-        return []
-    
-    def get_user_reaction(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            content_type = ContentType.objects.get_for_model(Comment)
-            reaction = Reaction.objects.filter(
-                user=request.user,
-                content_type=content_type,
-                object_id=obj.id
-            ).first()
-            return reaction.reaction_type if reaction else None
-        return None
+        """First replies loaded by `threads.attach_replies`; the rest via /replies/"""
+        replies = getattr(obj, 'reply_preview', None)
+        if not replies:
+            return []
+        return CommentSerializer(replies, many=True, context=self.context).data
 
 
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(UserReactionMixin, serializers.ModelSerializer):
     """
     Simplified Post serializer for list views
     """
@@ -104,6 +140,7 @@ class PostListSerializer(serializers.ModelSerializer):
     author_avatar = serializers.SerializerMethodField()
     media_count = serializers.IntegerField(read_only=True)
     user_reaction = serializers.SerializerMethodField()
+    reaction_counts = serializers.DictField(child=serializers.IntegerField(), read_only=True)
     parish_name = serializers.CharField(source='target_parish.name', read_only=True)
     
     class Meta:
@@ -111,30 +148,20 @@ class PostListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'author_name', 'author_avatar', 'content', 'post_type', 'visibility',
             'parish_name', 'is_announcement', 'is_pinned', 'is_featured',
-            'likes_count', 'comments_count', 'shares_count', 'media_count',
+            'likes_count', 'reaction_counts', 'comments_count', 'shares_count', 'media_count',
             'user_reaction', 'created_at', 'updated_at'
         ]
+        list_serializer_class = UserReactionListSerializer
     
-    def get_author_avatar(self, obj):
-        """Get author avatar URL safely"""
-        if obj.author.profile_picture and hasattr(obj.author.profile_picture, 'url'):
-            return obj.author.profile_picture.url
-        return None
+    def preload_user_reactions(self, lookup, posts):
+        lookup.preload(Post, [post.id for post in posts])
     
-    def get_user_reaction(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            content_type = ContentType.objects.get_for_model(Post)
-            reaction = Reaction.objects.filter(
-                user=request.user,
-                content_type=content_type,
-                object_id=obj.id
-            ).first()
-            return reaction.reaction_type if reaction else None
-        return None
+    def get_author_avatar(self, obj):
+        """Get the author's avatar URL, sized for feed rows"""
+        return image_url(obj.author.profile_picture, 'avatar', 'medium')
 
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(UserReactionMixin, serializers.ModelSerializer):
     """
     Detailed Post serializer
     """
@@ -144,6 +171,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
     comments = serializers.SerializerMethodField()
     recent_reactions = serializers.SerializerMethodField()
     user_reaction = serializers.SerializerMethodField()
+    reaction_counts = serializers.DictField(child=serializers.IntegerField(), read_only=True)
     parish_name = serializers.CharField(source='target_parish.name', read_only=True)
     can_edit = serializers.SerializerMethodField()
     can_delete = serializers.SerializerMethodField()
@@ -153,25 +181,24 @@ class PostDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'author_name', 'author_avatar', 'content', 'post_type', 'visibility',
             'parish_name', 'is_announcement', 'is_pinned', 'is_featured',
-            'likes_count', 'comments_count', 'shares_count',
+            'likes_count', 'reaction_counts', 'comments_count', 'shares_count',
             'media', 'comments', 'recent_reactions',
             'user_reaction', 'can_edit', 'can_delete',
             'created_at', 'updated_at', 'published_at'
         ]
     
     def get_author_avatar(self, obj):
-        """Get author avatar URL safely"""
-        if obj.author.profile_picture and hasattr(obj.author.profile_picture, 'url'):
-            return obj.author.profile_picture.url
-        return None
+        """Get the author's avatar URL, sized for feed rows"""
+        return image_url(obj.author.profile_picture, 'avatar', 'medium')
     
     def get_comments(self, obj):
-        comments = obj.comments.filter(
-            is_approved=True, 
-            is_deleted=False, 
+        comments = threads.visible_comments().filter(
+            post=obj,
             parent=None
-        )[:10]
-        return CommentSerializer(comments, many=True, context=self.context).data
+        ).order_by('created_at', 'id')[:10]
+        return CommentSerializer(
+            threads.attach_replies(comments), many=True, context=self.context
+        ).data
     
     def get_recent_reactions(self, obj):
         content_type = ContentType.objects.get_for_model(Post)
@@ -181,18 +208,6 @@ class PostDetailSerializer(serializers.ModelSerializer):
         ).select_related('user')[:5]
         return ReactionSerializer(reactions, many=True).data
     
-    def get_user_reaction(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            content_type = ContentType.objects.get_for_model(Post)
-            reaction = Reaction.objects.filter(
-                user=request.user,
-                content_type=content_type,
-                object_id=obj.id
-            ).first()
-            return reaction.reaction_type if reaction else None
-        return None
-    
     def get_can_edit(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
@@ -215,17 +230,23 @@ class CreatePostSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )
+    media_uploads = serializers.ListField(
+        child=serializers.UUIDField(),
+        write_only=True,
+        required=False,
+        help_text="Ids of completed chunked uploads to attach"
+    )
     
     class Meta:
         model = Post
         fields = [
             'content', 'post_type', 'visibility', 'target_parish',
-            'is_announcement', 'media_files'
+            'is_announcement', 'media_files', 'media_uploads'
         ]
     
     def validate(self, attrs):
         # Ensure content or media is provided
-        if not attrs.get('content') and not attrs.get('media_files'):
+        if not attrs.get('content') and not attrs.get('media_files') and not attrs.get('media_uploads'):
             raise serializers.ValidationError("Post must have either content or media.")
         
         return attrs
@@ -234,6 +255,7 @@ class CreatePostSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         # Extract non-model fields
         media_files = validated_data.pop('media_files', [])
+        media_uploads = validated_data.pop('media_uploads', [])
         
         # Set author
         request = self.context.get('request')
@@ -245,29 +267,57 @@ class CreatePostSerializer(serializers.ModelSerializer):
         # Create post
         post = Post.objects.create(**validated_data)
         
-        # Create media attachments
-        for media_file in media_files:
+        # Create media attachments; dimensions, duration and renditions are
+        # filled in by a background task once the post is committed
+        media = [
             PostMedia.objects.create(
                 post=post,
                 file=media_file,
                 filename=media_file.name,
                 file_size=media_file.size,
                 content_type=media_file.content_type,
-                media_type=self._get_media_type(media_file.content_type)
+                media_type=uploads.get_media_type(media_file.content_type)
             )
+            for media_file in media_files
+        ]
+        if media_uploads:
+            try:
+                media += uploads.attach(post, media_uploads, request.user)
+            except uploads.UploadError as e:
+                raise serializers.ValidationError({'media_uploads': str(e)})
+        
+        for attachment in media:
+            transaction.on_commit(partial(process_post_media.delay, str(attachment.pk)))
         
         return post
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Chunked upload session serializer
+    """
+    chunk_size = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'filename', 'content_type', 'size', 'sha256', 'method', 'offset',
+            'chunk_size', 'status', 'expires_at', 'created_at'
+        ]
+        read_only_fields = fields
     
-    def _get_media_type(self, content_type):
-        """Determine media type from content type"""
-        if content_type.startswith('image/'):
-            return 'image'
-        elif content_type.startswith('video/'):
-            return 'video'
-        elif content_type.startswith('audio/'):
-            return 'audio'
-        else:
-            return 'document'
+    def get_chunk_size(self, obj):
+        return uploads.get_chunk_size()
+
+
+class CreateUploadSessionSerializer(serializers.Serializer):
+    """
+    Declare a chunked upload
+    """
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, default='')
 
 
 class UpdatePostSerializer(serializers.ModelSerializer):
@@ -4,89 +4,140 @@ Signals for Posts app
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
-from .models import Post, Comment, Reaction, Share
+from apps.core import counters, search
+from .models import Post, Comment, Reaction, ReactionType, Share, reaction_count_field
+from . import timelines, trending
+
+
+def _reactions_on(model):
+    def queryset():
+        return Reaction.objects.filter(content_type=ContentType.objects.get_for_model(model))
+    return queryset
+
+
+def _reactions_of_type(model, reaction_type):
+    def queryset():
+        return _reactions_on(model)().filter(reaction_type=reaction_type)
+    return queryset
+
+
+counters.register_source(
+    Post, 'comments_count',
+    lambda: Comment.objects.filter(is_approved=True, is_deleted=False), 'post'
+)
+counters.register_source(Post, 'shares_count', Share.objects.all, 'post')
+for _model in (Post, Comment):
+    counters.register_source(_model, 'likes_count', _reactions_on(_model), 'object_id')
+    for _reaction_type in ReactionType.values:
+        counters.register_source(
+            _model, reaction_count_field(_reaction_type),
+            _reactions_of_type(_model, _reaction_type), 'object_id'
+        )
+
+
+search.register(
+    Post,
+    lambda post: [(post.content, 'A'), (post.author.full_name, 'B')],
+    fields={'content', 'author'},
+    select_related=('author',)
+)
+
+
+@receiver(post_save, sender=Post)
+def sync_post_timelines(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Fan the post out to (or remove it from) the materialized feed timelines"""
+    if raw:
+        # Fixtures are loaded before their timelines can be built
+        return
+    if update_fields and not timelines.TIMELINE_FIELDS.intersection(update_fields):
+        # Counter updates and similar don't affect timelines
+        return
+    timelines.sync_post(instance)
+
+
+@receiver(post_save, sender=Post)
+def sync_post_trending_score(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Seed the trending score of a published post, or drop it once hidden"""
+    if raw or (update_fields and not trending.TRENDING_FIELDS.intersection(update_fields)):
+        return
+    trending.sync_post(instance)
 
 
 @receiver(post_save, sender=Comment)
-def update_post_comment_count(sender, instance, created, **kwargs):
-    """Update comment count when a comment is created"""
-    if created and instance.is_approved and not instance.is_deleted:
-        post = instance.post
-        post.comments_count = post.comments.filter(
-            is_approved=True,
-            is_deleted=False
-        ).count()
-        post.save(update_fields=['comments_count'])
+def update_post_comment_count(sender, instance, created, raw=False, **kwargs):
+    """Update comment count when a comment is created, approved or soft deleted"""
+    if raw:
+        return
+    
+    was_counted = False if created else getattr(instance, '_loaded_is_counted', None)
+    if was_counted is None or was_counted == instance.is_counted:
+        return
+    
+    counters.increment(Post, instance.post_id, comments_count=1 if instance.is_counted else -1)
+    if instance.is_counted:
+        trending.record_engagement(instance.post_id, trending.COMMENT_WEIGHT)
+    instance._loaded_is_counted = instance.is_counted
 
 
 @receiver(post_delete, sender=Comment)
 def decrease_post_comment_count(sender, instance, **kwargs):
     """Decrease comment count when a comment is deleted"""
-    post = instance.post
-    post.comments_count = post.comments.filter(
-        is_approved=True,
-        is_deleted=False
-    ).count()
-    post.save(update_fields=['comments_count'])
+    if instance.is_counted:
+        counters.increment(Post, instance.post_id, comments_count=-1)
+
+
+def _reaction_target_model(reaction):
+    """Model class a reaction points to, if it keeps reaction counters"""
+    model = ContentType.objects.get_for_id(reaction.content_type_id).model_class()
+    return model if model in (Post, Comment) else None
 
 
 @receiver(post_save, sender=Reaction)
-def update_reaction_count(sender, instance, created, **kwargs):
-    """Update reaction count when a reaction is created"""
+def update_reaction_count(sender, instance, created, raw=False, **kwargs):
+    """Update reaction counters when a reaction is created or changes type"""
+    model = _reaction_target_model(instance)
+    if model is None or raw:
+        return
+    
+    new_field = reaction_count_field(instance.reaction_type)
     if created:
-        content_object = instance.content_object
-        if isinstance(content_object, Post):
-            # Update post likes count
-            post = content_object
-            post.likes_count = Reaction.objects.filter(
-                content_type=ContentType.objects.get_for_model(Post),
-                object_id=post.id
-            ).count()
-            post.save(update_fields=['likes_count'])
-        elif isinstance(content_object, Comment):
-            # Update comment likes count
-            comment = content_object
-            comment.likes_count = Reaction.objects.filter(
-                content_type=ContentType.objects.get_for_model(Comment),
-                object_id=comment.id
-            ).count()
-            comment.save(update_fields=['likes_count'])
+        counters.increment(model, instance.object_id, likes_count=1, **{new_field: 1})
+        if model is Post:
+            trending.record_engagement(instance.object_id, trending.REACTION_WEIGHT)
+    else:
+        previous_type = getattr(instance, '_loaded_reaction_type', None)
+        if previous_type is None or previous_type == instance.reaction_type:
+            return
+        counters.increment(
+            model, instance.object_id,
+            **{reaction_count_field(previous_type): -1, new_field: 1}
+        )
+    
+    instance._loaded_reaction_type = instance.reaction_type
 
 
 @receiver(post_delete, sender=Reaction)
 def decrease_reaction_count(sender, instance, **kwargs):
-    """Decrease reaction count when a reaction is deleted"""
-    content_object = instance.content_object
-    if isinstance(content_object, Post):
-        # Update post likes count
-        post = content_object
-        post.likes_count = Reaction.objects.filter(
-            content_type=ContentType.objects.get_for_model(Post),
-            object_id=post.id
-        ).count()
-        post.save(update_fields=['likes_count'])
-    elif isinstance(content_object, Comment):
-        # Update comment likes count
-        comment = content_object
-        comment.likes_count = Reaction.objects.filter(
-            content_type=ContentType.objects.get_for_model(Comment),
-            object_id=comment.id
-        ).count()
-        comment.save(update_fields=['likes_count'])
+    """Decrease reaction counters when a reaction is deleted"""
+    model = _reaction_target_model(instance)
+    if model is None:
+        return
+    
+    counters.increment(
+        model, instance.object_id,
+        likes_count=-1, **{reaction_count_field(instance.reaction_type): -1}
+    )
 
 
 @receiver(post_save, sender=Share)
-def update_post_share_count(sender, instance, created, **kwargs):
+def update_post_share_count(sender, instance, created, raw=False, **kwargs):
     """Update share count when a post is shared"""
-    if created:
-        post = instance.post
-        post.shares_count = post.shares.count()
-        post.save(update_fields=['shares_count'])
+    if created and not raw:
+        counters.increment(Post, instance.post_id, shares_count=1)
+        trending.record_engagement(instance.post_id, trending.SHARE_WEIGHT)
 
 
 @receiver(post_delete, sender=Share)
 def decrease_post_share_count(sender, instance, **kwargs):
     """Decrease share count when a share is deleted"""
-    post = instance.post
-    post.shares_count = post.shares.count()
-    post.save(update_fields=['shares_count']) 
\ No newline at end of file
+    counters.increment(Post, instance.post_id, shares_count=-1)
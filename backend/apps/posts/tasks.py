@@ -0,0 +1,18 @@
+"""
+Background tasks for Posts app
+"""
+from celery import shared_task
+
+from . import media as media_processing
+from .models import PostMedia
+
+
+@shared_task(
+    autoretry_for=(OSError,), retry_backoff=True, max_retries=3, ignore_result=True
+)
+def process_post_media(media_id, force=False):
+    """Extract metadata and build renditions of an uploaded attachment"""
+    media = PostMedia.objects.filter(pk=media_id).first()
+    if media is None or (media.is_processed and not force):
+        return
+    media_processing.process(media)
@@ -0,0 +1,61 @@
+"""
+Threaded comment loading for Posts app
+
+A page of comments is rendered with the first few replies of each comment
+embedded. `attach_replies()` fetches those previews for the whole page in a
+single query, numbering each parent's replies with a ROW_NUMBER() window and
+keeping the first `limit`, instead of querying every comment (and every
+reply, recursively). Embedded replies carry `reply_count` but not their own
+replies; clients page through a thread with the comment `replies` action.
+"""
+from django.conf import settings
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import Comment
+
+
+def get_reply_preview_size():
+    """Number of replies embedded under each comment"""
+    return getattr(settings, 'COMMENT_REPLY_PREVIEW', 3)
+
+
+def visible_comments():
+    """Approved, non-deleted comments annotated with their visible reply count"""
+    return Comment.objects.filter(
+        is_approved=True, is_deleted=False
+    ).select_related('author').annotate(
+        reply_count=Count(
+            'replies', filter=Q(replies__is_approved=True, replies__is_deleted=False)
+        )
+    )
+
+
+def attach_replies(comments, limit=None):
+    """
+    Set `reply_preview` on every comment to its first `limit` replies,
+    oldest first, loaded in one query. Returns the comments as a list.
+    """
+    comments = list(comments)
+    if limit is None:
+        limit = get_reply_preview_size()
+    
+    by_id = {}
+    for comment in comments:
+        comment.reply_preview = []
+        if getattr(comment, 'reply_count', 1):
+            by_id[comment.id] = comment
+    if not by_id or limit <= 0:
+        return comments
+    
+    replies = visible_comments().filter(parent_id__in=list(by_id)).annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('parent_id')],
+            order_by=[F('created_at').asc(), F('id').asc()]
+        )
+    ).filter(position__lte=limit).order_by('parent_id', 'position')
+    
+    for reply in replies:
+        by_id[reply.parent_id].reply_preview.append(reply)
+    return comments
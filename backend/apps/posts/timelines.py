@@ -0,0 +1,229 @@
+"""
+Materialized home feed timelines for Posts app
+
+Posts are fanned out into `TimelineEntry` rows when they are created or
+approved, so `get_feed` reads bounded, pre-ordered ranges instead of
+filtering and sorting the whole posts table on every request.
+
+Public posts are written once, to the public timeline, and merged into
+every parish feed when it is read (`feed_queryset`); parish timelines only
+hold the parish's other posts. Publishing therefore writes and trims a
+single timeline however many parishes there are, and a new parish sees the
+public posts right away.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import Post, TimelineEntry, PostVisibility
+from .cache import feed_cache, feed_scope, PUBLIC_FEED_SCOPE
+
+
+# Post fields that change which timelines a post belongs to or its position
+TIMELINE_FIELDS = {
+    'is_deleted', 'is_approved', 'visibility', 'target_parish', 'is_pinned', 'created_at'
+}
+
+
+def get_timeline_length():
+    """Maximum number of entries kept per timeline"""
+    return getattr(settings, 'FEED_TIMELINE_LENGTH', 500)
+
+
+def is_timeline_eligible(post):
+    """Only approved, non-deleted posts appear in timelines"""
+    return post.is_approved and not post.is_deleted
+
+
+def get_target_timelines(post):
+    """
+    Return the set of (timeline, parish_id) keys a post is stored in: the
+    public timeline for public posts, otherwise its target parish's
+    """
+    if not is_timeline_eligible(post):
+        return set()
+    if post.visibility == PostVisibility.PUBLIC:
+        return {(TimelineEntry.PUBLIC, None)}
+    if post.target_parish_id:
+        return {(TimelineEntry.PARISH, post.target_parish_id)}
+    return set()
+
+
+def timeline_queryset(timeline, parish_id=None):
+    """Stored entries of a single timeline in feed order"""
+    return TimelineEntry.objects.filter(timeline=timeline, parish_id=parish_id)
+
+
+def feed_queryset(timeline, parish_id=None):
+    """
+    Entries of a feed in feed order: a parish feed is its own timeline
+    merged with the public one, two index range scans of bounded length
+    """
+    if timeline == TimelineEntry.PUBLIC:
+        return timeline_queryset(TimelineEntry.PUBLIC)
+    return TimelineEntry.objects.filter(
+        Q(timeline=TimelineEntry.PARISH, parish_id=parish_id)
+        | Q(timeline=TimelineEntry.PUBLIC, parish_id=None)
+    )
+
+
+def invalidate_feeds(keys):
+    """Invalidate the cached pages of the given timelines once the transaction commits"""
+    if (TimelineEntry.PUBLIC, None) in keys:
+        # Parish pages depend on the public scope as well
+        scopes = [PUBLIC_FEED_SCOPE]
+    else:
+        scopes = [feed_scope(timeline, parish_id) for timeline, parish_id in keys]
+    for scope in scopes:
+        transaction.on_commit(lambda scope=scope: feed_cache.invalidate(scope))
+
+
+@transaction.atomic
+def sync_post(post):
+    """
+    Bring the timeline entries of a post in line with its current state.
+
+    Removes the post from timelines it no longer belongs to, appends it to
+    new ones and refreshes the copied ordering fields. A timeline that
+    receives the post is trimmed back to its configured length.
+    """
+    targets = get_target_timelines(post)
+    existing = {
+        (entry.timeline, entry.parish_id): entry
+        for entry in TimelineEntry.objects.filter(post=post)
+    }
+
+    stale = {key: entry for key, entry in existing.items() if key not in targets}
+    stale_ids = [entry.id for entry in stale.values()]
+    if stale_ids:
+        TimelineEntry.objects.filter(id__in=stale_ids).delete()
+
+    outdated = any(
+        entry.is_pinned != post.is_pinned or entry.created_at != post.created_at
+        for key, entry in existing.items() if key in targets
+    )
+    if outdated:
+        TimelineEntry.objects.filter(post=post).update(
+            is_pinned=post.is_pinned,
+            created_at=post.created_at
+        )
+
+    missing = targets - set(existing)
+    TimelineEntry.objects.bulk_create([
+        TimelineEntry(
+            timeline=timeline,
+            parish_id=parish_id,
+            post=post,
+            is_pinned=post.is_pinned,
+            created_at=post.created_at
+        )
+        for timeline, parish_id in missing
+    ])
+
+    for timeline, parish_id in missing:
+        trim_timeline(timeline, parish_id)
+
+    changed = set(stale) | missing | (targets if outdated else set())
+    if changed:
+        invalidate_feeds(changed)
+
+
+def sync_posts(posts):
+    """Sync many posts, e.g. after a bulk `QuerySet.update()`"""
+    for post in posts:
+        sync_post(post)
+
+
+def trim_timeline(timeline, parish_id=None, length=None):
+    """
+    Drop the oldest entries of a timeline beyond the configured length.
+
+    The overflow is read from the timeline's index past the first `length`
+    entries, so a timeline at its limit costs one short range scan.
+    """
+    length = length or get_timeline_length()
+    overflow = timeline_queryset(timeline, parish_id).values_list('id', flat=True)[length:]
+    deleted, _ = TimelineEntry.objects.filter(id__in=list(overflow)).delete()
+    return deleted
+
+
+def trim_timelines(keys, length=None):
+    """
+    Trim many (timeline, parish_id) timelines in one statement, e.g. every
+    timeline when repairing them
+    """
+    length = length or get_timeline_length()
+    parish_ids = [parish_id for timeline, parish_id in keys if timeline == TimelineEntry.PARISH]
+    condition = Q(timeline=TimelineEntry.PARISH, parish_id__in=parish_ids)
+    if (TimelineEntry.PUBLIC, None) in keys:
+        condition |= Q(timeline=TimelineEntry.PUBLIC, parish_id=None)
+
+    overflow = TimelineEntry.objects.filter(condition).annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('timeline'), F('parish_id')],
+            order_by=[F('is_pinned').desc(), F('created_at').desc(), F('id').desc()]
+        )
+    ).filter(position__gt=length).values('id')
+    deleted, _ = TimelineEntry.objects.filter(id__in=overflow).delete()
+    return deleted
+
+
+def rebuild_timeline(timeline, parish_id=None, length=None):
+    """
+    Rebuild a single timeline from the posts table.
+
+    Used by the backfill command, e.g. after restoring posts or changing
+    the configured length.
+    """
+    length = length or get_timeline_length()
+    posts = Post.objects.filter(is_deleted=False, is_approved=True)
+
+    if timeline == TimelineEntry.PUBLIC:
+        posts = posts.filter(visibility=PostVisibility.PUBLIC)
+    else:
+        posts = posts.filter(target_parish_id=parish_id).exclude(
+            visibility=PostVisibility.PUBLIC
+        )
+
+    posts = posts.order_by('-is_pinned', '-created_at', '-id').values(
+        'id', 'is_pinned', 'created_at'
+    )[:length]
+
+    with transaction.atomic():
+        timeline_queryset(timeline, parish_id).delete()
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(
+                timeline=timeline,
+                parish_id=parish_id,
+                post_id=post['id'],
+                is_pinned=post['is_pinned'],
+                created_at=post['created_at']
+            )
+            for post in posts
+        ], batch_size=500)
+
+    invalidate_feeds({(timeline, parish_id)})
+    return len(posts)
+
+
+def repair_timelines():
+    """
+    Remove entries of soft-deleted or unapproved posts and trim every timeline.
+
+    Soft deletes normally go through `Post.soft_delete` and the post_save
+    signal, but bulk `QuerySet.update()` calls (e.g. admin actions) bypass
+    signals and leave stale entries behind.
+    """
+    removed, _ = TimelineEntry.objects.filter(
+        Q(post__is_deleted=True) | Q(post__is_approved=False)
+    ).delete()
+
+    trimmed = trim_timelines(set(
+        TimelineEntry.objects.values_list('timeline', 'parish_id').order_by().distinct()
+    ))
+
+    if removed or trimmed:
+        feed_cache.invalidate()
+    return removed, trimmed
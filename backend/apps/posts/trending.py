@@ -0,0 +1,194 @@
+"""
+Incremental trending engine for Posts app
+
+Each approved parish post keeps a `TrendingScore` row. Engagement events add
+`weight * 2 ** ((event_time - EPOCH) / half_life)` to the post's total, which
+is stored in log2 space so it never overflows:
+
+    score' = log2(2 ** score + 2 ** x)
+           = max(score, x) + log2(1 + 2 ** -|score - x|)
+
+An event one half-life old counts half as much as one happening now, and
+the ranking of existing rows never has to be recomputed as time passes.
+Reading the trending list is a range scan over the (parish, -score) index.
+
+Removed reactions, comments and shares are not subtracted; the
+`rebuild_trending` command recomputes scores from the source rows.
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Abs, Greatest, Ln, Power
+from django.utils import timezone
+
+from .models import Post, Comment, Reaction, Share, TrendingScore
+
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# Post fields that decide whether and where a post is ranked
+TRENDING_FIELDS = {'is_deleted', 'is_approved', 'target_parish'}
+
+# Relative weight of engagement events
+PUBLISH_WEIGHT = 1
+REACTION_WEIGHT = 1
+COMMENT_WEIGHT = 2
+SHARE_WEIGHT = 3
+
+# Score differences beyond this make the smaller term negligible
+# (and would underflow in the database)
+MAX_EXPONENT = 60
+
+
+def get_half_life():
+    """Half-life of an engagement event, in seconds"""
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 12) * 3600
+
+
+def get_trending_size():
+    """Maximum number of scored posts kept per parish"""
+    return getattr(settings, 'TRENDING_SIZE', 200)
+
+
+def event_score(weight, when=None):
+    """log2 contribution of a single event of the given weight"""
+    when = when or timezone.now()
+    return (when - EPOCH).total_seconds() / get_half_life() + math.log2(weight)
+
+
+def combine(score, x):
+    """Python counterpart of the SQL update, used when rebuilding"""
+    if score is None:
+        return x
+    return max(score, x) + math.log2(1 + 2 ** -min(abs(score - x), MAX_EXPONENT))
+
+
+def _add_expression(x):
+    return Greatest(F('score'), Value(x)) + Ln(
+        1 + Power(2, Greatest(-Abs(F('score') - Value(x)), -MAX_EXPONENT))
+    ) / math.log(2)
+
+
+def is_trending_eligible(post):
+    """Only approved, non-deleted parish posts are ranked"""
+    return post.is_approved and not post.is_deleted and post.target_parish_id is not None
+
+
+def sync_post(post):
+    """Seed the score of a newly published post, or drop an ineligible one"""
+    if not is_trending_eligible(post):
+        TrendingScore.objects.filter(post=post).delete()
+        return
+
+    score, created = TrendingScore.objects.get_or_create(
+        post=post,
+        defaults={
+            'parish_id': post.target_parish_id,
+            'score': event_score(PUBLISH_WEIGHT, post.created_at),
+        }
+    )
+    if created:
+        trim(post.target_parish_id)
+    elif score.parish_id != post.target_parish_id:
+        TrendingScore.objects.filter(pk=score.pk).update(parish_id=post.target_parish_id)
+
+
+def record_engagement(post_id, weight):
+    """
+    Add an engagement event to a post's score once the transaction commits.
+
+    A post trimmed out of its parish's ranking gets its row back, scored
+    from its publication and this event, so an older post can still rise.
+    """
+    def apply():
+        x = event_score(weight)
+        if TrendingScore.objects.filter(post_id=post_id).update(score=_add_expression(x)):
+            return
+        post = Post.objects.filter(pk=post_id).only(
+            'created_at', 'is_approved', 'is_deleted', 'target_parish'
+        ).first()
+        if post is None or not is_trending_eligible(post):
+            return
+        _, created = TrendingScore.objects.get_or_create(
+            post=post,
+            defaults={
+                'parish_id': post.target_parish_id,
+                'score': combine(event_score(PUBLISH_WEIGHT, post.created_at), x),
+            }
+        )
+        if created:
+            trim(post.target_parish_id)
+        else:
+            # Recreated concurrently; add the event to that row instead
+            TrendingScore.objects.filter(post_id=post_id).update(score=_add_expression(x))
+    transaction.on_commit(apply)
+
+
+def trim(parish_id, size=None):
+    """Drop the lowest scores of a parish beyond the configured size"""
+    size = size or get_trending_size()
+    keep_ids = TrendingScore.objects.filter(parish_id=parish_id).values('id')[:size]
+    deleted, _ = TrendingScore.objects.filter(parish_id=parish_id).exclude(
+        id__in=keep_ids
+    ).delete()
+    return deleted
+
+
+def top_post_ids(parish_id, limit):
+    """Ids of the highest scoring posts of a parish"""
+    return list(
+        TrendingScore.objects.filter(parish_id=parish_id).values_list('post_id', flat=True)[:limit]
+    )
+
+
+def rebuild(parish_id=None):
+    """
+    Recompute scores from posts, reactions, comments and shares.
+
+    Returns the number of scores written.
+    """
+    posts = Post.objects.filter(
+        is_deleted=False, is_approved=True, target_parish__isnull=False
+    )
+    if parish_id is not None:
+        posts = posts.filter(target_parish_id=parish_id)
+
+    scores = {}
+    parishes = {}
+    for post_id, target_parish_id, created_at in posts.values_list(
+        'id', 'target_parish_id', 'created_at'
+    ).iterator():
+        scores[post_id] = event_score(PUBLISH_WEIGHT, created_at)
+        parishes[post_id] = target_parish_id
+
+    events = [
+        (REACTION_WEIGHT, 'object_id', Reaction.objects.filter(
+            content_type=ContentType.objects.get_for_model(Post)
+        )),
+        (COMMENT_WEIGHT, 'post_id', Comment.objects.filter(is_approved=True, is_deleted=False)),
+        (SHARE_WEIGHT, 'post_id', Share.objects.all()),
+    ]
+    for weight, key, rows in events:
+        if parish_id is not None:
+            rows = rows.filter(**{f'{key}__in': posts.values('id')})
+        for post_id, created_at in rows.values_list(key, 'created_at').iterator():
+            if post_id in scores:
+                scores[post_id] = combine(scores[post_id], event_score(weight, created_at))
+
+    with transaction.atomic():
+        existing = TrendingScore.objects.all()
+        if parish_id is not None:
+            existing = existing.filter(parish_id=parish_id)
+        existing.delete()
+        TrendingScore.objects.bulk_create([
+            TrendingScore(post_id=post_id, parish_id=parishes[post_id], score=score)
+            for post_id, score in scores.items()
+        ], batch_size=500)
+        for target_parish_id in set(parishes.values()):
+            trim(target_parish_id)
+
+    return len(scores)
@@ -0,0 +1,417 @@
+"""
+Resumable chunked uploads for Posts app
+
+    POST   /api/posts/uploads/                 declare filename, content type, size (and sha256)
+    PATCH  /api/posts/uploads/<id>/            send the next chunk at `Upload-Offset`
+    GET    /api/posts/uploads/<id>/            current offset, to resume after a failure
+    POST   /api/posts/uploads/<id>/complete/   assemble and verify the file
+    DELETE /api/posts/uploads/<id>/            abort
+
+Sizes are checked against the declared size and the chunk's Content-Length
+before anything is read. Chunk bodies are copied from the request in small
+blocks and stored as separate parts; completing the upload streams the parts
+into the final file while hashing it, so memory use stays bounded by the
+block size whatever the file size.
+
+Direct uploads bypass the API workers entirely:
+
+    POST   /api/posts/uploads/direct/          declare the file, get a presigned form
+    (client POSTs the form and file to the returned URL)
+    POST   /api/posts/uploads/<id>/complete/   confirm; size (and sha256) are checked
+
+With `USE_S3` the form is an S3 presigned POST; otherwise a local stand-in
+signs the same kind of form and receives it at /api/posts/direct-uploads/local/.
+
+A completed session is attached to a post by id
+(`CreatePostSerializer.media_uploads`) without re-uploading; only then is a
+`PostMedia` row recorded.
+"""
+import base64
+import hashlib
+import hmac
+import io
+import json
+import os
+import posixpath
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import PostMedia, UploadMethod, UploadSession, UploadStatus
+
+# Bytes read from the request or storage at a time
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """A rejected upload request; `status` is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def get_max_upload_size():
+    return getattr(settings, 'MEDIA_UPLOAD_MAX_SIZE', 50 * 1024 * 1024)
+
+
+def get_chunk_size():
+    return getattr(settings, 'UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+
+
+def get_session_ttl():
+    return timedelta(hours=getattr(settings, 'UPLOAD_SESSION_TTL_HOURS', 24))
+
+
+def get_presign_expiry():
+    """Seconds a presigned upload form stays valid"""
+    return getattr(settings, 'DIRECT_UPLOAD_EXPIRY_SECONDS', 3600)
+
+
+def get_media_type(content_type):
+    """Determine the PostMedia type from a content type"""
+    if content_type.startswith('image/'):
+        return 'image'
+    elif content_type.startswith('video/'):
+        return 'video'
+    elif content_type.startswith('audio/'):
+        return 'audio'
+    return 'document'
+
+
+def part_name(session, offset):
+    return f'uploads/parts/{session.pk}/{offset:012d}'
+
+
+def final_name(session):
+    extension = os.path.splitext(session.filename)[1].lower()
+    return f'uploads/{session.user_id}/{session.pk}{extension}'
+
+
+def create_session(user, filename, content_type, size, sha256='', method=UploadMethod.CHUNKED):
+    if size > get_max_upload_size():
+        raise UploadError(
+            f'File too large. Maximum size is {get_max_upload_size() // (1024 * 1024)}MB',
+            status=413
+        )
+    session = UploadSession(
+        user=user,
+        filename=filename,
+        content_type=content_type,
+        size=size,
+        sha256=sha256.lower(),
+        method=method,
+        expires_at=timezone.now() + get_session_ttl()
+    )
+    if method == UploadMethod.DIRECT:
+        # The storage name is reserved up front; the client uploads to it
+        session.file = final_name(session)
+    session.save()
+    return session
+
+
+def _check_uploading(session):
+    if session.status != UploadStatus.UPLOADING:
+        raise UploadError('Upload is already complete', status=409)
+    if session.is_expired:
+        raise UploadError('Upload session has expired', status=410)
+
+
+def append_chunk(session, offset, length, stream, checksum=''):
+    """
+    Store the chunk of `length` bytes read from `stream` at `offset`.
+
+    Chunks must arrive in order; a chunk at the wrong offset is rejected
+    with 409 and the client resumes from the session's current offset.
+    """
+    _check_uploading(session)
+    if session.method != UploadMethod.CHUNKED:
+        raise UploadError('Direct uploads are sent to storage, not in chunks')
+    if offset != session.offset:
+        raise UploadError(f'Expected offset {session.offset}', status=409)
+    if length <= 0:
+        raise UploadError('Empty chunk')
+    if length > get_chunk_size():
+        raise UploadError(f'Chunks are limited to {get_chunk_size()} bytes', status=413)
+    if offset + length > session.size:
+        raise UploadError('Chunk exceeds the declared file size', status=413)
+
+    # Copy the body before taking the row lock, so a slow client never
+    # holds a transaction open
+    digest = hashlib.sha256()
+    with tempfile.TemporaryFile() as chunk:
+        remaining = length
+        while remaining:
+            block = stream.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                raise UploadError('Chunk is shorter than its Content-Length')
+            chunk.write(block)
+            digest.update(block)
+            remaining -= len(block)
+
+        if checksum and digest.hexdigest() != checksum.lower():
+            raise UploadError('Chunk checksum mismatch')
+
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            _check_uploading(session)
+            if offset != session.offset:
+                raise UploadError(f'Expected offset {session.offset}', status=409)
+
+            chunk.seek(0)
+            name = part_name(session, offset)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            default_storage.save(name, File(chunk))
+
+            session.parts.append([offset, length])
+            session.offset = offset + length
+            session.save(update_fields=['parts', 'offset', 'updated_at'])
+    return session
+
+
+class PartsReader(io.RawIOBase):
+    """Read stored parts back to back as one stream, hashing what is read"""
+
+    def __init__(self, names, size):
+        self._names = iter(names)
+        self._current = None
+        self.size = size
+        self.digest = hashlib.sha256()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while True:
+            if self._current is None:
+                name = next(self._names, None)
+                if name is None:
+                    return 0
+                self._current = default_storage.open(name, 'rb')
+            data = self._current.read(min(len(buffer), BLOCK_SIZE))
+            if data:
+                buffer[:len(data)] = data
+                self.digest.update(data)
+                return len(data)
+            self._current.close()
+            self._current = None
+
+    def close(self):
+        if self._current is not None:
+            self._current.close()
+        super().close()
+
+
+def _delete_parts(session):
+    for offset, _ in session.parts:
+        default_storage.delete(part_name(session, offset))
+
+
+def complete(session, sha256=''):
+    """Assemble the parts into the final file and verify its checksum"""
+    _check_uploading(session)
+    if session.method == UploadMethod.DIRECT:
+        return _complete_direct(session, sha256)
+    if session.offset != session.size:
+        raise UploadError(f'Upload is incomplete: {session.offset} of {session.size} bytes')
+
+    expected = (sha256 or session.sha256).lower()
+    reader = PartsReader([part_name(session, offset) for offset, _ in session.parts], session.size)
+    with reader:
+        name = default_storage.save(final_name(session), File(reader, name=session.filename))
+    if expected and reader.digest.hexdigest() != expected:
+        default_storage.delete(name)
+        raise UploadError('File checksum mismatch')
+
+    with transaction.atomic():
+        locked = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if locked.status != UploadStatus.UPLOADING:
+            default_storage.delete(name)
+            raise UploadError('Upload is already complete', status=409)
+        session.status = UploadStatus.COMPLETE
+        session.file = name
+        session.sha256 = reader.digest.hexdigest()
+        session.save(update_fields=['status', 'file', 'sha256', 'updated_at'])
+
+    _delete_parts(session)
+    return session
+
+
+def _complete_direct(session, sha256=''):
+    """Confirm that a direct upload reached storage with the declared size"""
+    if not default_storage.exists(session.file):
+        raise UploadError('The file has not been uploaded yet', status=409)
+    if default_storage.size(session.file) != session.size:
+        default_storage.delete(session.file)
+        raise UploadError('Uploaded file size does not match the declared size')
+
+    # Verifying a checksum means reading the object back, so it's only done
+    # when the client declared one
+    expected = (sha256 or session.sha256).lower()
+    if expected:
+        digest = hashlib.sha256()
+        with default_storage.open(session.file, 'rb') as stored:
+            for block in iter(lambda: stored.read(BLOCK_SIZE), b''):
+                digest.update(block)
+        if digest.hexdigest() != expected:
+            default_storage.delete(session.file)
+            raise UploadError('File checksum mismatch')
+
+    updated = UploadSession.objects.filter(
+        pk=session.pk, status=UploadStatus.UPLOADING
+    ).update(status=UploadStatus.COMPLETE, sha256=expected, offset=session.size)
+    if not updated:
+        raise UploadError('Upload is already complete', status=409)
+    session.status, session.sha256, session.offset = UploadStatus.COMPLETE, expected, session.size
+    return session
+
+
+class S3DirectUploadBackend:
+    """Presigned S3 POST forms, limited to the declared type and exact size"""
+
+    def presign(self, session):
+        storage = default_storage
+        key = posixpath.join(getattr(settings, 'AWS_LOCATION', ''), session.file)
+        fields = {'Content-Type': session.content_type}
+        conditions = [
+            {'Content-Type': session.content_type},
+            ['content-length-range', session.size, session.size],
+        ]
+        acl = getattr(settings, 'AWS_DEFAULT_ACL', None)
+        if acl:
+            fields['acl'] = acl
+            conditions.append({'acl': acl})
+        return storage.connection.meta.client.generate_presigned_post(
+            storage.bucket_name, key,
+            Fields=fields, Conditions=conditions, ExpiresIn=get_presign_expiry()
+        )
+
+
+class LocalDirectUploadBackend:
+    """
+    Filesystem stand-in for presigned POSTs, for development and tests.
+
+    The form carries a policy (key, content type, size, expiry) signed with
+    the SECRET_KEY, and `receive` enforces it like S3 would.
+    """
+
+    @staticmethod
+    def sign(policy):
+        return hmac.new(
+            settings.SECRET_KEY.encode(), policy.encode(), hashlib.sha256
+        ).hexdigest()
+
+    def presign(self, session):
+        policy = base64.urlsafe_b64encode(json.dumps({
+            'key': session.file,
+            'content_type': session.content_type,
+            'size': session.size,
+            'expires': int(time.time()) + get_presign_expiry(),
+        }).encode()).decode()
+        return {
+            'url': reverse('posts:direct-upload-local'),
+            'fields': {
+                'key': session.file,
+                'Content-Type': session.content_type,
+                'policy': policy,
+                'signature': self.sign(policy),
+            },
+        }
+
+    def check_policy(self, fields):
+        """Decode and verify the signed policy of a posted form"""
+        policy = fields.get('policy', '')
+        if not hmac.compare_digest(self.sign(policy), fields.get('signature', '')):
+            raise UploadError('Invalid signature', status=403)
+        policy = json.loads(base64.urlsafe_b64decode(policy))
+        if policy['expires'] < time.time():
+            raise UploadError('Policy expired', status=403)
+        if fields.get('key') != policy['key'] or fields.get('Content-Type') != policy['content_type']:
+            raise UploadError('Form fields do not match the policy', status=403)
+        return policy
+
+    def receive(self, fields, file):
+        policy = self.check_policy(fields)
+        if file.size != policy['size']:
+            raise UploadError('File size does not match the policy')
+        if default_storage.exists(policy['key']):
+            raise UploadError('Already uploaded', status=409)
+        default_storage.save(policy['key'], file)
+
+
+DIRECT_UPLOAD_BACKENDS = {
+    's3': S3DirectUploadBackend,
+    'local': LocalDirectUploadBackend,
+}
+
+
+def get_direct_backend():
+    name = getattr(settings, 'DIRECT_UPLOAD_BACKEND', '') or (
+        's3' if getattr(settings, 'USE_S3', False) else 'local'
+    )
+    return DIRECT_UPLOAD_BACKENDS[name]()
+
+
+def abort(session):
+    """Delete an upload and everything it stored"""
+    if session.status == UploadStatus.ATTACHED:
+        raise UploadError('Upload is attached to a post', status=409)
+    _delete_parts(session)
+    if session.file:
+        default_storage.delete(session.file)
+    session.delete()
+
+
+def attach(post, session_ids, user):
+    """
+    Create the media of a post from completed uploads of `user`.
+
+    Must be called inside the transaction creating the post; the sessions
+    are locked so that one upload can't be attached twice.
+    """
+    sessions = list(UploadSession.objects.select_for_update().filter(
+        pk__in=session_ids, user=user, status=UploadStatus.COMPLETE
+    ))
+    if len(sessions) != len(set(session_ids)):
+        raise UploadError('Some uploads are unknown, incomplete or already attached')
+
+    order = {str(session_id): index for index, session_id in enumerate(session_ids)}
+    media = []
+    for session in sorted(sessions, key=lambda session: order[str(session.pk)]):
+        media.append(PostMedia.objects.create(
+            post=post,
+            file=session.file,
+            filename=session.filename,
+            file_size=session.size,
+            content_type=session.content_type,
+            media_type=get_media_type(session.content_type)
+        ))
+        session.status = UploadStatus.ATTACHED
+        session.save(update_fields=['status', 'updated_at'])
+    return media
+
+
+def cleanup_expired():
+    """
+    Delete expired sessions, with the files of those never attached.
+
+    Returns the number of sessions removed.
+    """
+    expired = UploadSession.objects.filter(expires_at__lte=timezone.now())
+    count = 0
+    for session in expired.iterator():
+        if session.status != UploadStatus.ATTACHED:
+            _delete_parts(session)
+            if session.file:
+                default_storage.delete(session.file)
+        session.delete()
+        count += 1
+    return count
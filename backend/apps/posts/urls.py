@@ -9,6 +9,7 @@ from . import views
 # Main router
 router = DefaultRouter()
 router.register(r'posts', views.PostViewSet, basename='posts')
+router.register(r'uploads', views.UploadViewSet, basename='uploads')
 
 # Nested router for comments
 posts_router = routers.NestedDefaultRouter(router, r'posts', lookup='post')
@@ -25,6 +26,12 @@ urlpatterns = [
     path('feed/', views.get_feed, name='feed'),
     path('trending/', views.get_trending_posts, name='trending'),
     
+    # Search
+    path('search/', views.search_posts, name='search'),
+    
+    # Local stand-in for presigned direct uploads (when USE_S3 is off)
+    path('direct-uploads/local/', views.receive_direct_upload, name='direct-upload-local'),
+    
     # Tags
     path('tags/', views.PostTagListView.as_view(), name='tags'),
     
@@ -2,10 +2,13 @@
 Views for Posts app
 """
 from rest_framework import generics, status, permissions, filters
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import (
+    api_view, permission_classes, authentication_classes, parser_classes, action
+)
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q, Count, Prefetch
 from django.contrib.contenttypes.models import ContentType
 from django_filters.rest_framework import DjangoFilterBackend
@@ -14,27 +17,53 @@ from django.utils import timezone
 from datetime import timedelta
 
 from .models import (
-    Post, PostMedia, Comment, Reaction, Share, PostTag,
-    Feed, PostVisibility, PostType, ReactionType
+    ReactionCountsModel, Post, PostMedia, Comment, Reaction, Share, PostTag,
+    Feed, TimelineEntry, PostVisibility, PostType, ReactionType, UploadMethod, UploadSession
 )
 from .serializers import (
     PostListSerializer, PostDetailSerializer, CreatePostSerializer,
     CommentSerializer, CreateCommentSerializer, CreateReactionSerializer,
-    ReactionSerializer, PostTagSerializer
+    ReactionSerializer, PostTagSerializer, UploadSessionSerializer, CreateUploadSessionSerializer
 )
+from apps.core import search
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.search import FullTextSearchFilter
 from .filters import PostFilter
+from .pagination import PostCursorPagination, CommentCursorPagination, FeedCursorPagination
+from .reactions import fill_user_reactions
+from .cache import feed_cache, feed_page_scopes, trending_cache
+from . import threads, timelines, trending, uploads
+
+
+def filter_visible_posts(queryset, user):
+    """Posts the user may see: public, their parish's, and their own"""
+    if user.is_staff:
+        return queryset
+    return queryset.filter(
+        Q(visibility=PostVisibility.PUBLIC) |
+        Q(visibility=PostVisibility.PARISH_ONLY, target_parish=user.parish) |
+        Q(author=user)
+    )
 
 
-class PostViewSet(ModelViewSet):
+class PostViewSet(ConditionalGetMixin, ModelViewSet):
     """
     ViewSet for managing posts
     """
+    conditional_fields = (
+        'likes_count', 'comments_count', 'shares_count', 'media_count', 'author.updated_at',
+    ) + tuple(
+        field.name for field in ReactionCountsModel._meta.get_fields()
+    )
+    conditional_embedded_fields = (
+        'media', 'comments', 'recent_reactions', 'user_reaction', 'can_edit', 'can_delete',
+    )
     queryset = Post.objects.filter(is_deleted=False, is_approved=True)
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PostCursorPagination
     parser_classes = [JSONParser, MultiPartParser, FormParser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_class = PostFilter
-    search_fields = ['content', 'author__first_name', 'author__last_name']
     ordering_fields = ['created_at', 'likes_count', 'comments_count']
     ordering = ['-created_at']
     
@@ -49,14 +78,7 @@ class PostViewSet(ModelViewSet):
         )
         
         # Filter based on visibility and user's parish
-        if not user.is_staff:
-            queryset = queryset.filter(
-                Q(visibility=PostVisibility.PUBLIC) |
-                Q(visibility=PostVisibility.PARISH_ONLY, target_parish=user.parish) |
-                Q(author=user)
-            )
-        
-        return queryset
+        return filter_visible_posts(queryset, user)
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -134,10 +156,6 @@ class PostViewSet(ModelViewSet):
             visibility=request.data.get('visibility', PostVisibility.PARISH_ONLY)
         )
         
-        # Update share count
-        post.shares_count += 1
-        post.save(update_fields=['shares_count'])
-        
         return Response({
             'message': 'Post shared successfully',
             'share_id': str(share.id)
@@ -150,15 +168,32 @@ class CommentViewSet(ModelViewSet):
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CommentCursorPagination
     parser_classes = [JSONParser, MultiPartParser, FormParser]
     
     def get_queryset(self):
         post_id = self.kwargs.get('post_pk')
-        return Comment.objects.filter(
-            post_id=post_id,
-            is_approved=True,
-            is_deleted=False
-        ).select_related('author').order_by('created_at')
+        return threads.visible_comments().filter(post_id=post_id)
+    
+    def list(self, request, *args, **kwargs):
+        """Top-level comments, each with its first replies embedded"""
+        queryset = self.filter_queryset(self.get_queryset()).filter(parent__isnull=True)
+        return self._thread_page(queryset)
+    
+    def retrieve(self, request, *args, **kwargs):
+        comment = threads.attach_replies([self.get_object()])[0]
+        return Response(self.get_serializer(comment).data)
+    
+    @action(detail=True, methods=['get'])
+    def replies(self, request, post_pk=None, pk=None):
+        """Page through the replies to a comment, oldest first"""
+        comment = self.get_object()
+        return self._thread_page(self.get_queryset().filter(parent=comment))
+    
+    def _thread_page(self, queryset):
+        page = threads.attach_replies(self.paginate_queryset(queryset))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -170,17 +205,6 @@ class CommentViewSet(ModelViewSet):
         context['post_id'] = self.kwargs.get('post_pk')
         return context
     
-    def perform_create(self, serializer):
-        comment = serializer.save()
-        
-        # Update comment count on post
-        post = comment.post
-        post.comments_count = post.comments.filter(
-            is_approved=True, 
-            is_deleted=False
-        ).count()
-        post.save(update_fields=['comments_count'])
-    
     @action(detail=True, methods=['post'], parser_classes=[JSONParser])
     def react(self, request, post_pk=None, pk=None):
         """Add or update reaction to a comment"""
@@ -209,7 +233,8 @@ class CommentViewSet(ModelViewSet):
     description='Get posts for the user\'s personalized feed',
     parameters=[
         OpenApiParameter(name='feed_type', description='Type of feed', required=False),
-        OpenApiParameter(name='limit', description='Number of posts', required=False),
+        OpenApiParameter(name='cursor', description='Pagination cursor', required=False),
+        OpenApiParameter(name='page_size', description='Number of posts', required=False),
     ]
 )
 @api_view(['GET'])
@@ -220,7 +245,7 @@ def get_feed(request):
     """
     user = request.user
     feed_type = request.GET.get('feed_type', 'parish')
-    limit = int(request.GET.get('limit', 20))
+    paginator = FeedCursorPagination()
     
     # Base queryset
     queryset = Post.objects.filter(
@@ -234,32 +259,48 @@ def get_feed(request):
         media_count=Count('media')
     )
     
-    if feed_type == 'parish':
-        # Parish-specific feed
-        queryset = queryset.filter(
-            Q(target_parish=user.parish) |
-            Q(visibility=PostVisibility.PUBLIC)
-        )
-    elif feed_type == 'public':
-        # Public feed
-        queryset = queryset.filter(visibility=PostVisibility.PUBLIC)
-    elif feed_type == 'following':
+    if feed_type == 'following':
         # Following feed (implement when friendship system is ready)
-        queryset = queryset.filter(author=user)
+        posts = paginator.paginate_queryset(queryset.filter(author=user), request)
+        serializer = PostListSerializer(
+            posts, 
+            many=True, 
+            context={'request': request}
+        )
+        return Response({
+            'feed_type': feed_type,
+            'posts': serializer.data,
+            'next': paginator.get_next_link()
+        })
     
-    # Order by engagement and recency
-    queryset = queryset.order_by('-is_pinned', '-created_at')[:limit]
+    # Parish and public feeds are read from the materialized timelines
+    if feed_type == 'public' or not user.parish_id:
+        timeline, parish_id = TimelineEntry.PUBLIC, None
+    else:
+        timeline, parish_id = TimelineEntry.PARISH, user.parish_id
     
-    serializer = PostListSerializer(
-        queryset, 
-        many=True, 
-        context={'request': request}
+    def build_page():
+        entries = paginator.paginate_queryset(
+            timelines.feed_queryset(timeline, parish_id), request
+        )
+        posts_by_id = queryset.in_bulk([entry.post_id for entry in entries])
+        posts = [posts_by_id[entry.post_id] for entry in entries if entry.post_id in posts_by_id]
+        # Rendered without the request so the page can be shared between users
+        return {
+            'posts': PostListSerializer(posts, many=True).data,
+            'next': paginator.get_next_link()
+        }
+    
+    page = feed_cache.get_or_set(
+        (request.GET.urlencode(),),
+        build_page,
+        scope=feed_page_scopes(timeline, parish_id)
     )
     
     return Response({
         'feed_type': feed_type,
-        'posts': serializer.data,
-        'total': queryset.count()
+        'posts': fill_user_reactions(page['posts'], Post, {'request': request}),
+        'next': page['next']
     })
 
 
@@ -275,20 +316,23 @@ def get_trending_posts(request):
     Get trending posts based on engagement
     """
     user = request.user
-    limit = int(request.GET.get('limit', 10))
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), trending.get_trending_size())
+    except ValueError:
+        limit = 10
     
-    queryset = Post.objects.filter(
-        is_deleted=False,
-        is_approved=True,
-        target_parish=user.parish
-    ).select_related(
+    # Scores are maintained incrementally, so this is a short index range scan
+    post_ids = trending_cache.get_or_set(
+        (limit,),
+        lambda: trending.top_post_ids(user.parish_id, limit),
+        scope=user.parish_id
+    )
+    posts_by_id = Post.objects.select_related(
         'author', 'target_parish'
-    ).annotate(
-        engagement_score=Count('reactions') + Count('comments') + Count('shares')
-    ).order_by('-engagement_score', '-created_at')[:limit]
+    ).in_bulk(post_ids)
     
     serializer = PostListSerializer(
-        queryset, 
+        [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id], 
         many=True, 
         context={'request': request}
     )
@@ -298,6 +342,40 @@ def get_trending_posts(request):
     })
 
 
+@extend_schema(
+    operation_id='posts_search',
+    summary='Search posts',
+    description='Full-text search over posts visible to the user, ranked by relevance',
+    parameters=[
+        OpenApiParameter(name='q', description='Search terms', required=True),
+        OpenApiParameter(name='page', description='Page number', required=False),
+    ]
+)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def search_posts(request):
+    """
+    Search posts by content and author name (English, Arabic and
+    transliterated spellings), most relevant first
+    """
+    queryset = filter_visible_posts(
+        Post.objects.filter(is_deleted=False, is_approved=True),
+        request.user
+    ).select_related(
+        'author', 'target_parish'
+    ).annotate(
+        media_count=Count('media')
+    )
+    
+    paginator = PageNumberPagination()
+    posts = paginator.paginate_queryset(
+        search.search(queryset, request.GET.get('q', '')),
+        request
+    )
+    serializer = PostListSerializer(posts, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
+
+
 class PostTagListView(generics.ListAPIView):
     """
     List all post tags
@@ -356,39 +434,148 @@ def get_post_stats(request):
     return Response(stats)
 
 
-# Media upload view
-@extend_schema(
-    operation_id='posts_upload_media',
-    summary='Upload media for posts',
-    description='Upload media files that can be attached to posts'
-)
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def upload_media(request):
+class UploadViewSet(GenericViewSet):
     """
-    Upload media files for posts
+    Resumable chunked uploads of post media (see `posts.uploads`)
     """
-    if 'file' not in request.FILES:
-        return Response(
-            {'error': 'No file provided'}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser]
+    
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
     
-    file = request.FILES['file']
+    def _error(self, error, session=None):
+        data = {'error': str(error)}
+        if session is not None:
+            data['offset'] = session.offset
+        return Response(data, status=error.status)
     
-    # Basic file validation
-    max_size = 50 * 1024 * 1024  # 50MB
-    if file.size > max_size:
+    @extend_schema(
+        operation_id='posts_uploads_create',
+        summary='Start a chunked upload',
+        request=CreateUploadSessionSerializer,
+        responses={201: UploadSessionSerializer}
+    )
+    def create(self, request):
+        serializer = CreateUploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            session = uploads.create_session(request.user, **serializer.validated_data)
+        except uploads.UploadError as e:
+            return self._error(e)
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+    
+    @extend_schema(
+        operation_id='posts_uploads_direct',
+        summary='Start a direct-to-storage upload',
+        description='Returns a presigned form (`url` and `fields`) to POST the file to; '
+                    'call complete/ once the storage accepted it.',
+        request=CreateUploadSessionSerializer,
+        responses={201: UploadSessionSerializer}
+    )
+    @action(detail=False, methods=['post'])
+    def direct(self, request):
+        serializer = CreateUploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            session = uploads.create_session(
+                request.user, method=UploadMethod.DIRECT, **serializer.validated_data
+            )
+        except uploads.UploadError as e:
+            return self._error(e)
+        
+        form = uploads.get_direct_backend().presign(session)
+        form['url'] = request.build_absolute_uri(form['url'])
         return Response(
-            {'error': 'File too large. Maximum size is 50MB'}, 
-            status=status.HTTP_400_BAD_REQUEST
+            {**UploadSessionSerializer(session).data, 'upload': form},
+            status=status.HTTP_201_CREATED
         )
     
-    # For now, just return file info
-    # In production, upload to S3 and return URL
-    return Response({
-        'filename': file.name,
-        'size': file.size,
-        'content_type': file.content_type,
-        'message': 'File uploaded successfully'
-    }) 
\ No newline at end of file
+    def retrieve(self, request, pk=None):
+        """Current offset of an upload, to resume it"""
+        return Response(self.get_serializer(self.get_object()).data)
+    
+    @extend_schema(
+        operation_id='posts_uploads_append',
+        summary='Append a chunk',
+        description='Raw chunk body at the offset given by the `Upload-Offset` header; '
+                    'an optional `Upload-Checksum: sha256 <hex>` header is verified.',
+        request=None,
+        responses={200: UploadSessionSerializer}
+    )
+    def partial_update(self, request, pk=None):
+        session = self.get_object()
+        try:
+            offset = int(request.META.get('HTTP_UPLOAD_OFFSET', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return Response(
+                {'error': 'Upload-Offset and Content-Length headers are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        algorithm, _, checksum = request.META.get('HTTP_UPLOAD_CHECKSUM', '').partition(' ')
+        if algorithm and algorithm.lower() != 'sha256':
+            return Response(
+                {'error': 'Only sha256 checksums are supported'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            session = uploads.append_chunk(session, offset, length, request.stream, checksum)
+        except uploads.UploadError as e:
+            return self._error(e, session)
+        return Response(self.get_serializer(session).data)
+    
+    @extend_schema(
+        operation_id='posts_uploads_complete',
+        summary='Complete a chunked upload',
+        request=None,
+        responses={200: UploadSessionSerializer}
+    )
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        session = self.get_object()
+        try:
+            session = uploads.complete(session, request.data.get('sha256', ''))
+        except uploads.UploadError as e:
+            return self._error(e, session)
+        return Response(self.get_serializer(session).data)
+    
+    def destroy(self, request, pk=None):
+        session = self.get_object()
+        try:
+            uploads.abort(session)
+        except uploads.UploadError as e:
+            return self._error(e)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(exclude=True)
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+@parser_classes([MultiPartParser])
+def receive_direct_upload(request):
+    """
+    Local stand-in for the storage endpoint of presigned uploads; the signed
+    policy in the form authorizes the upload, as with S3
+    """
+    backend = uploads.get_direct_backend()
+    if not isinstance(backend, uploads.LocalDirectUploadBackend):
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    
+    # Refuse oversized bodies before the multipart parser reads them
+    if int(request.META.get('CONTENT_LENGTH') or 0) > uploads.get_max_upload_size() + 64 * 1024:
+        return Response({'error': 'File too large'}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    if 'file' not in request.FILES:
+        return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        backend.receive(request.data, request.FILES['file'])
+    except uploads.UploadError as e:
+        return Response({'error': str(e)}, status=e.status)
+    except (KeyError, ValueError):
+        return Response({'error': 'Malformed policy'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(status=status.HTTP_204_NO_CONTENT)
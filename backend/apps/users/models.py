@@ -2,6 +2,7 @@
 User models for Coptic Social Network
 """
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -29,6 +30,7 @@ class User(AbstractUser):
     )
     bio = models.TextField(max_length=500, blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
+    profile_picture_hash = models.CharField(max_length=64, blank=True, editable=False)
     
     # Social links
     linkedin_url = models.URLField(blank=True, null=True)
@@ -72,6 +74,11 @@ class User(AbstractUser):
         verbose_name = _('User')
         verbose_name_plural = _('Users')
         ordering = ['-created_at']
+        indexes = [
+            # Trigram indexes for fuzzy name lookup (core.search.fuzzy_search)
+            GinIndex(fields=['first_name'], name='users_first_name_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['last_name'], name='users_last_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
@@ -82,6 +89,13 @@ class User(AbstractUser):
     
     def get_parish_name(self):
         return self.parish.name if self.parish else "No Parish Assigned"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored parish so signals can move member_count on change
+        instance._loaded_parish_id = instance.__dict__.get('parish_id')
+        return instance
 
 
 class UserProfile(models.Model):
@@ -5,6 +5,7 @@ from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from apps.core.renditions import image_url
 from .models import User, UserProfile
 from apps.parishes.models import Parish
 
@@ -21,6 +22,22 @@ class ParishSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'diocese_name', 'location', 'priest_name', 'address']
 
 
+class UserTypeaheadSerializer(serializers.ModelSerializer):
+    """
+    Minimal user serializer for name lookups
+    """
+    full_name = serializers.CharField(read_only=True)
+    parish_name = serializers.CharField(source='parish.name', read_only=True, default=None)
+    profile_picture = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = User
+        fields = ['id', 'full_name', 'parish_name', 'profile_picture']
+    
+    def get_profile_picture(self, obj):
+        return image_url(obj.profile_picture, 'avatar', 'small')
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """
     User Profile serializer
@@ -52,9 +69,7 @@ class UserBasicSerializer(serializers.ModelSerializer):
         """
         Handle empty profile_picture fields
         """
-        if obj.profile_picture and hasattr(obj.profile_picture, 'url'):
-            return obj.profile_picture.url
-        return None
+        return image_url(obj.profile_picture, 'avatar', 'medium')
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -81,9 +96,7 @@ class UserSerializer(serializers.ModelSerializer):
         """
         Handle empty profile_picture fields
         """
-        if obj.profile_picture and hasattr(obj.profile_picture, 'url'):
-            return obj.profile_picture.url
-        return None
+        return image_url(obj.profile_picture, 'avatar', 'large')
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -1,11 +1,21 @@
 """
 Signals for Users app
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from apps.core import counters, renditions
+from apps.parishes.models import Parish
 from .models import User, UserProfile
 
 
+renditions.register(User, 'profile_picture', 'avatar')
+
+counters.register_source(Parish, 'member_count', User.objects.all, 'parish')
+
+# Sentinel for users whose stored parish is unknown (not loaded from the database)
+_UNKNOWN = object()
+
+
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """
@@ -21,4 +31,30 @@ def save_user_profile(sender, instance, **kwargs):
     Save UserProfile when User is saved
     """
     if hasattr(instance, 'profile'):
-        instance.profile.save() 
\ No newline at end of file
+        instance.profile.save() 
+
+
+@receiver(post_save, sender=User)
+def update_parish_member_count(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Move the user between parish member counts when their parish changes"""
+    if raw or (update_fields and not {'parish', 'parish_id'}.intersection(update_fields)):
+        return
+    
+    previous = None if created else getattr(instance, '_loaded_parish_id', _UNKNOWN)
+    # Remember what is stored now, so later saves of this instance compare
+    # against it even when this one changes nothing
+    instance._loaded_parish_id = instance.parish_id
+    if previous is _UNKNOWN or previous == instance.parish_id:
+        return
+    
+    if previous is not None:
+        counters.increment(Parish, previous, member_count=-1)
+    if instance.parish_id is not None:
+        counters.increment(Parish, instance.parish_id, member_count=1)
+
+
+@receiver(post_delete, sender=User)
+def decrease_parish_member_count(sender, instance, **kwargs):
+    """Decrease the member count of a deleted user's parish"""
+    if instance.parish_id is not None:
+        counters.increment(Parish, instance.parish_id, member_count=-1)
@@ -25,6 +25,7 @@ urlpatterns = [
     
     # Parishes for registration
     path('parishes/', views.list_parishes, name='parishes-list'),
+    path('parishes/typeahead/', views.parish_typeahead, name='parishes-typeahead'),
     
     # User management
     path('', include(router.urls)),
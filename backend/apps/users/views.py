@@ -2,7 +2,7 @@
 Views for Users app
 """
 from rest_framework import generics, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, authentication_classes, action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -10,19 +10,24 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
 from django.conf import settings
+from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.encoding import force_bytes
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
+from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode, http_date, quote_etag
 from django.template.loader import render_to_string
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
+from apps.core import search
 from .models import User, UserProfile
 from .serializers import (
-    UserSerializer, UserRegistrationSerializer, LoginSerializer,
+    UserSerializer, UserTypeaheadSerializer, UserRegistrationSerializer, LoginSerializer,
     ChangePasswordSerializer, UpdateProfileSerializer,
     PasswordResetSerializer, PasswordResetConfirmSerializer
 )
 from apps.parishes.models import Parish
+from apps.parishes.serializers import ParishListSerializer
+from apps.parishes import directory
 
 
 class UserViewSet(ModelViewSet):
@@ -35,10 +40,28 @@ class UserViewSet(ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
+        queryset = User.objects.select_related('parish__diocese', 'profile')
         # Users can only see their own profile and parish members
         if user.is_staff:
-            return User.objects.all()
-        return User.objects.filter(parish=user.parish)
+            return queryset
+        return queryset.filter(parish=user.parish)
+    
+    @extend_schema(
+        operation_id='users_typeahead',
+        summary='Find users by name',
+        parameters=[OpenApiParameter(name='q', description='Partial or misspelled name', required=True)],
+        responses={200: UserTypeaheadSerializer(many=True)}
+    )
+    @action(detail=False, methods=['get'])
+    def typeahead(self, request):
+        """Fuzzy lookup of visible users by first and last name"""
+        users = search.fuzzy_search(
+            self.get_queryset().filter(is_active=True).select_related('parish'),
+            request.GET.get('q', ''),
+            ['first_name', 'last_name'],
+            limit=search.get_typeahead_limit(request)
+        )
+        return Response(UserTypeaheadSerializer(users, many=True).data)
 
 
 @extend_schema(
@@ -187,18 +210,55 @@ class ChangePasswordView(generics.UpdateAPIView):
 @extend_schema(
     operation_id='parishes_list',
     summary='List Parishes',
-    description='Get list of all parishes for registration'
+    description='Get list of all parishes for registration. Supports conditional '
+                'requests (If-None-Match / If-Modified-Since).',
+    responses={200: ParishListSerializer(many=True)}
 )
 @api_view(['GET'])
+@authentication_classes([])
 @permission_classes([permissions.AllowAny])
 def list_parishes(request):
     """
-    List all parishes for registration
+    List all parishes for registration, from the precomputed directory snapshot
     """
-    from apps.parishes.serializers import ParishListSerializer
-    parishes = Parish.objects.filter(is_active=True).select_related('diocese')
-    serializer = ParishListSerializer(parishes, many=True)
-    return Response(serializer.data)
+    snapshot = directory.get_snapshot()
+    etag = quote_etag(snapshot['etag'])
+    
+    response = get_conditional_response(
+        request, etag=etag, last_modified=snapshot['last_modified']
+    )
+    if response is None:
+        response = HttpResponse(snapshot['body'], content_type='application/json')
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(snapshot['last_modified'])
+    patch_cache_control(response, public=True, max_age=directory.CACHE_MAX_AGE)
+    return response
+
+
+@extend_schema(
+    operation_id='parishes_typeahead',
+    summary='Find parishes by name',
+    description='Fuzzy lookup of active parishes by partial or misspelled name',
+    parameters=[OpenApiParameter(name='q', description='Partial or misspelled name', required=True)]
+)
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def parish_typeahead(request):
+    """
+    Find parishes by name, e.g. while picking a parish during registration
+    """
+    parishes = search.fuzzy_search(
+        Parish.objects.filter(is_active=True).select_related('diocese'),
+        request.GET.get('q', ''),
+        ['name'],
+        limit=search.get_typeahead_limit(request)
+    )
+    return Response([{
+        'id': parish.id,
+        'name': parish.name,
+        'diocese_name': parish.diocese.name,
+        'location': parish.location_display,
+    } for parish in parishes])
 
 
 @extend_schema(
@@ -0,0 +1,23 @@
+"""
+Celery application for Coptic Social Network project.
+
+Tasks are discovered in each app's `tasks.py`. Without a broker
+(`CELERY_BROKER_URL`) tasks run eagerly in the calling process, which is how
+tests and local development execute them.
+"""
+
+import os
+
+from celery import Celery
+from django.conf import settings
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+
+def uses_celery_broker():
+    """False when tasks run eagerly in-process"""
+    return bool(settings.CELERY_BROKER_URL) and not settings.CELERY_TASK_ALWAYS_EAGER
@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration
+
+Workers share Prometheus metrics through files in PROMETHEUS_MULTIPROC_DIR
+(default /tmp/prometheus), which is emptied when the server starts; values
+of exited workers are dropped from the live gauges.
+"""
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 3))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+
+# Set before workers import the app, so prometheus_client picks multiprocess mode
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus')
+
+
+def on_starting(server):
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
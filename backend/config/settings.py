@@ -26,6 +26,7 @@ DJANGO_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -43,6 +44,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    'apps.core',
     'apps.users',
     'apps.parishes',
     'apps.posts',
@@ -54,7 +56,9 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'apps.core.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'apps.core.profiling.QueryProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -106,6 +110,17 @@ else:
         }
     }
 
+# Database connections: seconds a connection is kept open and reused across
+# requests (0 closes it after every request), checked before reuse so a
+# dropped connection is replaced instead of failing the request.
+# DB_PGBOUNCER is for PgBouncer in transaction pooling mode, where named
+# server-side cursors don't survive between transactions.
+DATABASES['default'].update({
+    'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+    'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+    'DISABLE_SERVER_SIDE_CURSORS': config('DB_PGBOUNCER', default=False, cast=bool),
+})
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
@@ -156,6 +171,104 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# Redis (optional; cache and shared counter buffer)
+REDIS_URL = config('REDIS_URL', default='')
+
+# Cache: Redis when REDIS_URL is set, local memory otherwise (tests, dev)
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'coptic_social',
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'coptic-social',
+            'TIMEOUT': 300,
+        }
+    }
+
+# Feed timelines (fan-out on write)
+FEED_TIMELINE_LENGTH = config('FEED_TIMELINE_LENGTH', default=500, cast=int)
+
+# Trending: decay half-life of engagement events and posts ranked per parish
+TRENDING_HALF_LIFE_HOURS = config('TRENDING_HALF_LIFE_HOURS', default=12, cast=float)
+TRENDING_SIZE = config('TRENDING_SIZE', default=200, cast=int)
+
+# Typeahead: minimum pg_trgm word similarity for a name to match a typed word
+FUZZY_SEARCH_THRESHOLD = config('FUZZY_SEARCH_THRESHOLD', default=0.3, cast=float)
+
+# Comments: replies embedded under each comment (the rest via /replies/)
+COMMENT_REPLY_PREVIEW = config('COMMENT_REPLY_PREVIEW', default=3, cast=int)
+
+# Engagement counters: 'immediate' (F() update per event), 'local' (buffered
+# in process) or 'redis' (buffered in Redis, written by the `flush_counters`
+# beat task, so it needs a Celery broker and the beat process)
+COUNTER_BACKEND = config('COUNTER_BACKEND', default='immediate')
+COUNTER_FLUSH_INTERVAL = config('COUNTER_FLUSH_INTERVAL', default=5, cast=int)
+
+# Background tasks: Celery with a Redis broker, or eager (in-process) execution
+# when no broker is configured
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL)
+CELERY_RESULT_BACKEND = None
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=not CELERY_BROKER_URL, cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = False
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+
+# Periodic tasks, run by `celery -A config beat` (the `beat` process)
+CELERY_BEAT_SCHEDULE = {
+    'flush-counters': {
+        'task': 'apps.core.tasks.flush_counters',
+        'schedule': COUNTER_FLUSH_INTERVAL,
+        'options': {'expires': COUNTER_FLUSH_INTERVAL},
+    },
+}
+
+# Chunked media uploads: maximum file size, chunk size and session lifetime
+MEDIA_UPLOAD_MAX_SIZE = config('MEDIA_UPLOAD_MAX_SIZE', default=50 * 1024 * 1024, cast=int)
+UPLOAD_CHUNK_SIZE = config('UPLOAD_CHUNK_SIZE', default=5 * 1024 * 1024, cast=int)
+UPLOAD_SESSION_TTL_HOURS = config('UPLOAD_SESSION_TTL_HOURS', default=24, cast=int)
+
+# Direct uploads: 's3' presigned POSTs (default with USE_S3) or the 'local'
+# filesystem stand-in, and how long a presigned form stays valid
+DIRECT_UPLOAD_BACKEND = config('DIRECT_UPLOAD_BACKEND', default='')
+DIRECT_UPLOAD_EXPIRY_SECONDS = config('DIRECT_UPLOAD_EXPIRY_SECONDS', default=3600, cast=int)
+
+# Media processing: longest edge in pixels of each generated image rendition
+MEDIA_RENDITIONS = {
+    'thumbnail': 320,
+    'medium': 720,
+    'large': 1280,
+}
+
+# SQL profiling: requests sending `X-SQL-Profile: <SQL_PROFILING_TOKEN>` (any
+# value with DEBUG) or sampled at SQL_PROFILING_SAMPLE_RATE get their queries
+# logged and summarized in a Server-Timing header
+SQL_PROFILING_TOKEN = config('SQL_PROFILING_TOKEN', default='')
+SQL_PROFILING_SAMPLE_RATE = config('SQL_PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+SQL_PROFILING_SLOW_MS = config('SQL_PROFILING_SLOW_MS', default=100, cast=float)
+SQL_PROFILING_DUPLICATE_THRESHOLD = config('SQL_PROFILING_DUPLICATE_THRESHOLD', default=5, cast=int)
+
+# Readiness checks: maximum database round trip, Celery queue length above
+# which the (advisory) backlog check reports a problem, and how long a
+# result is reused between probes
+HEALTH_DB_LATENCY_MS = config('HEALTH_DB_LATENCY_MS', default=250, cast=float)
+HEALTH_MAX_QUEUE_LENGTH = config('HEALTH_MAX_QUEUE_LENGTH', default=1000, cast=int)
+HEALTH_CACHE_SECONDS = config('HEALTH_CACHE_SECONDS', default=5, cast=float)
+
+# Metrics: bearer token required by /metrics (when empty the endpoint is only
+# served with DEBUG) and the Celery queues whose depth is reported
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_CELERY_QUEUES = ['celery']
+
 # JWT Configuration
 from datetime import timedelta
 SIMPLE_JWT = {
@@ -256,5 +369,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'apps.core.profiling': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 } 
\ No newline at end of file
@@ -5,19 +5,22 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import JsonResponse
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
-def health_check(request):
-    """Health check endpoint for deployment platforms"""
-    return JsonResponse({"status": "healthy", "message": "Coptic Social Network API is running"})
+from apps.core import views as core_views
 
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
     
-    # Health check
-    path('health/', health_check, name='health_check'),
+    # Health checks: liveness (process up) and readiness (dependencies usable)
+    path('health/', core_views.liveness, name='health_check'),
+    path('health/ready/', core_views.readiness, name='readiness'),
+    path('api/health/', core_views.liveness, name='api-liveness'),
+    path('api/health/ready/', core_views.readiness, name='api-readiness'),
+    
+    # Prometheus metrics
+    path('metrics', core_views.metrics, name='metrics'),
     
     # API Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
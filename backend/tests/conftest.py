@@ -0,0 +1,31 @@
+"""
+Fixtures shared by the test suites
+"""
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty caches (namespaced entries outlive rollbacks)"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def client_for():
+    """`client_for(user)`: an API client authenticated as `user`"""
+    def make_client(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+    return make_client
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    """Store uploaded files under a temporary MEDIA_ROOT"""
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
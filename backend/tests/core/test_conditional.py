@@ -0,0 +1,137 @@
+"""
+Conditional GET: a 304 must turn into a 200 once anything in the body changes
+"""
+import pytest
+from django.db.models import F
+from django.urls import reverse
+
+from apps.groups.models import GroupPost, GroupRole
+
+from ..factories import (
+    CommentFactory, GroupEventFactory, GroupFactory, GroupMembershipFactory, GroupPostFactory,
+    PostFactory, UserFactory
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def revalidate(client, url, response):
+    """Request `url` again with the validators of an earlier response"""
+    return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+@pytest.fixture
+def group_detail(client_for):
+    group = GroupFactory()
+    member = UserFactory(parish=group.parish)
+    membership = GroupMembershipFactory(group=group, user=member)
+    post = GroupPostFactory(group=group, author=member)
+    client = client_for(member)
+    url = reverse('groups:group-detail', kwargs={'pk': group.pk})
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert revalidate(client, url, response).status_code == 304
+    return client, url, response, membership, post
+
+
+@pytest.fixture
+def post_detail(client_for):
+    post = PostFactory()
+    comment = CommentFactory(post=post, author=post.author)
+    client = client_for(post.author)
+    url = reverse('posts:posts-detail', kwargs={'pk': post.pk})
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert revalidate(client, url, response).status_code == 304
+    return client, url, response, comment
+
+
+def test_group_role_change_invalidates(group_detail, django_capture_on_commit_callbacks):
+    client, url, response, membership, post = group_detail
+    with django_capture_on_commit_callbacks(execute=True):
+        membership.role = GroupRole.MODERATOR
+        membership.save()
+
+    fresh = revalidate(client, url, response)
+    assert fresh.status_code == 200
+    assert fresh.data['user_role'] == GroupRole.MODERATOR
+
+
+def test_new_group_event_invalidates(group_detail, django_capture_on_commit_callbacks):
+    client, url, response, membership, post = group_detail
+    with django_capture_on_commit_callbacks(execute=True):
+        event = GroupEventFactory(group=membership.group, created_by=membership.user)
+
+    fresh = revalidate(client, url, response)
+    assert fresh.status_code == 200
+    assert str(event.pk) in {item['id'] for item in fresh.data['upcoming_events']}
+
+
+def test_edited_group_post_invalidates(group_detail, django_capture_on_commit_callbacks):
+    client, url, response, membership, post = group_detail
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = 'Vespers moved to Saturday'
+        post.save()
+
+    fresh = revalidate(client, url, response)
+    assert fresh.status_code == 200
+    assert fresh.data['recent_posts'][0]['title'] == 'Vespers moved to Saturday'
+
+
+def test_edited_comment_invalidates(post_detail):
+    client, url, response, comment = post_detail
+    comment.content = 'Edited'
+    comment.save()
+
+    fresh = revalidate(client, url, response)
+    assert fresh.status_code == 200
+    assert fresh.data['comments'][0]['content'] == 'Edited'
+
+
+def test_deleted_comment_invalidates(post_detail):
+    client, url, response, comment = post_detail
+    comment.is_deleted = True
+    comment.save()
+
+    fresh = revalidate(client, url, response)
+    assert fresh.status_code == 200
+    assert fresh.data['comments'] == []
+
+
+def test_detail_with_embedded_rows_has_no_last_modified(post_detail):
+    client, url, response, comment = post_detail
+    assert 'Last-Modified' not in response
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=FAR_FUTURE).status_code == 200
+
+
+FAR_FUTURE = 'Fri, 01 Jan 2100 00:00:00 GMT'
+
+
+def test_lists_have_no_last_modified(client_for):
+    post = PostFactory()
+    client = client_for(post.author)
+    url = reverse('posts:posts-list')
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=FAR_FUTURE).status_code == 200
+
+
+def test_counter_change_is_not_hidden_by_if_modified_since(client_for):
+    post = GroupPostFactory()
+    member = UserFactory(parish=post.group.parish)
+    GroupMembershipFactory(group=post.group, user=member)
+    client = client_for(member)
+    url = reverse('groups:grouppost-detail', kwargs={'pk': post.pk})
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response
+
+    GroupPost.objects.filter(pk=post.pk).update(likes_count=F('likes_count') + 1)
+    fresh = client.get(url, HTTP_IF_MODIFIED_SINCE=FAR_FUTURE)
+    assert fresh.status_code == 200
+    assert fresh.data['likes_count'] == 1
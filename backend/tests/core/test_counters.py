@@ -0,0 +1,94 @@
+"""
+Buffered counter backends must get their deltas written
+"""
+import pytest
+from celery.signals import task_postrun
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.core import counters, tasks
+from apps.posts.models import Post
+
+from ..factories import CommentFactory, PostFactory, ReactionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Install a fresh backend for the test and restore the configured one after"""
+    def install(backend):
+        monkeypatch.setattr(counters, '_backend', backend)
+        return backend
+    return install
+
+
+def likes(post):
+    return Post.objects.values_list('likes_count', flat=True).get(pk=post.pk)
+
+
+def test_local_deltas_flushed_after_celery_task(backend):
+    local = backend(counters.LocalCounterBackend(interval=0))
+    post = PostFactory()
+    local.add(Post._meta.label, post.pk, {'likes_count': 3})
+    assert likes(post) == 0
+
+    task_postrun.send(sender=None, task_id='flush-test', task=None)
+    assert likes(post) == 3
+
+
+def test_flush_task_writes_buffered_deltas(backend):
+    local = backend(counters.LocalCounterBackend(interval=3600))
+    post = PostFactory()
+    local.add(Post._meta.label, post.pk, {'likes_count': 2})
+    assert likes(post) == 0
+
+    tasks.flush_counters()
+    assert likes(post) == 2
+
+
+def test_redis_backend_refused_without_broker(backend, settings):
+    backend(None)
+    settings.COUNTER_BACKEND = 'redis'
+    settings.CELERY_BROKER_URL = ''
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    with pytest.raises(ImproperlyConfigured):
+        counters.get_backend()
+
+
+def test_beat_schedules_flush(settings):
+    schedule = {entry['task'] for entry in settings.CELERY_BEAT_SCHEDULE.values()}
+    assert 'apps.core.tasks.flush_counters' in schedule
+
+
+def test_counters_follow_comments(django_capture_on_commit_callbacks):
+    post = PostFactory()
+    with django_capture_on_commit_callbacks(execute=True):
+        comments = CommentFactory.create_batch(2, post=post)
+    post.refresh_from_db()
+    assert post.comments_count == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        comments[0].delete()
+    post.refresh_from_db()
+    assert post.comments_count == 1
+
+
+def test_counters_wait_for_commit(django_capture_on_commit_callbacks):
+    post = PostFactory()
+    with django_capture_on_commit_callbacks(execute=False):
+        CommentFactory(post=post)
+
+    post.refresh_from_db()
+    assert post.comments_count == 0
+
+
+def test_reconcile_recomputes_from_source_rows():
+    post = PostFactory()
+    ReactionFactory.create_batch(3, target=post)
+    CommentFactory(post=post)
+    Post.objects.filter(pk=post.pk).update(likes_count=42, comments_count=0)
+
+    counters.reconcile([Post])
+    post.refresh_from_db()
+    assert (post.likes_count, post.comments_count) == (3, 1)
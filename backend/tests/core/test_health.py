@@ -0,0 +1,54 @@
+"""
+Liveness and readiness probes
+"""
+import pytest
+from django.db import OperationalError
+from django.urls import reverse
+
+from apps.core import health
+
+
+@pytest.fixture(autouse=True)
+def fresh_readiness(monkeypatch):
+    monkeypatch.setattr(health, '_result', None)
+
+
+@pytest.mark.django_db
+def test_liveness_touches_nothing(client, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        response = client.get(reverse('health_check'), HTTP_HOST='localhost')
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_ready(client):
+    response = client.get(reverse('readiness'), HTTP_HOST='localhost')
+    assert response.status_code == 200
+    assert all(check['ok'] for check in response.json()['checks'].values())
+
+
+def test_failures_are_logged_not_served(client, monkeypatch, caplog):
+    def unreachable():
+        raise OperationalError('connection to server at "db.internal" (10.0.0.5) failed for user "admin"')
+    monkeypatch.setattr(health, 'CHECKS', {'database': unreachable})
+
+    response = client.get(reverse('readiness'), HTTP_HOST='localhost')
+
+    assert response.status_code == 503
+    assert response.json()['checks']['database'] == {'ok': False, 'error': 'check_failed'}
+    assert 'db.internal' not in response.content.decode()
+    assert 'db.internal' in caplog.text
+
+
+def test_task_backlog_does_not_gate_readiness(client, monkeypatch):
+    monkeypatch.setattr(health, 'CHECKS', {
+        'database': lambda: (True, {}),
+        'task_backlog': lambda: (False, {'queues': {'celery': 5000}, 'threshold': 1000}),
+    })
+
+    response = client.get(reverse('readiness'), HTTP_HOST='localhost')
+
+    assert response.status_code == 200
+    assert response.json()['checks']['task_backlog'] == {
+        'ok': False, 'queues': {'celery': 5000}, 'threshold': 1000, 'advisory': True
+    }
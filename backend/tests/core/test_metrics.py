@@ -0,0 +1,30 @@
+"""
+Access to the Prometheus endpoint
+"""
+from django.urls import reverse
+
+
+def test_metrics_hidden_without_token(client, settings):
+    settings.METRICS_TOKEN = ''
+    settings.DEBUG = False
+    assert client.get(reverse('metrics'), HTTP_HOST='localhost').status_code == 404
+
+
+def test_metrics_open_in_debug_without_token(client, settings):
+    settings.METRICS_TOKEN = ''
+    settings.DEBUG = True
+    assert client.get(reverse('metrics'), HTTP_HOST='localhost').status_code == 200
+
+
+def test_metrics_require_token(client, settings):
+    settings.METRICS_TOKEN = 'scrape-secret'
+    settings.DEBUG = False
+    url = reverse('metrics')
+
+    assert client.get(url, HTTP_HOST='localhost').status_code == 401
+    assert client.get(
+        url, HTTP_HOST='localhost', HTTP_AUTHORIZATION='Bearer wrong'
+    ).status_code == 401
+    assert client.get(
+        url, HTTP_HOST='localhost', HTTP_AUTHORIZATION='Bearer scrape-secret'
+    ).status_code == 200
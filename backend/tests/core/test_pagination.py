@@ -0,0 +1,102 @@
+"""
+Keyset pagination: cursors walk every row exactly once, even across ties on
+the ordering key, and page-number clients keep working
+"""
+import base64
+import datetime
+import json
+
+import pytest
+from django.urls import reverse
+
+from apps.posts.models import Comment
+
+from ..factories import CommentFactory, PostFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def comments():
+    post = PostFactory()
+    return post, CommentFactory.create_batch(7, post=post)
+
+
+@pytest.fixture
+def client(client_for, comments):
+    post, _ = comments
+    return client_for(post.author)
+
+
+def url(post):
+    return reverse('posts:post-comments-list', kwargs={'post_pk': post.pk})
+
+
+def walk(client, post, page_size=2):
+    """Ids of every row, following `next` links from the first page"""
+    seen = []
+    response = client.get(url(post), {'page_size': page_size})
+    while True:
+        assert response.status_code == 200
+        assert 'count' not in response.data
+        seen += [item['id'] for item in response.data['results']]
+        if not response.data['next']:
+            return seen
+        response = client.get(response.data['next'])
+
+
+def expected_order(post):
+    return [str(pk) for pk in Comment.objects.filter(post=post).order_by(
+        'created_at', 'id'
+    ).values_list('id', flat=True)]
+
+
+def test_cursors_walk_every_row_once(client, comments):
+    post, _ = comments
+    assert walk(client, post) == expected_order(post)
+
+
+def test_ties_on_the_ordering_key(client, comments):
+    post, rows = comments
+    Comment.objects.filter(post=post).update(created_at=rows[0].created_at)
+
+    seen = walk(client, post)
+    assert seen == expected_order(post)
+    assert len(set(seen)) == len(rows)
+
+
+def test_microsecond_apart_rows(client, comments):
+    post, rows = comments
+    start = rows[0].created_at.replace(microsecond=0)
+    for offset, row in enumerate(rows):
+        Comment.objects.filter(pk=row.pk).update(
+            created_at=start + datetime.timedelta(microseconds=offset)
+        )
+
+    assert walk(client, post, page_size=3) == expected_order(post)
+
+
+def encode(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@pytest.mark.parametrize('cursor', [
+    'not-a-cursor',
+    encode(['2024-01-01T00:00:00+00:00']),
+    encode(['yesterday', '00000000-0000-0000-0000-000000000000']),
+    encode(['2024-01-01T00:00:00+00:00', 'not-a-uuid']),
+])
+def test_invalid_cursor_is_not_found(client, comments, cursor):
+    post, _ = comments
+    assert client.get(url(post), {'cursor': cursor}).status_code == 404
+
+
+@pytest.mark.parametrize('params', [{'page': 1}, {'ordering': 'created_at'}])
+def test_page_number_fallback(client, comments, params, recwarn):
+    post, rows = comments
+    response = client.get(url(post), params)
+
+    assert response.status_code == 200
+    assert response.data['count'] == len(rows)
+    assert [item['id'] for item in response.data['results']] == expected_order(post)
+    assert not [warning for warning in recwarn if 'Unordered' in type(warning.message).__name__]
@@ -0,0 +1,131 @@
+"""
+factory-boy factories shared by the test suites
+"""
+import datetime
+
+import factory
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from apps.parishes.models import Diocese, Parish
+from apps.users.models import User
+from apps.posts.models import Post, Comment, Reaction, PostVisibility, ReactionType
+from apps.groups.models import (
+    Group, GroupMembership, GroupInvitation, GroupPost, GroupEvent, GroupRole, GroupPrivacy
+)
+
+
+class DioceseFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Diocese
+    
+    name = factory.Sequence(lambda n: f'Diocese {n}')
+    country = 'US'
+
+
+class ParishFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Parish
+    
+    name = factory.Sequence(lambda n: f'St Mark Parish {n}')
+    diocese = factory.SubFactory(DioceseFactory)
+    address = factory.Faker('street_address')
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = User
+        skip_postgeneration_save = True
+    
+    username = factory.Sequence(lambda n: f'member{n}')
+    email = factory.Sequence(lambda n: f'member{n}@example.com')
+    first_name = factory.Faker('first_name')
+    last_name = factory.Faker('last_name')
+    parish = factory.SubFactory(ParishFactory)
+    password = factory.django.Password('benchmark-password')
+
+
+class PostFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Post
+    
+    author = factory.SubFactory(UserFactory)
+    content = factory.Faker('paragraph')
+    visibility = PostVisibility.PUBLIC
+    target_parish = factory.SelfAttribute('author.parish')
+    published_at = factory.LazyFunction(timezone.now)
+
+
+class CommentFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Comment
+    
+    post = factory.SubFactory(PostFactory)
+    author = factory.SubFactory(UserFactory)
+    content = factory.Faker('sentence')
+
+
+class ReactionFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Reaction
+    
+    user = factory.SubFactory(UserFactory)
+    content_type = factory.LazyFunction(lambda: ContentType.objects.get_for_model(Post))
+    object_id = factory.LazyAttribute(lambda reaction: reaction.target.id)
+    reaction_type = factory.Iterator(ReactionType.values)
+    
+    class Params:
+        target = factory.SubFactory(PostFactory)
+
+
+class GroupFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Group
+    
+    name = factory.Sequence(lambda n: f'Youth Group {n}')
+    description = factory.Faker('paragraph')
+    privacy = GroupPrivacy.PUBLIC
+    created_by = factory.SubFactory(UserFactory)
+    parish = factory.SelfAttribute('created_by.parish')
+
+
+class GroupMembershipFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = GroupMembership
+        django_get_or_create = ('group', 'user')
+    
+    group = factory.SubFactory(GroupFactory)
+    user = factory.SubFactory(UserFactory)
+    role = GroupRole.MEMBER
+
+
+class GroupPostFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = GroupPost
+    
+    group = factory.SubFactory(GroupFactory)
+    author = factory.SubFactory(UserFactory)
+    title = factory.Faker('sentence', nb_words=4)
+    content = factory.Faker('paragraph')
+
+
+class GroupEventFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = GroupEvent
+    
+    group = factory.SubFactory(GroupFactory)
+    created_by = factory.SubFactory(UserFactory)
+    title = factory.Faker('sentence', nb_words=3)
+    description = factory.Faker('paragraph')
+    start_datetime = factory.Sequence(lambda n: timezone.now() + datetime.timedelta(days=n + 1))
+    end_datetime = factory.LazyAttribute(lambda event: event.start_datetime + datetime.timedelta(hours=2))
+    is_public = True
+
+
+class GroupInvitationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = GroupInvitation
+    
+    group = factory.SubFactory(GroupFactory)
+    invited_user = factory.SubFactory(UserFactory)
+    invited_by = factory.SelfAttribute('group.created_by')
@@ -0,0 +1,62 @@
+"""
+Group and event visibility
+"""
+import pytest
+from django.db.models import Q
+from django.urls import reverse
+
+from apps.groups.access import GroupAccess
+from apps.groups.models import Group, GroupPrivacy
+
+from ..factories import GroupFactory, GroupEventFactory, GroupMembershipFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def result_ids(response):
+    data = response.data
+    rows = data['results'] if isinstance(data, dict) else data
+    return {str(row['id']) for row in rows}
+
+
+@pytest.fixture
+def private_event():
+    group = GroupFactory(privacy=GroupPrivacy.PRIVATE)
+    return GroupEventFactory(group=group, created_by=group.created_by, is_public=False)
+
+
+@pytest.fixture
+def public_event():
+    return GroupEventFactory()
+
+
+def list_events(client, group):
+    return client.get(reverse('groups:groupevent-list'), {'group': group.pk})
+
+
+def test_superuser_sees_every_event(client_for, private_event, public_event):
+    client = client_for(UserFactory(is_superuser=True, is_staff=True))
+
+    assert str(private_event.pk) in result_ids(list_events(client, private_event.group))
+    assert str(public_event.pk) in result_ids(list_events(client, public_event.group))
+
+
+def test_member_sees_events_of_private_group(client_for, private_event):
+    member = UserFactory()
+    GroupMembershipFactory(group=private_event.group, user=member)
+
+    assert str(private_event.pk) in result_ids(list_events(client_for(member), private_event.group))
+
+
+def test_outsider_sees_only_public_events(client_for, private_event, public_event):
+    client = client_for(UserFactory())
+
+    assert str(private_event.pk) not in result_ids(list_events(client, private_event.group))
+    assert str(public_event.pk) in result_ids(list_events(client, public_event.group))
+
+
+def test_superuser_predicate_survives_or(private_event):
+    access = GroupAccess(UserFactory(is_superuser=True))
+    groups = Group.objects.filter(access.visible_q() | Q(privacy=GroupPrivacy.PUBLIC))
+
+    assert groups.filter(pk=private_event.group.pk).exists()
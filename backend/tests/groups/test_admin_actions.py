@@ -0,0 +1,45 @@
+"""
+Bulk admin actions must not leave cached group access behind
+"""
+import pytest
+from django.contrib import admin
+
+from apps.groups.access import GroupAccess
+from apps.groups.admin import GroupMembershipAdmin
+from apps.groups.models import GroupMembership, GroupRole
+
+from ..factories import GroupMembershipFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def membership_admin(monkeypatch):
+    model_admin = GroupMembershipAdmin(GroupMembership, admin.site)
+    monkeypatch.setattr(model_admin, 'message_user', lambda *args, **kwargs: None)
+    return model_admin
+
+
+@pytest.mark.parametrize('action, role', [
+    ('promote_to_admin', GroupRole.ADMIN),
+    ('promote_to_moderator', GroupRole.MODERATOR),
+])
+def test_role_actions_refresh_cached_roles(action, role, membership_admin,
+                                           django_capture_on_commit_callbacks):
+    membership = GroupMembershipFactory()
+    assert GroupAccess(membership.user).role(membership.group_id) == GroupRole.MEMBER
+
+    with django_capture_on_commit_callbacks(execute=True):
+        getattr(membership_admin, action)(None, GroupMembership.objects.filter(pk=membership.pk))
+
+    assert GroupAccess(membership.user).role(membership.group_id) == role
+
+
+def test_demotion_refreshes_cached_roles(membership_admin, django_capture_on_commit_callbacks):
+    membership = GroupMembershipFactory(role=GroupRole.ADMIN)
+    assert GroupAccess(membership.user).role(membership.group_id) == GroupRole.ADMIN
+
+    with django_capture_on_commit_callbacks(execute=True):
+        membership_admin.demote_to_member(None, GroupMembership.objects.filter(pk=membership.pk))
+
+    assert GroupAccess(membership.user).role(membership.group_id) == GroupRole.MEMBER
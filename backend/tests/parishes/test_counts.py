@@ -0,0 +1,91 @@
+"""
+Parish member counts and diocese parish counts follow creates, assignments,
+moves and deletes
+"""
+import pytest
+
+from apps.parishes.models import Diocese, Parish
+from apps.users.models import User
+
+from ..factories import DioceseFactory, ParishFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def committed(django_capture_on_commit_callbacks):
+    """Run the counter updates queued inside the block"""
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+def member_counts(*parishes):
+    counts = dict(Parish.objects.filter(
+        pk__in=[parish.pk for parish in parishes]
+    ).values_list('pk', 'member_count'))
+    return [counts[parish.pk] for parish in parishes]
+
+
+def parish_counts(*dioceses):
+    counts = dict(Diocese.objects.filter(
+        pk__in=[diocese.pk for diocese in dioceses]
+    ).values_list('pk', 'parish_count'))
+    return [counts[diocese.pk] for diocese in dioceses]
+
+
+def test_member_count_follows_create_move_and_delete(committed):
+    home, other = ParishFactory(), ParishFactory()
+    with committed():
+        user = UserFactory(parish=home)
+    assert member_counts(home, other) == [1, 0]
+
+    with committed():
+        user.parish = other
+        user.save()
+    assert member_counts(home, other) == [0, 1]
+
+    with committed():
+        user.delete()
+    assert member_counts(home, other) == [0, 0]
+
+
+def test_member_count_follows_assignment_after_create(committed):
+    # The registration serializer creates the user, then sets the parish
+    home, other = ParishFactory(), ParishFactory()
+    with committed():
+        user = User.objects.create_user(username='newcomer', email='newcomer@example.com')
+        user.parish = home
+        user.save()
+    assert member_counts(home) == [home.members.count()] == [1]
+
+    with committed():
+        user.parish = other
+        user.save()
+    assert member_counts(home, other) == [0, 1]
+
+
+def test_member_count_ignores_unrelated_saves(committed):
+    home = ParishFactory()
+    with committed():
+        user = UserFactory(parish=home)
+        user.first_name = 'Mina'
+        user.save()
+        User.objects.get(pk=user.pk).save()
+    assert member_counts(home) == [1]
+
+
+def test_parish_count_follows_create_move_and_delete(committed):
+    home, other = DioceseFactory(), DioceseFactory()
+    with committed():
+        parish = ParishFactory(diocese=home)
+    assert parish_counts(home, other) == [1, 0]
+
+    with committed():
+        parish.name = 'St Mary'
+        parish.save()
+        parish.diocese = other
+        parish.save()
+    assert parish_counts(home, other) == [0, 1]
+
+    with committed():
+        Parish.objects.get(pk=parish.pk).delete()
+    assert parish_counts(home, other) == [0, 0]
@@ -0,0 +1,71 @@
+"""
+The parish directory is served from its snapshot, and rebuilt when a parish
+or diocese changes
+"""
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from ..factories import DioceseFactory, ParishFactory
+
+pytestmark = pytest.mark.django_db
+
+URL = reverse('users:parishes-list')
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+def names(response):
+    return {parish['name'] for parish in json.loads(response.content)}
+
+
+def test_conditional_get_needs_no_queries(client, django_assert_num_queries):
+    ParishFactory()
+    response = client.get(URL)
+    assert response.status_code == 200
+
+    with django_assert_num_queries(0):
+        revalidated = client.get(URL, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert revalidated.status_code == 304
+    assert revalidated['ETag'] == response['ETag']
+
+
+def test_warm_snapshot_needs_no_queries(client, django_assert_num_queries):
+    ParishFactory()
+    client.get(URL)
+
+    with django_assert_num_queries(0):
+        assert client.get(URL).status_code == 200
+
+
+def test_parish_save_rebuilds_snapshot(client, django_capture_on_commit_callbacks):
+    response = client.get(URL)
+    with django_capture_on_commit_callbacks(execute=True):
+        parish = ParishFactory(name='St George')
+
+    fresh = client.get(URL, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert fresh.status_code == 200
+    assert parish.name in names(fresh)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        parish.delete()
+    assert parish.name not in names(client.get(URL))
+
+
+def test_diocese_save_rebuilds_snapshot(client, django_capture_on_commit_callbacks):
+    diocese = DioceseFactory()
+    ParishFactory(diocese=diocese)
+    response = client.get(URL)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        diocese.name = 'Diocese of the Southern United States'
+        diocese.save()
+
+    fresh = client.get(URL, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert fresh.status_code == 200
+    assert diocese.name in {parish['diocese_name'] for parish in json.loads(fresh.content)}
@@ -0,0 +1,75 @@
+"""
+Fixtures for the performance suite
+
+Run with `pytest tests/performance`. Environment variables:
+
+    BENCHMARK_SCALE            seed size multiplier (default 1)
+    BENCHMARK_ITERATIONS       timed requests per endpoint (default 20)
+    BENCHMARK_LATENCY_FACTOR   multiplier applied to every p95 budget, for
+                               slower machines (default 1.0)
+    BENCHMARK_REPORT           path to write the measurements to as JSON
+"""
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from .factories import seed
+
+RESULTS = []
+CONNECTION_RESULTS = []
+
+
+@pytest.fixture(scope='session')
+def seed_data(django_db_setup, django_db_blocker):
+    """Seed the test database once for the whole suite"""
+    with django_db_blocker.unblock():
+        data = seed()
+        yield data
+        call_command('flush', interactive=False, verbosity=0)
+
+
+@pytest.fixture
+def api_client(seed_data):
+    client = APIClient()
+    client.force_authenticate(seed_data.user)
+    return client
+
+
+@pytest.fixture(scope='session')
+def benchmark_results():
+    return RESULTS
+
+
+@pytest.fixture(scope='session')
+def connection_results():
+    return CONNECTION_RESULTS
+
+
+def pytest_terminal_summary(terminalreporter):
+    if CONNECTION_RESULTS:
+        terminalreporter.section('connection benchmarks')
+        terminalreporter.write_line(f"{'mode':<40} {'p50 ms':>8} {'mean ms':>8}")
+        for result in CONNECTION_RESULTS:
+            terminalreporter.write_line(
+                f"{result['mode']:<40} {result['p50_ms']:>8.2f} {result['mean_ms']:>8.2f}"
+            )
+    
+    if not RESULTS:
+        return
+    terminalreporter.section('endpoint benchmarks')
+    terminalreporter.write_line(
+        f"{'endpoint':<40} {'queries':>7} {'budget':>6} {'p50 ms':>8} {'p95 ms':>8} {'budget':>8}"
+    )
+    for result in sorted(RESULTS, key=lambda result: result['endpoint']):
+        terminalreporter.write_line(
+            f"{result['endpoint']:<40} {result['queries']:>7} {str(result['query_budget']):>6} "
+            f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {str(result['p95_budget_ms']):>8}"
+        )
+    
+    report = os.environ.get('BENCHMARK_REPORT')
+    if report:
+        with open(report, 'w') as handle:
+            json.dump({'endpoints': RESULTS, 'connections': CONNECTION_RESULTS}, handle, indent=2)
@@ -0,0 +1,123 @@
+"""
+Seed data for the performance suite
+"""
+import os
+from dataclasses import dataclass, field
+
+from faker import Faker
+
+from apps.parishes.models import Parish
+from apps.users.models import User
+from apps.posts.models import Post, Comment, PostTag, PostTagging, PostVisibility, UploadSession
+from apps.posts import uploads
+from apps.groups.models import Group, GroupMembership, GroupInvitation, GroupPost, GroupEvent, GroupRole
+
+from ..factories import (
+    DioceseFactory, ParishFactory, UserFactory, PostFactory, CommentFactory, ReactionFactory,
+    GroupFactory, GroupMembershipFactory, GroupPostFactory, GroupEventFactory,
+    GroupInvitationFactory
+)
+
+
+fake = Faker()
+
+
+def get_scale():
+    """Seed size multiplier, from BENCHMARK_SCALE (default 1)"""
+    return max(int(os.environ.get('BENCHMARK_SCALE', 1)), 1)
+
+
+@dataclass
+class SeedData:
+    """The rows endpoints are benchmarked against"""
+    user: User
+    parish: Parish
+    post: Post
+    comment: Comment
+    group: Group
+    group_post: GroupPost
+    group_event: GroupEvent
+    membership: GroupMembership
+    invitation: GroupInvitation
+    upload: UploadSession
+    counts: dict = field(default_factory=dict)
+
+
+def seed(scale=None):
+    """
+    Seed a community shaped like production: per unit of scale, 2 dioceses
+    with 3 parishes each, 10 members per parish, 3 posts per member with
+    comments, replies and reactions, and 2 active groups per parish with
+    members, posts and events.
+    """
+    scale = scale or get_scale()
+    dioceses = DioceseFactory.create_batch(2 * scale)
+    parishes = [
+        ParishFactory(diocese=diocese) for diocese in dioceses for _ in range(3)
+    ]
+    members = {
+        parish.pk: UserFactory.create_batch(10 * scale, parish=parish) for parish in parishes
+    }
+    users = [user for parish_members in members.values() for user in parish_members]
+    
+    tags = [PostTag.objects.create(name=name) for name in ('liturgy', 'youth', 'service')]
+    posts = []
+    for index, user in enumerate(users):
+        for number in range(3):
+            tag = tags[(index + number) % len(tags)]
+            # Mentioning the tag gives the search benchmark posts to match
+            post = PostFactory(
+                author=user,
+                content=f'Notes from the {tag.name} ministry. {fake.paragraph()}',
+                visibility=PostVisibility.PARISH_ONLY if number == 2 else PostVisibility.PUBLIC
+            )
+            PostTagging.objects.create(post=post, tag=tag, tagged_by=user)
+            posts.append(post)
+    
+    comments = []
+    for index, post in enumerate(posts):
+        neighbours = members[post.author.parish_id]
+        for number in range(3):
+            comment = CommentFactory(post=post, author=neighbours[(index + number) % len(neighbours)])
+            comments.append(comment)
+            CommentFactory(post=post, author=post.author, parent=comment)
+        for number in range(5):
+            ReactionFactory(target=post, user=neighbours[(index + number) % len(neighbours)])
+    
+    groups = []
+    for parish in parishes:
+        parish_members = members[parish.pk]
+        for number in range(2):
+            group = GroupFactory(parish=parish, created_by=parish_members[number])
+            GroupMembershipFactory(group=group, user=group.created_by, role=GroupRole.ADMIN)
+            for user in parish_members[2:]:
+                GroupMembershipFactory(group=group, user=user)
+            for user in parish_members[:5]:
+                GroupPostFactory(group=group, author=user)
+            GroupEventFactory.create_batch(3, group=group, created_by=group.created_by)
+            groups.append(group)
+    
+    # The benchmarked user administers a group, has posted and been invited
+    user = users[0]
+    group = groups[0]
+    other_group = groups[2]
+    post = Post.objects.filter(author=user, visibility=PostVisibility.PUBLIC).first()
+    return SeedData(
+        user=user,
+        parish=user.parish,
+        post=post,
+        comment=post.comments.filter(parent=None).first(),
+        group=group,
+        group_post=group.posts.first(),
+        group_event=group.events.first(),
+        membership=group.memberships.exclude(user=user).first(),
+        invitation=GroupInvitationFactory(group=other_group, invited_user=user),
+        upload=uploads.create_session(user, 'icon.png', 'image/png', 1024),
+        counts={
+            'parishes': len(parishes),
+            'users': len(users),
+            'posts': len(posts),
+            'comments': len(comments) * 2,
+            'groups': len(groups),
+        },
+    )
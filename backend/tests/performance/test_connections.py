@@ -0,0 +1,63 @@
+"""
+Per-request cost of opening database connections
+
+Replays the connection handling Django does around every request (closing
+obsolete connections when a request starts and finishes) with one cheap
+query in between, first with CONN_MAX_AGE=0, where every request connects
+and authenticates again, then with a persistent, health-checked connection.
+The difference is the saving persistent connections give each request; it
+grows with the network distance to the database and with TLS.
+"""
+import statistics
+import time
+
+from django.db import connections, DEFAULT_DB_ALIAS
+
+from .test_endpoints import get_iterations
+
+
+def make_connection(**overrides):
+    """
+    A private connection to the test database with the given settings (same
+    alias, as connection signal handlers look the alias up)
+    """
+    default = connections[DEFAULT_DB_ALIAS]
+    return type(default)({**default.settings_dict, **overrides}, alias=DEFAULT_DB_ALIAS)
+
+
+def replay_requests(connection, iterations):
+    """Latencies in ms of `iterations` simulated requests running `SELECT 1`"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        connection.close_if_unusable_or_obsolete()
+        timings.append((time.perf_counter() - start) * 1000)
+    connection.close()
+    return timings
+
+
+def test_persistent_connections_save_connect_time(django_db_setup, django_db_blocker,
+                                                  connection_results):
+    iterations = get_iterations()
+    with django_db_blocker.unblock():
+        fresh = replay_requests(make_connection(CONN_MAX_AGE=0), iterations)
+        persistent = replay_requests(
+            make_connection(CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=True), iterations
+        )
+
+    for mode, timings in (('CONN_MAX_AGE=0', fresh), ('CONN_MAX_AGE=60', persistent)):
+        connection_results.append({
+            'mode': mode,
+            'p50_ms': statistics.median(timings),
+            'mean_ms': statistics.mean(timings),
+        })
+
+    saving = statistics.median(fresh) - statistics.median(persistent)
+    assert saving > 0, (
+        f'persistent connections were not faster: p50 {statistics.median(persistent):.2f}ms '
+        f'vs {statistics.median(fresh):.2f}ms per request'
+    )
@@ -0,0 +1,191 @@
+"""
+Query-count and latency budgets for the API endpoints
+
+Every GET route of the posts, groups and users routers (and the function
+endpoints next to them) is requested against the seeded data. The query
+count of a cold request (caches cleared) and the p50/p95 latency of warm
+requests are compared with `budgets.json`; raise a budget in the same change
+that legitimately needs it.
+"""
+import json
+import os
+import statistics
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.posts import urls as posts_urls
+from apps.groups import urls as groups_urls
+from apps.users import urls as users_urls
+
+BUDGETS = json.loads((Path(__file__).parent / 'budgets.json').read_text())
+
+Endpoint = namedtuple('Endpoint', ['name', 'kwargs', 'query', 'trigram'])
+
+
+def endpoint(name, kwargs=None, query='', trigram=False):
+    """`kwargs` maps URL kwargs to SeedData attribute paths, e.g. {'pk': 'post.pk'}"""
+    return Endpoint(name, kwargs or {}, query, trigram)
+
+
+ENDPOINTS = [
+    # Posts
+    endpoint('posts:posts-list'),
+    endpoint('posts:posts-detail', {'pk': 'post.pk'}),
+    endpoint('posts:post-comments-list', {'post_pk': 'post.pk'}),
+    endpoint('posts:post-comments-detail', {'post_pk': 'post.pk', 'pk': 'comment.pk'}),
+    endpoint('posts:post-comments-replies', {'post_pk': 'post.pk', 'pk': 'comment.pk'}),
+    endpoint('posts:uploads-detail', {'pk': 'upload.pk'}),
+    endpoint('posts:feed'),
+    endpoint('posts:trending'),
+    endpoint('posts:search', query='q=liturgy'),
+    endpoint('posts:tags'),
+    endpoint('posts:stats'),
+    
+    # Groups
+    endpoint('groups:group-list'),
+    endpoint('groups:group-detail', {'pk': 'group.pk'}),
+    endpoint('groups:group-members', {'pk': 'group.pk'}),
+    endpoint('groups:group-join-requests', {'pk': 'group.pk'}),
+    endpoint('groups:group-my-groups'),
+    endpoint('groups:group-featured'),
+    endpoint('groups:group-typeahead', query='q=youth', trigram=True),
+    endpoint('groups:grouppost-list'),
+    endpoint('groups:grouppost-detail', {'pk': 'group_post.pk'}),
+    endpoint('groups:groupevent-list'),
+    endpoint('groups:groupevent-detail', {'pk': 'group_event.pk'}),
+    endpoint('groups:groupevent-upcoming'),
+    endpoint('groups:groupmembership-list'),
+    endpoint('groups:groupmembership-detail', {'pk': 'membership.pk'}),
+    endpoint('groups:groupinvitation-list'),
+    endpoint('groups:groupinvitation-detail', {'pk': 'invitation.pk'}),
+    endpoint('groups:group-posts-list', {'group_pk': 'group.pk'}),
+    endpoint('groups:group-posts-detail', {'group_pk': 'group.pk', 'pk': 'group_post.pk'}),
+    endpoint('groups:group-events-list', {'group_pk': 'group.pk'}),
+    endpoint('groups:group-events-detail', {'group_pk': 'group.pk', 'pk': 'group_event.pk'}),
+    endpoint('groups:group-events-upcoming', {'group_pk': 'group.pk'}),
+    endpoint('groups:group-members-list', {'group_pk': 'group.pk'}),
+    endpoint('groups:group-members-detail', {'group_pk': 'group.pk', 'pk': 'membership.pk'}),
+    
+    # Users
+    endpoint('users:users-list'),
+    endpoint('users:users-detail', {'pk': 'user.pk'}),
+    endpoint('users:users-typeahead', query='q=member', trigram=True),
+    endpoint('users:profile'),
+    endpoint('users:parishes-list'),
+    endpoint('users:parishes-typeahead', query='q=mark', trigram=True),
+]
+
+ROUTERS = {
+    'posts': [posts_urls.router, posts_urls.posts_router],
+    'groups': [groups_urls.router, groups_urls.groups_router],
+    'users': [users_urls.router],
+}
+
+
+def get_iterations():
+    return max(int(os.environ.get('BENCHMARK_ITERATIONS', 20)), 2)
+
+
+def get_latency_factor():
+    return float(os.environ.get('BENCHMARK_LATENCY_FACTOR', 1.0))
+
+
+def resolve(path, data):
+    value = data
+    for attribute in path.split('.'):
+        value = getattr(value, attribute)
+    return value
+
+
+def build_url(item, data):
+    url = reverse(item.name, kwargs={
+        key: resolve(path, data) for key, path in item.kwargs.items()
+    })
+    return f'{url}?{item.query}' if item.query else url
+
+
+def has_trigram_extension():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def test_every_router_endpoint_is_benchmarked():
+    benchmarked = {item.name for item in ENDPOINTS}
+    missing = set()
+    for namespace, routers in ROUTERS.items():
+        for router in routers:
+            for pattern in router.urls:
+                actions = getattr(pattern.callback, 'actions', None)
+                if actions and 'get' in actions:
+                    missing.add(f'{namespace}:{pattern.name}')
+    missing -= benchmarked
+    assert not missing, f'GET routes without a benchmark: {sorted(missing)}'
+
+
+def test_every_endpoint_has_a_budget():
+    missing = {item.name for item in ENDPOINTS} - set(BUDGETS)
+    assert not missing, f'Endpoints without a budget in budgets.json: {sorted(missing)}'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('item', ENDPOINTS, ids=lambda item: item.name)
+def test_endpoint_budget(item, api_client, seed_data, benchmark_results):
+    if item.trigram and not has_trigram_extension():
+        pytest.skip('pg_trgm is not installed')
+    url = build_url(item, seed_data)
+    
+    # Cold request: every query the endpoint can issue
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url)
+    assert response.status_code == 200, (url, response.status_code, response.content[:200])
+    # Read now: every later request resets connection.queries
+    captured = [query['sql'] for query in queries.captured_queries]
+    
+    # Warm requests: latency as clients see it
+    api_client.get(url)
+    timings = []
+    for _ in range(get_iterations()):
+        start = time.perf_counter()
+        api_client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+    cuts = statistics.quantiles(timings, n=20, method='inclusive')
+    p50, p95 = cuts[9], cuts[18]
+    
+    budget = BUDGETS.get(item.name, {})
+    p95_budget = budget.get('p95_ms')
+    if p95_budget is not None:
+        p95_budget *= get_latency_factor()
+    benchmark_results.append({
+        'endpoint': item.name,
+        'queries': len(captured),
+        'query_budget': budget.get('queries'),
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'p95_budget_ms': p95_budget,
+        'scale': seed_data.counts,
+    })
+    
+    assert budget, f'{item.name} has no budget ({len(captured)} queries, p95 {p95:.1f}ms)'
+    assert len(captured) <= budget['queries'], (
+        f"{item.name} ran {len(captured)} queries (budget {budget['queries']}):\n"
+        + '\n'.join(captured)
+    )
+    assert p95 <= p95_budget, f'{item.name} p95 {p95:.1f}ms exceeds {p95_budget:.1f}ms'
+
+
+@pytest.mark.django_db
+def test_search_benchmark_matches_posts(api_client, seed_data):
+    """The search budget must measure a page of results, not an empty one"""
+    item = next(item for item in ENDPOINTS if item.name == 'posts:search')
+    response = api_client.get(build_url(item, seed_data))
+    assert response.status_code == 200
+    assert len(response.data['results']) > 0
@@ -0,0 +1,168 @@
+"""
+Chunked uploads: chunks must arrive in order and intact, an interrupted
+upload resumes from the stored offset, and a completed upload is attached
+to one post only
+"""
+import hashlib
+import io
+
+import pytest
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from apps.posts import uploads
+from apps.posts.models import PostMedia, UploadSession, UploadStatus
+
+from ..factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+CHUNK_SIZE = 1024
+CONTENT = bytes(range(256)) * 10  # three chunks, the last one short
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(settings, media_root):
+    settings.UPLOAD_CHUNK_SIZE = CHUNK_SIZE
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def client(client_for, user):
+    return client_for(user)
+
+
+def start(client, size=len(CONTENT), **extra):
+    response = client.post(reverse('posts:uploads-list'), {
+        'filename': 'homily.mp3', 'content_type': 'audio/mpeg', 'size': size, **extra
+    }, format='json')
+    assert response.status_code == 201, response.data
+    return response.data['id']
+
+
+def send(client, session_id, offset, body, **headers):
+    return client.patch(
+        reverse('posts:uploads-detail', args=[session_id]), body,
+        content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset), **headers
+    )
+
+
+def send_all(client, session_id, start_at=0):
+    for offset in range(start_at, len(CONTENT), CHUNK_SIZE):
+        response = send(client, session_id, offset, CONTENT[offset:offset + CHUNK_SIZE])
+        assert response.status_code == 200, response.data
+
+
+def complete(client, session_id, **data):
+    return client.post(reverse('posts:uploads-complete', args=[session_id]), data, format='json')
+
+
+def uploaded(client):
+    session_id = start(client)
+    send_all(client, session_id)
+    assert complete(client, session_id).status_code == 200
+    return session_id
+
+
+def test_chunks_are_assembled_in_order(client):
+    session_id = start(client, sha256=hashlib.sha256(CONTENT).hexdigest())
+    send_all(client, session_id)
+
+    response = complete(client, session_id)
+    assert response.status_code == 200
+    session = UploadSession.objects.get(pk=session_id)
+    with default_storage.open(session.file, 'rb') as stored:
+        assert stored.read() == CONTENT
+    assert not default_storage.exists(uploads.part_name(session, 0))
+
+
+@pytest.mark.parametrize('offset', [0, 1, 2 * CHUNK_SIZE])
+def test_chunk_at_wrong_offset_conflicts(client, offset):
+    session_id = start(client)
+    send(client, session_id, 0, CONTENT[:CHUNK_SIZE])
+
+    response = send(client, session_id, offset, CONTENT[offset:offset + CHUNK_SIZE])
+    assert response.status_code == 409
+    assert response.data['offset'] == CHUNK_SIZE
+
+
+def test_chunk_larger_than_chunk_size_is_refused(client):
+    session_id = start(client)
+
+    response = send(client, session_id, 0, CONTENT[:CHUNK_SIZE + 1])
+    assert response.status_code == 413
+    assert UploadSession.objects.get(pk=session_id).offset == 0
+
+
+def test_chunk_past_declared_size_is_refused(client):
+    session_id = start(client, size=CHUNK_SIZE + 10)
+    send(client, session_id, 0, CONTENT[:CHUNK_SIZE])
+
+    assert send(client, session_id, CHUNK_SIZE, CONTENT[:11]).status_code == 413
+
+
+def test_chunk_checksum_mismatch_is_refused(client):
+    session_id = start(client)
+    chunk = CONTENT[:CHUNK_SIZE]
+    wrong = hashlib.sha256(chunk[::-1]).hexdigest()
+
+    response = send(client, session_id, 0, chunk, HTTP_UPLOAD_CHECKSUM=f'sha256 {wrong}')
+    assert response.status_code == 400
+    assert response.data['offset'] == 0
+
+    right = hashlib.sha256(chunk).hexdigest()
+    assert send(client, session_id, 0, chunk, HTTP_UPLOAD_CHECKSUM=f'sha256 {right}').status_code == 200
+
+
+def test_resume_after_interrupted_chunk(client):
+    session_id = start(client, sha256=hashlib.sha256(CONTENT).hexdigest())
+    send(client, session_id, 0, CONTENT[:CHUNK_SIZE])
+
+    # The connection drops half way through the second chunk
+    session = UploadSession.objects.get(pk=session_id)
+    with pytest.raises(uploads.UploadError):
+        uploads.append_chunk(
+            session, CHUNK_SIZE, CHUNK_SIZE, io.BytesIO(CONTENT[CHUNK_SIZE:CHUNK_SIZE + 100])
+        )
+
+    offset = client.get(reverse('posts:uploads-detail', args=[session_id])).data['offset']
+    assert offset == CHUNK_SIZE
+    send_all(client, session_id, start_at=offset)
+    assert complete(client, session_id).status_code == 200
+
+
+def test_complete_checks_size_and_checksum(client):
+    session_id = start(client)
+    send(client, session_id, 0, CONTENT[:CHUNK_SIZE])
+    assert complete(client, session_id).status_code == 400
+
+    send_all(client, session_id, start_at=CHUNK_SIZE)
+    response = complete(client, session_id, sha256=hashlib.sha256(b'other').hexdigest())
+    assert response.status_code == 400
+    assert UploadSession.objects.get(pk=session_id).status == UploadStatus.UPLOADING
+
+
+def test_upload_is_attached_once(client):
+    session_id = uploaded(client)
+    url = reverse('posts:posts-list')
+
+    first = client.post(url, {'content': 'Feast day', 'media_uploads': [session_id]}, format='json')
+    assert first.status_code == 201, first.data
+
+    second = client.post(url, {'content': 'Again', 'media_uploads': [session_id]}, format='json')
+    assert second.status_code == 400
+    assert 'media_uploads' in second.data
+    assert PostMedia.objects.filter(file=UploadSession.objects.get(pk=session_id).file).count() == 1
+
+
+def test_uploads_of_other_users_cannot_be_attached(client, client_for):
+    session_id = uploaded(client_for(UserFactory()))
+
+    response = client.post(reverse('posts:posts-list'), {
+        'content': 'Not mine', 'media_uploads': [session_id]
+    }, format='json')
+    assert response.status_code == 400
@@ -0,0 +1,156 @@
+"""
+Direct uploads: the local stand-in enforces its signed policy like S3, and
+completing checks what actually reached storage
+"""
+import base64
+import hashlib
+import json
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.posts.models import UploadSession, UploadStatus
+
+from ..factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+CONTENT = b'coptic icon bytes' * 64
+
+
+@pytest.fixture(autouse=True)
+def local_backend(settings, media_root):
+    settings.DIRECT_UPLOAD_BACKEND = 'local'
+
+
+@pytest.fixture
+def client(client_for):
+    return client_for(UserFactory())
+
+
+def start(client, size=len(CONTENT), **extra):
+    response = client.post(reverse('posts:uploads-direct'), {
+        'filename': 'icon.png', 'content_type': 'image/png', 'size': size, **extra
+    }, format='json')
+    assert response.status_code == 201, response.data
+    return response.data
+
+
+def send(fields, content=CONTENT):
+    """POST the presigned form the way a browser would, without credentials"""
+    return APIClient().post(reverse('posts:direct-upload-local'), {
+        **fields, 'file': SimpleUploadedFile('icon.png', content, content_type='image/png')
+    }, format='multipart')
+
+
+def complete(client, session_id, **data):
+    return client.post(reverse('posts:uploads-complete', args=[session_id]), data, format='json')
+
+
+def test_direct_upload_round_trip(client):
+    session = start(client, sha256=hashlib.sha256(CONTENT).hexdigest())
+    assert send(session['upload']['fields']).status_code == 204
+
+    response = complete(client, session['id'])
+    assert response.status_code == 200
+    assert response.data['status'] == UploadStatus.COMPLETE
+    assert response.data['offset'] == len(CONTENT)
+
+
+def test_bad_signature_is_rejected(client):
+    session = start(client)
+    fields = {**session['upload']['fields'], 'signature': '0' * 64}
+
+    assert send(fields).status_code == 403
+    assert not default_storage.exists(fields['key'])
+
+
+def test_altered_policy_is_rejected(client):
+    session = start(client)
+    fields = session['upload']['fields']
+    policy = json.loads(base64.urlsafe_b64decode(fields['policy']))
+    policy['size'] = len(CONTENT) * 2
+    fields = {**fields, 'policy': base64.urlsafe_b64encode(json.dumps(policy).encode()).decode()}
+
+    assert send(fields, CONTENT * 2).status_code == 403
+
+
+def test_expired_policy_is_rejected(client, settings):
+    settings.DIRECT_UPLOAD_EXPIRY_SECONDS = -1
+    session = start(client)
+
+    response = send(session['upload']['fields'])
+    assert response.status_code == 403
+    assert response.data['error'] == 'Policy expired'
+
+
+@pytest.mark.parametrize('field, value', [
+    ('key', 'uploads/elsewhere.png'),
+    ('Content-Type', 'text/html'),
+])
+def test_fields_must_match_the_policy(client, field, value):
+    session = start(client)
+    fields = {**session['upload']['fields'], field: value}
+
+    assert send(fields).status_code == 403
+    assert not default_storage.exists(session['upload']['fields']['key'])
+    assert not default_storage.exists('uploads/elsewhere.png')
+
+
+def test_size_must_match_the_policy(client):
+    session = start(client)
+
+    assert send(session['upload']['fields'], CONTENT[:-1]).status_code == 400
+    assert not default_storage.exists(session['upload']['fields']['key'])
+
+
+def test_upload_is_accepted_once(client):
+    session = start(client)
+    fields = session['upload']['fields']
+    assert send(fields).status_code == 204
+
+    assert send(fields, CONTENT.upper()).status_code == 409
+    with default_storage.open(fields['key'], 'rb') as stored:
+        assert stored.read() == CONTENT
+
+
+def test_complete_before_upload_conflicts(client):
+    session = start(client)
+
+    assert complete(client, session['id']).status_code == 409
+    assert UploadSession.objects.get(pk=session['id']).status == UploadStatus.UPLOADING
+
+
+def test_complete_rejects_wrong_size(client):
+    # Stored behind the policy's back, e.g. by a misconfigured bucket rule
+    session = start(client)
+    key = session['upload']['fields']['key']
+    default_storage.save(key, ContentFile(CONTENT[:-1]))
+
+    assert complete(client, session['id']).status_code == 400
+    assert not default_storage.exists(key)
+    assert UploadSession.objects.get(pk=session['id']).status == UploadStatus.UPLOADING
+
+
+@pytest.mark.parametrize('declared', [True, False])
+def test_complete_rejects_wrong_checksum(client, declared):
+    wrong = hashlib.sha256(b'another file').hexdigest()
+    session = start(client, **({'sha256': wrong} if declared else {}))
+    assert send(session['upload']['fields']).status_code == 204
+
+    response = complete(client, session['id'], **({} if declared else {'sha256': wrong}))
+    assert response.status_code == 400
+    assert response.data['error'] == 'File checksum mismatch'
+    assert not default_storage.exists(session['upload']['fields']['key'])
+
+
+def test_complete_is_accepted_once(client):
+    session = start(client)
+    assert send(session['upload']['fields']).status_code == 204
+    assert complete(client, session['id']).status_code == 200
+
+    assert complete(client, session['id']).status_code == 409
@@ -0,0 +1,80 @@
+"""
+Feed and trending cache invalidation is scoped to the timelines a post is on
+"""
+import pytest
+from django.urls import reverse
+
+from apps.posts.cache import feed_cache, feed_page_scopes, trending_cache
+from apps.posts.models import PostVisibility, TimelineEntry
+
+from ..factories import ParishFactory, PostFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def page_key(timeline, parish_id=None):
+    return feed_cache.key('', scope=feed_page_scopes(timeline, parish_id))
+
+
+@pytest.fixture
+def parishes():
+    return ParishFactory(), ParishFactory()
+
+
+def test_parish_post_only_invalidates_its_parish(parishes, django_capture_on_commit_callbacks):
+    home, other = parishes
+    before = {
+        'home': page_key(TimelineEntry.PARISH, home.pk),
+        'other': page_key(TimelineEntry.PARISH, other.pk),
+        'public': page_key(TimelineEntry.PUBLIC),
+    }
+    with django_capture_on_commit_callbacks(execute=True):
+        PostFactory(author=UserFactory(parish=home), visibility=PostVisibility.PARISH_ONLY)
+
+    assert page_key(TimelineEntry.PARISH, home.pk) != before['home']
+    assert page_key(TimelineEntry.PARISH, other.pk) == before['other']
+    assert page_key(TimelineEntry.PUBLIC) == before['public']
+
+
+def test_public_post_invalidates_every_timeline(parishes, django_capture_on_commit_callbacks):
+    home, other = parishes
+    before = [page_key(TimelineEntry.PARISH, other.pk), page_key(TimelineEntry.PUBLIC)]
+    with django_capture_on_commit_callbacks(execute=True):
+        PostFactory(author=UserFactory(parish=home), visibility=PostVisibility.PUBLIC)
+
+    assert page_key(TimelineEntry.PARISH, other.pk) != before[0]
+    assert page_key(TimelineEntry.PUBLIC) != before[1]
+
+
+def test_post_leaving_public_timeline_invalidates_it(parishes, django_capture_on_commit_callbacks):
+    home, other = parishes
+    post = PostFactory(author=UserFactory(parish=home), visibility=PostVisibility.PUBLIC)
+    before = page_key(TimelineEntry.PARISH, other.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.visibility = PostVisibility.PARISH_ONLY
+        post.save()
+
+    assert page_key(TimelineEntry.PARISH, other.pk) != before
+
+
+def test_trending_is_invalidated_per_parish(parishes, django_capture_on_commit_callbacks):
+    home, other = parishes
+    before = [trending_cache.key(10, scope=home.pk), trending_cache.key(10, scope=other.pk)]
+    with django_capture_on_commit_callbacks(execute=True):
+        PostFactory(author=UserFactory(parish=home))
+
+    assert trending_cache.key(10, scope=home.pk) != before[0]
+    assert trending_cache.key(10, scope=other.pk) == before[1]
+
+
+def test_cached_feed_shows_new_post(client_for, parishes, django_capture_on_commit_callbacks):
+    home, other = parishes
+    reader = UserFactory(parish=home)
+    client = client_for(reader)
+    url = reverse('posts:feed')
+    client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post = PostFactory(author=UserFactory(parish=home), visibility=PostVisibility.PARISH_ONLY)
+
+    assert str(post.pk) in {item['id'] for item in client.get(url).data['posts']}
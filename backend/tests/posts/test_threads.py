@@ -0,0 +1,88 @@
+"""
+Comment threads: top-level pages embed a bounded, oldest-first preview of
+visible replies, and the replies action pages through the rest
+"""
+import pytest
+from django.urls import reverse
+
+from apps.posts import threads
+
+from ..factories import CommentFactory, PostFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def short_previews(settings):
+    settings.COMMENT_REPLY_PREVIEW = 2
+
+
+@pytest.fixture
+def thread():
+    """A post with one comment and its replies: 4 visible, 1 unapproved, 1 deleted"""
+    post = PostFactory()
+    comment = CommentFactory(post=post)
+    replies = []
+    for number in range(6):
+        replies.append(CommentFactory(
+            post=post, parent=comment,
+            is_approved=number != 1,
+            is_deleted=number == 2,
+        ))
+    visible = [reply for reply in replies if reply.is_approved and not reply.is_deleted]
+    return post, comment, visible
+
+
+def ids(items):
+    return [item['id'] for item in items]
+
+
+def test_list_embeds_first_visible_replies(client_for, thread):
+    post, comment, visible = thread
+    response = client_for(post.author).get(
+        reverse('posts:post-comments-list', kwargs={'post_pk': post.pk})
+    )
+    assert response.status_code == 200
+
+    # Replies are nested, not listed as top-level comments
+    assert ids(response.data['results']) == [str(comment.pk)]
+    top = response.data['results'][0]
+    assert ids(top['replies']) == [str(reply.pk) for reply in visible[:2]]
+    assert top['reply_count'] == len(visible)
+
+
+def test_replies_action_pages_visible_replies_oldest_first(client_for, thread):
+    post, comment, visible = thread
+    client = client_for(post.author)
+    url = reverse('posts:post-comments-replies', kwargs={'post_pk': post.pk, 'pk': comment.pk})
+
+    seen = []
+    response = client.get(url, {'page_size': 3})
+    while True:
+        assert response.status_code == 200
+        seen += ids(response.data['results'])
+        if not response.data['next']:
+            break
+        response = client.get(response.data['next'])
+    assert seen == [str(reply.pk) for reply in visible]
+
+
+def test_nested_replies_are_previewed_under_their_parent(client_for, thread):
+    post, comment, visible = thread
+    nested = CommentFactory(post=post, parent=visible[0])
+    url = reverse('posts:post-comments-replies', kwargs={'post_pk': post.pk, 'pk': comment.pk})
+
+    first = client_for(post.author).get(url).data['results'][0]
+    assert first['reply_count'] == 1
+    assert ids(first['replies']) == [str(nested.pk)]
+
+
+def test_previews_load_in_one_query(thread, django_assert_num_queries):
+    post, comment, visible = thread
+    other = CommentFactory(post=post)
+    CommentFactory(post=post, parent=other)
+    comments = list(threads.visible_comments().filter(pk__in=[comment.pk, other.pk]))
+
+    with django_assert_num_queries(1):
+        threads.attach_replies(comments)
+    assert {len(item.reply_preview) for item in comments} == {2, 1}
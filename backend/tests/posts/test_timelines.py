@@ -0,0 +1,82 @@
+"""
+Timelines stay bounded as posts are fanned out
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.posts import timelines
+from apps.posts.models import PostVisibility, TimelineEntry
+
+from ..factories import ParishFactory, PostFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def short_timelines(settings):
+    settings.FEED_TIMELINE_LENGTH = 2
+
+
+def test_public_posts_are_stored_once(short_timelines):
+    parishes = ParishFactory.create_batch(3)
+    post = PostFactory(author=UserFactory(parish=parishes[0]), visibility=PostVisibility.PUBLIC)
+
+    assert list(TimelineEntry.objects.filter(post=post).values_list('timeline', 'parish_id')) == [
+        (TimelineEntry.PUBLIC, None)
+    ]
+    for parish in parishes:
+        assert timelines.feed_queryset(TimelineEntry.PARISH, parish.pk).filter(post=post).exists()
+
+
+def test_parish_feed_merges_both_timelines_in_order(short_timelines):
+    parish = ParishFactory()
+    author = UserFactory(parish=parish)
+    posts = [
+        PostFactory(author=author, visibility=visibility)
+        for visibility in (PostVisibility.PUBLIC, PostVisibility.PARISH_ONLY) * 2
+    ]
+    entries = timelines.feed_queryset(TimelineEntry.PARISH, parish.pk).filter(post__in=posts)
+
+    assert list(entries.values_list('post_id', flat=True)) == [post.pk for post in reversed(posts)]
+
+
+def test_each_timeline_is_trimmed(short_timelines):
+    parish = ParishFactory()
+    author = UserFactory(parish=parish)
+    public = [PostFactory(author=author, visibility=PostVisibility.PUBLIC) for _ in range(3)]
+    local = [PostFactory(author=author, visibility=PostVisibility.PARISH_ONLY) for _ in range(3)]
+
+    stored = TimelineEntry.objects.filter(post__in=public + local).values_list('post_id', flat=True)
+    assert set(stored) == {post.pk for post in public[1:] + local[1:]}
+
+
+def test_new_parish_sees_public_posts():
+    post = PostFactory(visibility=PostVisibility.PUBLIC)
+    parish = ParishFactory()
+
+    assert timelines.feed_queryset(TimelineEntry.PARISH, parish.pk).filter(post=post).exists()
+
+
+def test_fan_out_cost_does_not_grow_with_parishes(short_timelines):
+    author = UserFactory()
+    with CaptureQueriesContext(connection) as few_parishes:
+        PostFactory(author=author, visibility=PostVisibility.PUBLIC)
+
+    ParishFactory.create_batch(5)
+    with CaptureQueriesContext(connection) as more_parishes:
+        PostFactory(author=author, visibility=PostVisibility.PUBLIC)
+
+    assert len(more_parishes) == len(few_parishes)
+
+
+def test_pinned_entries_survive_trimming(short_timelines):
+    parish = ParishFactory()
+    author = UserFactory(parish=parish)
+    pinned = PostFactory(author=author, visibility=PostVisibility.PARISH_ONLY, is_pinned=True)
+    for _ in range(3):
+        PostFactory(author=author, visibility=PostVisibility.PARISH_ONLY)
+
+    entries = timelines.timeline_queryset(TimelineEntry.PARISH, parish.pk)
+    assert entries.count() == 2
+    assert entries.filter(post=pinned).exists()
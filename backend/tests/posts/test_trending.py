@@ -0,0 +1,119 @@
+"""
+Trending scores are ranked per parish, follow engagement and drop posts
+that can no longer be shown
+"""
+import pytest
+from django.contrib import admin
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.posts import trending
+from apps.posts.admin import PostAdmin
+from apps.posts.models import Post, TrendingScore
+
+from ..factories import CommentFactory, ParishFactory, PostFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def parish():
+    return ParishFactory()
+
+
+def parish_post(parish, **kwargs):
+    return PostFactory(author=UserFactory(parish=parish), **kwargs)
+
+
+def test_ranking_is_per_parish(parish):
+    other = ParishFactory()
+    home_post = parish_post(parish)
+    parish_post(other)
+
+    assert trending.top_post_ids(parish.pk, 10) == [home_post.pk]
+
+
+def test_engagement_raises_rank(parish, django_capture_on_commit_callbacks):
+    older, newer = parish_post(parish), parish_post(parish)
+    assert trending.top_post_ids(parish.pk, 10) == [newer.pk, older.pk]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        CommentFactory(post=older)
+
+    assert trending.top_post_ids(parish.pk, 10) == [older.pk, newer.pk]
+
+
+@pytest.mark.parametrize('field, value', [('is_deleted', True), ('is_approved', False)])
+def test_hidden_posts_are_dropped(parish, field, value):
+    post = parish_post(parish)
+    setattr(post, field, value)
+    post.save(update_fields=[field])
+
+    assert not TrendingScore.objects.filter(post=post).exists()
+
+
+def test_moved_post_is_ranked_in_its_new_parish(parish):
+    post = parish_post(parish)
+    other = ParishFactory()
+    post.target_parish = other
+    post.save(update_fields=['target_parish'])
+
+    assert trending.top_post_ids(parish.pk, 10) == []
+    assert trending.top_post_ids(other.pk, 10) == [post.pk]
+
+
+def test_parish_ranking_is_trimmed(parish, settings):
+    settings.TRENDING_SIZE = 2
+    posts = [parish_post(parish) for _ in range(3)]
+
+    assert trending.top_post_ids(parish.pk, 10) == [posts[2].pk, posts[1].pk]
+
+
+def test_trimmed_post_returns_with_engagement(parish, settings,
+                                              django_capture_on_commit_callbacks):
+    settings.TRENDING_SIZE = 2
+    oldest, *newer = [parish_post(parish) for _ in range(3)]
+    assert oldest.pk not in trending.top_post_ids(parish.pk, 10)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        CommentFactory(post=oldest)
+
+    assert trending.top_post_ids(parish.pk, 10) == [oldest.pk, newer[1].pk]
+
+
+def test_admin_approval_scores_posts(parish, monkeypatch, django_capture_on_commit_callbacks):
+    post = parish_post(parish, is_approved=False)
+    assert trending.top_post_ids(parish.pk, 10) == []
+
+    model_admin = PostAdmin(Post, admin.site)
+    monkeypatch.setattr(model_admin, 'message_user', lambda *args, **kwargs: None)
+    request = RequestFactory().post('/')
+    request.user = UserFactory(is_staff=True)
+    with django_capture_on_commit_callbacks(execute=True):
+        model_admin.approve_posts(request, Post.objects.filter(pk=post.pk))
+
+    assert trending.top_post_ids(parish.pk, 10) == [post.pk]
+
+
+def test_rebuild_matches_incremental_scores(parish, django_capture_on_commit_callbacks):
+    posts = [parish_post(parish) for _ in range(3)]
+    with django_capture_on_commit_callbacks(execute=True):
+        CommentFactory(post=posts[0])
+    incremental = trending.top_post_ids(parish.pk, 10)
+
+    trending.rebuild(parish.pk)
+    assert trending.top_post_ids(parish.pk, 10) == incremental
+
+
+def test_cached_trending_shows_new_post(client_for, parish, django_capture_on_commit_callbacks):
+    client = client_for(UserFactory(parish=parish))
+    url = reverse('posts:trending')
+    older = parish_post(parish)
+    assert [item['id'] for item in client.get(url).data['trending_posts']] == [str(older.pk)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        newer = parish_post(parish)
+
+    assert [item['id'] for item in client.get(url).data['trending_posts']] == [
+        str(newer.pk), str(older.pk)
+    ]